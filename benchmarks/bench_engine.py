@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Benchmarks of the shoe, the hand values and the rules engine, all
+without pygame.
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import sys
+import os
+import random
+
+# Local imports
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from globals import *
+from carddecks import CardDecks
+from engine import play_round, get_value_of_players_hand, get_value_of_dealers_hand, HIT, STAND
+from hand import Hand, DealersHand
+
+NUM_OF_HANDS = 1000
+
+
+def _random_hands(rng):
+    """
+    :return: A list of hands, as lists of cards, with two to four cards \
+    each from a shuffled shoe.
+
+    """
+    shoe_of_decks = CardDecks(NUM_OF_DECKS, rng)
+    hands = []
+    for num in range(0, NUM_OF_HANDS):
+        if shoe_of_decks.length() < 4:
+            shoe_of_decks.shuffle()
+        hands.append([shoe_of_decks.pop() for card in range(0, rng.randint(2, 4))])
+    return hands
+
+
+def benchmarks():
+    """
+    :return: A list of (name, function, operations) where each call of \
+    the function runs the given number of operations, or returns the \
+    number of operations it has run if operations is None.
+
+    """
+    rng = random.Random(4711)
+    hands = _random_hands(rng)
+    shoe_of_decks = CardDecks(NUM_OF_DECKS, rng)
+
+    def create_shoe(num_of_decks):
+        def run():
+            CardDecks(num_of_decks, rng)
+        return run
+
+    def shuffle():
+        shoe_of_decks.shuffle()
+
+    def deal_shoe():
+        shoe_of_decks.shuffle()
+        for num in range(0, NUM_OF_DECKS * 52):
+            shoe_of_decks.pop()
+
+    def players_hand_values():
+        for hand in hands:
+            get_value_of_players_hand(hand)
+
+    def dealers_hand_values():
+        for hand in hands:
+            get_value_of_dealers_hand(hand)
+
+    def incremental_hand_values():
+        for hand in hands:
+            Hand(hand).value
+            DealersHand(hand).value
+
+    def decisions(game_round):
+        return HIT if game_round.value_of_players_hand() < 17 else STAND
+
+    def engine_rounds():
+        shoe_of_decks.shuffle()
+        rounds = 0
+        while shoe_of_decks.length() >= NUM_OF_DECKS * 52 * CUT_RATIO:
+            play_round(shoe_of_decks, LOWEST_BET, decisions)
+            rounds += 1
+        return rounds
+
+    return [('carddecks_create_1', create_shoe(1), 1),
+            ('carddecks_create_{0}'.format(NUM_OF_DECKS), create_shoe(NUM_OF_DECKS), 1),
+            ('carddecks_create_8', create_shoe(8), 1),
+            ('carddecks_shuffle_{0}'.format(NUM_OF_DECKS), shuffle, 1),
+            ('carddecks_pop', deal_shoe, NUM_OF_DECKS * 52),
+            ('players_hand_value', players_hand_values, NUM_OF_HANDS),
+            ('dealers_hand_value', dealers_hand_values, NUM_OF_HANDS),
+            ('incremental_hand_value', incremental_hand_values, 2 * NUM_OF_HANDS),
+            ('engine_round', engine_rounds, None)]
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+"""
+Benchmarks of the game states and the plot functions, with pygame on the
+SDL dummy drivers so no window or sound card is needed.
+
+The rounds are played through the states in
+:mod:`includes.blackjackfsm` by posting mouse clicks on the buttons, as a
+player hitting until 17. All pauses are skipped.
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import sys
+import os
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# Local imports
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from blackjackfsm import *
+from playingcard import PlayingCard
+from preload import AssetPreloader, preload_manifest
+
+NUM_OF_ROUNDS = 20
+
+
+def _init_game():
+    """
+    Initialize pygame and the common variables the same way as
+    :class:`blackjack.BlackJack`.
+
+    :return: A tuple with (common_vars, button_status).
+
+    """
+    # The image and sound paths are relative to the project root
+    os.chdir(MAIN_DIR)
+    pygame.init()
+    common_vars = CommonVariables.get_instance()
+    button_status = ButtonStatus.get_instance()
+    image_db = ImageDB.get_instance()
+    common_vars.done = False
+    common_vars.screen = DirtyRectRenderer(pygame.display.set_mode(GAME_BOARD_SIZE))
+    common_vars.player_cash = DEFAULT_PLAYER_BALANCE
+    common_vars.game_rounds = 0
+    common_vars.pause_time = 0
+    common_vars.dealer_last_hand = 0
+    common_vars.player_hands = []
+    common_vars.button_image_width = image_db.get_image(IMAGE_PATH_BUTTONS + HIT_BUTTON_FILENAME_ON).get_width()
+    common_vars.button_image_height = image_db.get_image(IMAGE_PATH_BUTTONS + HIT_BUTTON_FILENAME_ON).get_height()
+    common_vars.chips_image_width = image_db.get_image(IMAGE_PATH_CHIPS + CHIP_5_FILENAME_ON).get_width()
+    common_vars.chips_image_height = image_db.get_image(IMAGE_PATH_CHIPS + CHIP_5_FILENAME_ON).get_height()
+    common_vars.text_font = pygame.font.SysFont('Arial', 18)
+    return common_vars, button_status
+
+
+def _click(area):
+    """
+    Post a left mouse button click in the middle of the area.
+
+    """
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=area.center))
+
+
+def benchmarks():
+    """
+    :return: A list of (name, function, operations), see \
+    :func:`benchmarks.bench_engine.benchmarks`.
+
+    """
+    common_vars, button_status = _init_game()
+    image_db = ImageDB.get_instance()
+    button_areas = ButtonCollideArea.get_instance(common_vars)
+    chips_areas = ChipsCollideArea.get_instance(common_vars)
+    state = InitialState()
+    random.seed(4711)
+
+    def play_rounds():
+        """
+        Play NUM_OF_ROUNDS through the states, one state call per frame.
+
+        """
+        last_round = common_vars.game_rounds + NUM_OF_ROUNDS
+        while common_vars.game_rounds < last_round:
+            name = type(state).__name__
+            if name == 'BettingState' and not pygame.event.peek(pygame.MOUSEBUTTONDOWN):
+                if sum(state._current_bet) == 0:
+                    _click(chips_areas.chip_10_area)
+                else:
+                    _click(button_areas.play_button_area)
+            elif name in ('DealingState', 'PlayerHitState') and button_status.hit:
+                if common_vars.player_hands[-1].value < 17:
+                    _click(button_areas.hit_button_area)
+                else:
+                    _click(button_areas.stand_button_area)
+            state(common_vars, button_status)
+            common_vars.screen.update()
+            common_vars.pause_time = 0
+            if common_vars.player_cash < LOWEST_BET:
+                common_vars.player_cash = DEFAULT_PLAYER_BALANCE
+        return NUM_OF_ROUNDS
+
+    # A split with a double down and a dealer with three cards
+    player_hands = [Hand([PlayingCard(8, 0), PlayingCard(3, 1), PlayingCard(10, 2)]),
+                    Hand([PlayingCard(8, 3), PlayingCard(12, 0)])]
+    dealer_cards = DealersHand([PlayingCard(5, 1), PlayingCard(1, 2), PlayingCard(2, 3)])
+    hands_status = dict.fromkeys(['first_hand_blackjack', 'first_hand_win', 'first_hand_push',
+                                  'first_hand_loose', 'first_hand_busted', 'second_hand_blackjack',
+                                  'second_hand_win', 'second_hand_push', 'second_hand_loose',
+                                  'second_hand_busted'], False)
+    hands_status['first_hand_win'] = True
+    # The plot functions are measured on the display surface, the frames
+    # through the dirty rectangle renderer
+    screen = common_vars.screen.display
+
+    def render_players_hands(screen=screen):
+        plot_players_hands(screen, PLAYER_CARD_START_POS, player_hands, [True, False], hands_status)
+
+    def render_dealers_hand(screen=screen):
+        plot_dealers_hand(screen, DEALER_CARD_START_POS, dealer_cards, True)
+
+    def render_buttons(screen=screen):
+        button_status.hit = True
+        button_status.stand = True
+        plot_buttons(screen, button_status)
+
+    def render_status_text():
+        """
+        The texts plotted in every frame of the main loop, from the text
+        cache after the first call.
+
+        """
+        render_text(common_vars.text_font, '[ Credits: $ {0}]   [Hands played: {1} ]'.format(
+            common_vars.player_cash, common_vars.game_rounds), False, YELLOW_COLOR)
+        render_text(common_vars.text_font, '[ Dealers last hand: {0} ]'.format(
+            common_vars.dealer_last_hand), False, YELLOW_COLOR)
+
+    def render_frame():
+        """
+        A frame equal to the previous one, nothing is drawn on the display.
+
+        """
+        renderer = common_vars.screen
+        renderer.blit(image_db.get_table_background(), (0, 0))
+        render_players_hands(renderer)
+        render_dealers_hand(renderer)
+        render_buttons(renderer)
+        renderer.update()
+
+    def render_full_frame():
+        """
+        A frame where the whole display is drawn and updated.
+
+        """
+        common_vars.screen.invalidate()
+        render_frame()
+
+    def preload_assets():
+        """
+        Load all assets of the game into new and empty ImageDB and SoundDB.
+
+        """
+        image_db, sound_db = ImageDB.instance, SoundDB.instance
+        ImageDB.instance = SoundDB.instance = None
+        try:
+            AssetPreloader(preload_manifest()).wait()
+        finally:
+            ImageDB.instance, SoundDB.instance = image_db, sound_db
+
+    return [('fsm_round', play_rounds, None),
+            ('render_players_hands', render_players_hands, 1),
+            ('render_dealers_hand', render_dealers_hand, 1),
+            ('render_buttons', render_buttons, 1),
+            ('render_status_text', render_status_text, 1),
+            ('render_frame', render_frame, 1),
+            ('render_full_frame', render_full_frame, 1),
+            ('preload_assets', preload_assets, 1)]
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""
+Run all benchmarks, write the results as JSON and compare them with a
+stored baseline.
+
+Each benchmark is run a number of times and the best time is kept, as
+seconds per operation. A benchmark which is slower than the baseline by
+more than the threshold is reported as a regression and the exit code is
+1. The baseline is machine specific and saved with --save-baseline.
+
+Usage:
+python benchmarks/run_benchmarks.py --save-baseline
+python benchmarks/run_benchmarks.py --threshold 0.1
+python benchmarks/run_benchmarks.py --only engine
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(1, os.path.dirname(BENCHMARKS_DIR))
+
+DEFAULT_OUTPUT = os.path.join(BENCHMARKS_DIR, 'results.json')
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_REPEAT = 5
+
+# The benchmark modules, the gui benchmarks need pygame
+SUITES = ('engine', 'gui')
+
+
+def measure(function, operations, repeat):
+    """
+    Run the function a number of times and keep the fastest run.
+
+    :param function:
+    :param operations: Number of operations in each call, or None if \
+    the function returns the number of operations.
+    :param repeat: Number of runs.
+    :return: The best time in seconds per operation.
+
+    """
+    best = None
+    for num in range(0, repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        per_operation = elapsed / (result if operations is None else operations)
+        if best is None or per_operation < best:
+            best = per_operation
+    return best
+
+
+def run_suites(suites, repeat):
+    """
+    :param suites: Names of the suites to run, see SUITES.
+    :param repeat:
+    :return: A dict with seconds per operation for each benchmark.
+
+    """
+    results = {}
+    for suite in suites:
+        module = __import__('benchmarks.bench_' + suite, fromlist=['benchmarks'])
+        for name, function, operations in module.benchmarks():
+            results[name] = measure(function, operations, repeat)
+            print('{0:<28} {1:>12.3f} us'.format(name, results[name] * 1e6))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    :param results: A dict with seconds per operation for each benchmark.
+    :param baseline: The same for the baseline.
+    :param threshold: Allowed slowdown as part of the baseline, e.g. 0.1.
+    :return: A list with (name, baseline, result) for each regression.
+
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+        change = result / baseline[name] - 1
+        flag = ''
+        if change > threshold:
+            flag = 'REGRESSION'
+            regressions.append((name, baseline[name], result))
+        print('{0:<28} {1:>+8.1%} {2}'.format(name, change, flag))
+    return regressions
+
+
+def main():
+    """
+    Parse the command line, run the benchmarks and compare.
+
+    :return: Exit code, 1 if there is any regression.
+
+    """
+    parser = argparse.ArgumentParser(description='Run the Black Jack benchmarks.')
+    parser.add_argument('--only', choices=SUITES, action='append', help='run only this suite')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='runs of each benchmark')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='JSON file for the results')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='JSON file with the baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed slowdown before a regression, as a part of the baseline')
+    parser.add_argument('--save-baseline', action='store_true', help='save the results as the baseline')
+    args = parser.parse_args()
+
+    results = run_suites(args.only or SUITES, args.repeat)
+    report = {'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+              'python': platform.python_version(),
+              'platform': platform.platform(),
+              'results': results}
+    with open(args.output, 'w') as output_file:
+        json.dump(report, output_file, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(report, baseline_file, indent=2, sort_keys=True)
+        print('Baseline saved in {0}'.format(args.baseline))
+        return 0
+    if not os.path.isfile(args.baseline):
+        print('No baseline in {0}, save one with --save-baseline'.format(args.baseline))
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)['results']
+    print('\nCompared with {0}, threshold {1:.0%}'.format(args.baseline, args.threshold))
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print('{0} regression(s)'.format(len(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
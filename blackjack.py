@@ -2,6 +2,14 @@
 """
 This is a gui based blackjack game using pygame
 
+Usage:
+python blackjack.py
+Or without a window, sound and pauses, played by a driver:
+python blackjack.py --headless --rounds 1000
+python blackjack.py --headless --script "10 play hit stand"
+Record all rounds in a journal, see replay.py:
+python blackjack.py --journal rounds.journal --seed 4711
+
 Copyright (C) Torbjorn Hedqvist - All Rights Reserved
 You may use, distribute and modify this code under the
 terms of the MIT license. See LICENSE file in the project
@@ -10,10 +18,18 @@ root for full license information.
 """
 
 # Standard imports
+import os
 import time
+import random
+import argparse
 
 # Local imports
 from includes.blackjackfsm import *
+from includes.preload import *
+from includes.driver import *
+from includes.logqueue import LogThread
+from includes.journal import RoundJournal, RecordingShoe, RoundRecorder, MAX_SEED
+from includes.strategy import load_strategy
 
 # Specialized imports from lib. Add lib to path
 # import os
@@ -31,82 +47,284 @@ class BlackJack(object):
     The game will continue in this loop until the player are out of
     money or the player hits the exit of the main window.
 
+    In headless mode pygame runs on the SDL dummy video and audio drivers,
+    nothing is plotted or played, there are no pauses and the loop runs at
+    full speed. The player is then replaced by a driver from
+    :mod:`includes.driver`.
+
     """
 
-    # Initialize pygame hooks
-    pygame.init()
-    pygame.display.set_caption('Black Jack')
-    pygame.font.init()
-    clock = pygame.time.Clock()
-
-    # Instantiate the common variable singleton objects
-    common_vars = CommonVariables.get_instance()
-    button_status = ButtonStatus.get_instance()
-    image_db = ImageDB.get_instance()
-
-    # Populate the needed common variables with initial values
-    common_vars.done = False
-    common_vars.screen = pygame.display.set_mode(GAME_BOARD_SIZE)
-    common_vars.player_cash = DEFAULT_PLAYER_BALANCE
-    common_vars.game_rounds = 0
-    common_vars.pause_time = 0
-    common_vars.dealer_last_hand = 0
-    common_vars.player_hands = []
-    common_vars.button_image_width = image_db.get_image(IMAGE_PATH_BUTTONS + HIT_BUTTON_FILENAME_ON).get_width()
-    common_vars.button_image_height = image_db.get_image(IMAGE_PATH_BUTTONS + HIT_BUTTON_FILENAME_ON).get_height()
-    common_vars.chips_image_width = image_db.get_image(IMAGE_PATH_CHIPS + CHIP_5_FILENAME_ON).get_width()
-    common_vars.chips_image_height = image_db.get_image(IMAGE_PATH_CHIPS + CHIP_5_FILENAME_ON).get_height()
-
-    common_vars.text_font = pygame.font.SysFont('Arial', 18)  # bold=True
-    value_of_players_hand_font = pygame.font.SysFont('Arial', 16)
-
-    current_state = InitialState()
-
-    # Main game loop
-    while not common_vars.done:
-        # Plot the base table
-        common_vars.screen.fill(GAME_BOARD_COLOR)
-        # TODO: Can handle scaling much better to be prepared for other board sizes.
-        x_pos = int(GAME_BOARD_X_SIZE * 0.12)
-        y_pos = GAME_BOARD_Y_SIZE - 240
-        common_vars.screen.blit(image_db.get_image(IMAGE_PATH + 'yellow_box_179_120.png'), (x_pos, y_pos))
-        x_pos = int((GAME_BOARD_X_SIZE - image_db.get_image(IMAGE_PATH + "bj_banner_yellow2.png").get_width()) / 2)
-        y_pos = GAME_BOARD_Y_SIZE - 500
-        common_vars.screen.blit(image_db.get_image(IMAGE_PATH + "bj_banner_yellow2.png"), (x_pos, y_pos))
+    def __init__(self, headless=False, driver=None, rounds=None, seed=None, journal=None):
+        """
+        Initialize pygame and the common variables.
+
+        :param headless: True to run without a window, sound and pauses.
+        :param driver: A :class:`includes.driver.Driver` playing the game, \
+        or None for the mouse.
+        :param rounds: Number of rounds to play, or None until the player \
+        quits or is out of money.
+        :param seed: Seed of the shoe, or None for a random shoe.
+        :param journal: Filename of a :class:`includes.journal.RoundJournal` \
+        to record all rounds in, or None.
+        """
+        self.start_time = time.perf_counter()
+        self.headless = headless
+        self.driver = driver
+        self.rounds = rounds
+        # Log in the background, not in the middle of a frame
+        self.log_thread = LogThread.get_instance()
+        self.log_thread.start()
+
+        # Initialize pygame hooks
+        if headless:
+            # No window and no sound, only the event queue
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+            pygame.display.init()
+        else:
+            pygame.init()
+            pygame.display.set_caption('Black Jack')
+            pygame.font.init()
+        # Mouse motion isn't used, and would wake the loop when idle
+        pygame.event.set_blocked(pygame.MOUSEMOTION)
+        self.clock = pygame.time.Clock()
+
+        # Instantiate the common variable singleton objects
+        self.common_vars = CommonVariables.get_instance()
+        self.button_status = ButtonStatus.get_instance()
+        self.image_db = ImageDB.get_instance()
+        self.profiler = FrameProfiler.get_instance()
+        self.scheduler = FrameScheduler.get_instance()
+        self.scheduler.clear()
+        self.scheduler.time_scale = 0 if headless else 1.0
+
+        # Populate the needed common variables with initial values
+        common_vars = self.common_vars
+        common_vars.done = False
+        common_vars.player_cash = DEFAULT_PLAYER_BALANCE
+        common_vars.game_rounds = 0
+        common_vars.pause_time = 0
+        common_vars.dealer_last_hand = 0
+        common_vars.player_hands = []
+        if journal is not None and seed is None:
+            seed = random.getrandbits(63)  # The seed is recorded in the journal
+        if seed is not None:
+            common_vars.shoe_of_decks = CardDecks(NUM_OF_DECKS, seed)
+        self.journal = None
+        self.recorder = None
+        if journal is not None:
+            self.journal = RoundJournal(journal)
+            common_vars.shoe_of_decks = RecordingShoe(common_vars.shoe_of_decks)
+            self.recorder = RoundRecorder(self.journal, common_vars.shoe_of_decks)
+            self.journal.write_shoe(seed, common_vars.player_cash)
+        if headless:
+            common_vars.screen = None  # Nothing is plotted
+            common_vars.text_font = None
+            self.value_of_players_hand_font = None
+        else:
+            common_vars.screen = DirtyRectRenderer(pygame.display.set_mode(GAME_BOARD_SIZE))
+            common_vars.text_font = pygame.font.SysFont('Arial', 18)  # bold=True
+            self.value_of_players_hand_font = pygame.font.SysFont('Arial', 16)
+            self.preload()
+
+        # The sizes of the buttons and chips are needed for their areas on the table
+        image_db = self.image_db
+        common_vars.button_image_width = image_db.get_image(IMAGE_PATH_BUTTONS + HIT_BUTTON_FILENAME_ON).get_width()
+        common_vars.button_image_height = image_db.get_image(IMAGE_PATH_BUTTONS + HIT_BUTTON_FILENAME_ON).get_height()
+        common_vars.chips_image_width = image_db.get_image(IMAGE_PATH_CHIPS + CHIP_5_FILENAME_ON).get_width()
+        common_vars.chips_image_height = image_db.get_image(IMAGE_PATH_CHIPS + CHIP_5_FILENAME_ON).get_height()
+
+    def preload(self):
+        """
+        Load all images and sounds in the background while showing the
+        progress.
+
+        :return: None
+
+        """
+        common_vars = self.common_vars
+        preloader = AssetPreloader(preload_manifest())
+        while not preloader.poll() and not common_vars.done:
+            if pygame.event.get(pygame.QUIT):
+                common_vars.done = True
+            plot_preload_progress(common_vars.screen, preloader.progress(), common_vars.text_font)
+            common_vars.screen.update()
+            self.clock.tick(30)
+
+    def plot_table(self):
+        """
+        Plot the table, the value of the players hands and the status texts
+        below the cards and buttons plotted by the states.
+
+        :return: None
+
+        """
+        common_vars = self.common_vars
+        common_vars.screen.blit(self.image_db.get_table_background(), (0, 0))
+        self.profiler.mark(BACKGROUND)
 
         if COUNTING_HELP:
             # Plot the value of the current hand
             x_pos = 22
             for hand in common_vars.player_hands:
-                count = get_value_of_players_hand(hand)
+                count = hand.value
                 if count:
-                    message = value_of_players_hand_font.render('{0}'.format(count), False, YELLOW_COLOR)
+                    message = render_text(self.value_of_players_hand_font, '{0}'.format(count), False, YELLOW_COLOR)
                     common_vars.screen.blit(message, (x_pos, GAME_BOARD_Y_SIZE - 270))
                 x_pos += GAP_BETWEEN_SPLIT
 
         # Plot the players current credits and number of played rounds.
         x_pos, y_pos = STATUS_START_POS
-        message1 = common_vars.text_font.render('[ Credits: $ {0}]   [Hands played: {1} ]'.format(
+        message1 = render_text(common_vars.text_font, '[ Credits: $ {0}]   [Hands played: {1} ]'.format(
             common_vars.player_cash, common_vars.game_rounds), False, YELLOW_COLOR)
         common_vars.screen.blit(message1, (x_pos, y_pos))
-        message2 = common_vars.text_font.render('[ Dealers last hand: {0} ]'.format(
+        message2 = render_text(common_vars.text_font, '[ Dealers last hand: {0} ]'.format(
             common_vars.dealer_last_hand), False, YELLOW_COLOR)
         common_vars.screen.blit(message2, (x_pos, y_pos + 25))
+        self.profiler.mark(PLOTTING)
+
+    def run(self):
+        """
+        The main game loop, until the game is done.
+
+        :return: Number of rounds played to the end.
+
+        """
+        common_vars = self.common_vars
+        button_status = self.button_status
+        profiler = self.profiler
+        scheduler = self.scheduler
+        current_state = InitialState()
+
+        # Main game loop
+        while not common_vars.done:
+            # Only key and expose events are taken here, the states handle the mouse events
+            for event in pygame.event.get((pygame.KEYDOWN, pygame.VIDEOEXPOSE)):
+                if event.type == pygame.VIDEOEXPOSE:
+                    common_vars.screen.invalidate()
+                elif event.key == PROFILER_TOGGLE_KEY:
+                    profiler.toggle()
+                elif event.key == PROFILER_DUMP_KEY:
+                    profiler.dump()
+
+            # Run the actions which are due, e.g. the end of a pause
+            scheduler.run_due()
+
+            profiler.start_frame()
+            state_changed = False
+            if scheduler.paused:
+                # The states are paused, keep the window responsive and let a
+                # mouse click skip the pause
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        common_vars.done = True
+                    elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                        scheduler.skip()
+                state_name = 'Paused'
+                if not self.headless:
+                    common_vars.screen.repeat()
+            else:
+                state_name = type(current_state).__name__
+                if not self.headless:
+                    self.plot_table()
 
-        # Go to current state
-        current_state(common_vars, button_status)
+                # Go to current state
+                if self.driver is not None:
+                    self.driver(current_state, common_vars, button_status)
+                state_class = type(current_state)
+                current_state(common_vars, button_status)
+                state_changed = type(current_state) is not state_class
+                if self.recorder is not None:
+                    self.recorder(current_state, common_vars)
+                profiler.mark(STATE)
+                if not self.headless:
+                    profiler.plot(common_vars.screen)
 
-        # Update the content of the display
-        pygame.display.flip()
+            if self.rounds is not None and common_vars.game_rounds > self.rounds:
+                # The last round is played, the next one just started
+                common_vars.done = True
+
+            # Pause the states as long as asked for, without blocking the loop
+            if common_vars.pause_time:
+                scheduler.pause(common_vars.pause_time)
+                common_vars.pause_time = 0  # Reset
+
+            if self.headless:
+                # No display and no waiting, run the next frame at once
+                profiler.end_frame(state_name)
+                continue
+
+            # Update the changed areas of the display
+            dirty_rects = common_vars.screen.update()
+            profiler.mark(FLIP)
+            if profiler.time_to_first_frame is None:
+                profiler.time_to_first_frame = time.perf_counter() - self.start_time
+                logging.info('BlackJack: First frame after %.3f s', profiler.time_to_first_frame)
+
+            if WAIT_WHEN_IDLE and (scheduler.paused or not dirty_rects and not state_changed):
+                # Nothing is changing, sleep until an event or the end of the pause
+                scheduler.wait(MAX_IDLE_WAIT)
+
+            # Set the frame rate fps for window update
+            self.clock.tick(FRAME_RATE)
+            profiler.mark(SLEEP)
+            profiler.end_frame(state_name)
+
+        logging.info('BlackJack: Text cache %s', text_cache_info())
+        if self.journal is not None:
+            self.journal.close()
+        self.log_thread.stop()
+        # The round in progress, if any, isn't played to the end
+        return max(0, common_vars.game_rounds - 1)
+
+
+def shoe_seed(text):
+    """
+    The type of --seed, a seed which fits in the shoe record of the
+    journal.
+
+    :param text: The seed on the command line.
+    :return: The seed as an integer.
+
+    """
+    seed = int(text)
+    if not 0 <= seed <= MAX_SEED:
+        raise argparse.ArgumentTypeError('seed has to be 0 to {0}: {1}'.format(MAX_SEED, text))
+    return seed
+
+
+def main():
+    """
+    Parse the command line and play the game.
+
+    :return: None
+
+    """
+    parser = argparse.ArgumentParser(description='Play Black Jack.')
+    parser.add_argument('--headless', action='store_true',
+                        help='run without a window, sound and pauses, played by a driver')
+    parser.add_argument('--rounds', type=int, default=None, help='number of rounds to play')
+    parser.add_argument('--script', default=None,
+                        help='actions of a scripted player, e.g. "10 play hit stand", '
+                             'default basic strategy in headless mode')
+    parser.add_argument('--bet', type=int, default=LOWEST_BET, help='bet of each round with basic strategy')
+    parser.add_argument('--seed', type=shoe_seed, default=None, help='seed of the shoe, 0 to 2**64 - 1')
+    parser.add_argument('--journal', default=None, help='record all rounds in this journal file')
+    args = parser.parse_args()
 
-        # Insert a pause (Note! locking for input or updates during this period)
-        if common_vars.pause_time:
-            time.sleep(common_vars.pause_time)
-            common_vars.pause_time = 0  # Reset
+    driver = None
+    if args.script is not None:
+        driver = ScriptedDriver(args.script.replace(',', ' ').split())
+    elif args.headless:
+        driver = StrategyDriver(load_strategy(NUM_OF_DECKS), args.bet)
 
-        # Set the frame rate fps for window update
-        clock.tick(10)
+    game = BlackJack(args.headless, driver, args.rounds, args.seed, args.journal)
+    start = time.perf_counter()
+    rounds = game.run()
+    if args.headless:
+        print('Played {0} rounds in {1:.3f} s, credits $ {2}'.format(
+            rounds, time.perf_counter() - start, game.common_vars.player_cash))
 
 
 if __name__ == '__main__':
-    MY_GAME = BlackJack()
+    main()
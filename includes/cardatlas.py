@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+All card images packed into one atlas image.
+
+The 52 card faces and the card back are packed in a grid, the faces in
+card code order (see :mod:`includes.playingcard`) and the card back last
+at CARDBACK_CODE. The atlas is saved in CACHE_PATH together with an
+index, a JSON list with the rect of each code, and built again when an
+image in IMAGE_PATH_CARDS is newer than the atlas. Run this module from
+the project root to build it at once:
+python includes/cardatlas.py
+
+In the game the atlas is loaded with one file open and each card is a
+subsurface of it, taken by code without building any file name, see
+:class:`includes.common.CardAtlas`.
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import sys
+import os
+import json
+import logging
+import pygame
+
+# Local imports
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from globals import *
+
+CARD_RANKS = ("ace", "2", "3", "4", "5", "6", "7", "8", "9", "10", "jack", "queen", "king")
+CARD_SUITS = ("spades", "clubs", "diamonds", "hearts")
+CARDBACK_CODE = 52
+CARDS_PER_ROW = 13
+CARD_ATLAS_FILENAME = 'card_atlas.png'
+CARD_ATLAS_INDEX_FILENAME = 'card_atlas.json'
+
+
+def card_filenames():
+    """
+    :return: The file names of the card images in code order, with the \
+    card back last.
+
+    """
+    filenames = [rank + '_of_' + suit + '.png' for suit in CARD_SUITS for rank in CARD_RANKS]
+    filenames.append(CARDBACK_FILENAME)
+    return filenames
+
+
+def build_card_atlas(cards_path, cache_path):
+    """
+    Pack the card images into the atlas and save it with its index.
+
+    :param cards_path: Directory of the card images.
+    :param cache_path: Directory where the atlas and the index are saved.
+    :return: A list with the rect (x, y, width, height) of each code.
+
+    """
+    images = [pygame.image.load(os.path.join(cards_path, filename)) for filename in card_filenames()]
+    width = max(image.get_width() for image in images)
+    height = max(image.get_height() for image in images)
+    rows = (len(images) + CARDS_PER_ROW - 1) // CARDS_PER_ROW
+    atlas = pygame.Surface((width * CARDS_PER_ROW, height * rows), pygame.SRCALPHA, 32)
+    rects = []
+    for code, image in enumerate(images):
+        x_pos = (code % CARDS_PER_ROW) * width
+        y_pos = (code // CARDS_PER_ROW) * height
+        atlas.blit(image, (x_pos, y_pos))
+        rects.append((x_pos, y_pos, image.get_width(), image.get_height()))
+
+    os.makedirs(cache_path, exist_ok=True)
+    pygame.image.save(atlas, os.path.join(cache_path, CARD_ATLAS_FILENAME))
+    with open(os.path.join(cache_path, CARD_ATLAS_INDEX_FILENAME), 'w') as index_file:
+        json.dump({'source_time': _newest_time(cards_path), 'rects': rects}, index_file)
+    logging.info('build_card_atlas: Saved %d cards in %s', len(rects), cache_path)
+    return rects
+
+
+def load_card_atlas_index(cards_path, cache_path):
+    """
+    Load the index of the atlas, or build the atlas if it's missing or
+    older than the card images.
+
+    :param cards_path: Directory of the card images.
+    :param cache_path: Directory of the atlas and the index.
+    :return: A list with the rect (x, y, width, height) of each code.
+
+    """
+    try:
+        with open(os.path.join(cache_path, CARD_ATLAS_INDEX_FILENAME)) as index_file:
+            index = json.load(index_file)
+        if index['source_time'] >= _newest_time(cards_path) and len(index['rects']) == CARDBACK_CODE + 1 \
+                and os.path.exists(os.path.join(cache_path, CARD_ATLAS_FILENAME)):
+            return [tuple(rect) for rect in index['rects']]
+        logging.info('load_card_atlas_index: The card images are changed, build again')
+    except (OSError, ValueError, KeyError):
+        logging.info('load_card_atlas_index: No card atlas in %s', cache_path)
+    return build_card_atlas(cards_path, cache_path)
+
+
+def _newest_time(cards_path):
+    """
+    :return: The newest modification time of the images in cards_path.
+
+    """
+    with os.scandir(cards_path) as entries:
+        return max(entry.stat().st_mtime for entry in entries if entry.name.endswith('.png'))
+
+
+if __name__ == '__main__':
+    build_card_atlas(os.path.join(MAIN_DIR, IMAGE_PATH_CARDS), os.path.join(MAIN_DIR, CACHE_PATH))
@@ -2,7 +2,20 @@
 """
 Create a playing card deck (normal 52 card deck) or virtual "Shoe" of
 decks if more than one is defined.
-When one ore more decks are created they will be shuffled.
+When one ore more decks are created they will be shuffled, by default
+with the global random generator or with a provided random.Random
+instance or seed to get an independent and reproducible order.
+
+The order of the shoe and how far it has been dealt can be saved with
+snapshot() in a few hundred bytes and restored later, e.g. to play a
+round again with another decision or to reproduce a bug:
+snapshot = shoe.snapshot()
+...
+shoe.restore(snapshot)
+
+The shoe keeps a running count, with one of the card counting systems
+below, and the number of remaining cards of each rank up to date for
+each dealt card.
 
 Copyright (C) Torbjorn Hedqvist - All Rights Reserved
 You may use, distribute and modify this code under the
@@ -10,124 +23,221 @@ terms of the MIT license. See LICENSE file in the project
 root for full license information.
 
 """
-from random import shuffle
-from playingcard import PlayingCard
+import random
+import struct
+from playingcard import PlayingCard, CARDS
+
+# Card counting systems, the count of each rank 1 (ace) to 13 at index rank - 1.
+# KO is unbalanced, the running count is used as it is without a true count.
+HI_LO = (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1)
+KO = (-1, 1, 1, 1, 1, 1, 1, 0, 0, -1, -1, -1, -1)
+OMEGA_II = (0, 1, 1, 2, 2, 2, 1, 0, -1, -2, -2, -2, -2)
+
+# A snapshot is the version and the cursor followed by all card codes in dealt order
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<BH')
 
 
 class CardDecks(object):
     """
-    When instantiated holds a list of
-    :meth:`lib.playingcard.PlayingCard` objects in random order.
+    When instantiated holds all cards of the decks as a compact array of
+    card codes (see :meth:`lib.playingcard.PlayingCard`) in random order.
+    Cards are dealt by advancing a cursor and the shoe is reshuffled in
+    place, so no allocation is done after the shoe is created.
 
     """
 
-    def __init__(self, num_of_decks=1):
+    def __init__(self, num_of_decks=1, rng=None, counting_system=HI_LO, snapshot=None):
         """
         Create one or more playing card decks and shuffle them all
-        together in a list.
-
+        together in an array.
+
+        :param num_of_decks:
+        :param rng: Optional random.Random instance or integer seed used \
+        to shuffle, default the global random generator.
+        :param counting_system: The count of each rank, e.g. HI_LO, KO \
+        or OMEGA_II.
+        :param snapshot: Optional :meth:`snapshot` to restore instead of \
+        shuffling new decks, num_of_decks is then not used.
         """
-        self.__card_decks = []
-        for num in range(0, num_of_decks):
-            for suit in range(0, 4):
-                for rank in range(1, 14):
-                    instance = PlayingCard(rank, suit)
-                    self.__card_decks.append(instance)
-        self.shuffle()
+        if rng is None:
+            rng = random
+        elif isinstance(rng, int):
+            rng = random.Random(rng)
+        self.__rng = rng
+        self.__card_decks = bytearray(range(0, 52)) * num_of_decks
+        self.__cursor = 0
+        # The count of each card code, to not look up the rank when dealt
+        self.__count_of_code = tuple(counting_system[code % 13] for code in range(0, 52))
+        self.__running_count = 0
+        self.__full_composition = (4 * num_of_decks,) * 13  # Of a shuffled shoe
+        self.__composition = None
+        if snapshot is None:
+            self.shuffle()
+        else:
+            self.restore(snapshot)
 
     def shuffle(self):
         """
-        Shuffle all the cards in this instance list.
+        Put all dealt cards back into the shoe and shuffle all the
+        cards in place.
 
         :return: None
 
         """
-        shuffle(self.__card_decks)
+        self.__rng.shuffle(self.__card_decks)
+        self.__cursor = 0
+        self.__running_count = 0
+        self.__composition = list(self.__full_composition)
 
     def pop(self):
         """
-        Pop (pull and remove) the last card in the list.
+        Pop (pull and remove) the next card in the shoe.
 
         :return: A :meth:`lib.playingcard.PlayingCard` object.
 
         """
-        return self.__card_decks.pop()
+        code = self.__card_decks[self.__cursor]
+        self.__cursor += 1
+        self.__running_count += self.__count_of_code[code]
+        self.__composition[code % 13] -= 1
+        return CARDS[code]
+
+    def peek(self, num_of_cards=1):
+        """
+        Look at the next cards in the shoe without removing them.
+
+        :param num_of_cards:
+        :return: A list of :meth:`lib.playingcard.PlayingCard` objects, \
+        the next card to be dealt first.
+
+        """
+        cursor = self.__cursor
+        return [CARDS[code] for code in self.__card_decks[cursor:cursor + num_of_cards]]
 
     def length(self):
         """
-        :return: The length (the number of remaining cards) in the list.
+        :return: The length (the number of remaining cards) in the shoe.
 
         """
-        return len(self.__card_decks)
+        return len(self.__card_decks) - self.__cursor
 
+    # The number of remaining cards in the shoe, the same as length()
+    remaining = length
 
-class TestingCardDeck(object):
-    """
-    Used to create a pre-defined deck for testing purposes
+    def penetration(self):
+        """
+        :return: The part of the shoe which has been dealt, 0.0 to 1.0.
 
-    """
+        """
+        return self.__cursor / len(self.__card_decks)
 
-    def __init__(self):
+    def running_count(self):
         """
-        Instantiate an instance of a deck containing
-        :meth:`lib.playingcard.PlayingCard` objects
-        which have pre-defined values to test specific
-        scenarios in the Black Jack game
+        :return: The sum of the counts of all dealt cards since the last \
+        shuffle.
 
         """
-        self.__card_decks = []
-
-        for x in range(1, 52):  # Fill up a deck of dummies
-            instance = PlayingCard(7, 1)
-            self.__card_decks.append(instance)
-
-        # Stay on 19 (ace + 8) and dealer gets two aces 1+1+4+(common value in deck above)
-        self.__card_decks.append(PlayingCard(4, 1))
-        self.__card_decks.append(PlayingCard(1, 0))
-        self.__card_decks.append(PlayingCard(8, 3))
-        self.__card_decks.append(PlayingCard(1, 3))
-        self.__card_decks.append(PlayingCard(1, 2))
-
-        # Two tens to player to be used for split, followed by two aces to see how a
-        # double black jack is handled.
-        self.__card_decks.append(PlayingCard(6, 2))
-        self.__card_decks.append(PlayingCard(8, 1))
-        self.__card_decks.append(PlayingCard(4, 1))
-        self.__card_decks.append(PlayingCard(10, 0))
-
-        # First hand for player is a BlackJack
-        self.__card_decks.append(PlayingCard(6, 2))
-        self.__card_decks.append(PlayingCard(10, 1))
-        self.__card_decks.append(PlayingCard(4, 1))
-        self.__card_decks.append(PlayingCard(1, 0))
-
-        # Start with a low hand for player to test double down
-        self.__card_decks.append(PlayingCard(6, 2))
-        self.__card_decks.append(PlayingCard(2, 1))
-        self.__card_decks.append(PlayingCard(4, 1))
-        self.__card_decks.append(PlayingCard(2, 0))
-
-        # Create a split, first hand ok and second busted
-        self.__card_decks.append(PlayingCard(12, 1))
-        self.__card_decks.append(PlayingCard(4, 1))
-        self.__card_decks.append(PlayingCard(2, 0))
-        self.__card_decks.append(PlayingCard(6, 2))
-        self.__card_decks.append(PlayingCard(8, 1))
-        self.__card_decks.append(PlayingCard(4, 1))
-        self.__card_decks.append(PlayingCard(8, 0))
+        return self.__running_count
 
-    def pop(self):
+    def true_count(self):
         """
-        Pop (pull and remove) the last card in the list.
+        :return: The running count per remaining deck in the shoe.
 
-        :return: A :meth:`lib.playingcard.PlayingCard` object.
+        """
+        remaining_decks = (len(self.__card_decks) - self.__cursor) / 52
+        if not remaining_decks:
+            return 0.0
+        return self.__running_count / remaining_decks
 
+    def composition(self):
         """
-        return self.__card_decks.pop()
+        :return: A list with the number of remaining cards of each rank, \
+        the count of rank r at index r - 1, as in \
+        :func:`includes.probability.shoe_composition`.
+
+        """
+        return list(self.__composition)
+
+    def snapshot(self):
+        """
+        Save the order of all cards in the shoe and how far it has been
+        dealt. The dealt cards are saved too, so a shuffle after
+        :meth:`restore` with the same random generator state gives the
+        same order as it would have without the snapshot.
+
+        :return: The snapshot as bytes, one byte per card and a 3 byte header.
+
+        """
+        return SNAPSHOT_HEADER.pack(SNAPSHOT_VERSION, self.__cursor) + bytes(self.__card_decks)
+
+    def restore(self, snapshot):
+        """
+        Restore the order of the cards and the cursor from a
+        :meth:`snapshot`, the running count and composition are counted
+        again from the dealt cards. The random generator and the counting
+        system are kept.
+
+        :param snapshot: Bytes from :meth:`snapshot`.
+        :return: None
 
-    def length(self):
         """
-        :return: The length (the number of remaining cards) in the list.
+        try:
+            version, cursor = SNAPSHOT_HEADER.unpack_from(snapshot)
+        except struct.error:
+            raise ValueError("Error: snapshot too short: " + str(len(snapshot)))
+        card_decks = bytearray(snapshot[SNAPSHOT_HEADER.size:])
+        if version != SNAPSHOT_VERSION:
+            raise ValueError("Error: unknown snapshot version: " + str(version))
+        if cursor > len(card_decks) or (card_decks and max(card_decks) > 51):
+            raise ValueError("Error: invalid snapshot of a shoe")
+        full_composition = [0] * 13
+        for code in card_decks:
+            full_composition[code % 13] += 1
+        composition = list(full_composition)
+        running_count = 0
+        count_of_code = self.__count_of_code
+        for code in card_decks[:cursor]:
+            composition[code % 13] -= 1
+            running_count += count_of_code[code]
+        self.__card_decks = card_decks
+        self.__cursor = cursor
+        self.__full_composition = tuple(full_composition)
+        self.__composition = composition
+        self.__running_count = running_count
+
+
+# The cards of TestingCardDeck in dealt order, to test specific scenarios in the Black Jack game
+TESTING_CARDS = (
+    # Create a split, first hand ok and second busted
+    PlayingCard(8, 0), PlayingCard(4, 1), PlayingCard(8, 1), PlayingCard(6, 2),
+    PlayingCard(2, 0), PlayingCard(4, 1), PlayingCard(12, 1),
+    # Start with a low hand for player to test double down
+    PlayingCard(2, 0), PlayingCard(4, 1), PlayingCard(2, 1), PlayingCard(6, 2),
+    # First hand for player is a BlackJack
+    PlayingCard(1, 0), PlayingCard(4, 1), PlayingCard(10, 1), PlayingCard(6, 2),
+    # Two tens to player to be used for split, followed by two aces to see how a
+    # double black jack is handled.
+    PlayingCard(10, 0), PlayingCard(4, 1), PlayingCard(8, 1), PlayingCard(6, 2),
+    # Stay on 19 (ace + 8) and dealer gets two aces 1+1+4+(common value in deck below)
+    PlayingCard(1, 2), PlayingCard(1, 3), PlayingCard(8, 3), PlayingCard(1, 0), PlayingCard(4, 1)) + \
+    (PlayingCard(7, 1),) * 51  # Fill up a deck of dummies
+TESTING_SNAPSHOT = SNAPSHOT_HEADER.pack(SNAPSHOT_VERSION, 0) + bytes(card.code for card in TESTING_CARDS)
+
+
+class TestingCardDeck(CardDecks):
+    """
+    Used to create a pre-defined deck for testing purposes, restored
+    from the fixed snapshot TESTING_SNAPSHOT.
+
+    """
+
+    def __init__(self):
+        """
+        Instantiate an instance of a deck containing
+        :meth:`lib.playingcard.PlayingCard` objects
+        which have pre-defined values to test specific
+        scenarios in the Black Jack game
 
         """
-        return len(self.__card_decks)
+        super().__init__(snapshot=TESTING_SNAPSHOT)
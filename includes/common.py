@@ -12,20 +12,64 @@ root for full license information.
 # Standard imports
 import sys
 import os
+import functools
+import collections
 import pygame
-import inspect  # To be used to print function name in log statements
 
 # Local imports
 MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
 from globals import *
-from playingcard import PlayingCard
+from engine import *
+from profiler import *
+from renderer import *
+from scheduler import *
+from cardatlas import *
 
 ############################
 # Common support functions #
 ############################
 
 
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(font, text, antialias, color):
+    """
+    Render a text, the same as font.render(text, antialias, color), but
+    the surfaces of the last TEXT_CACHE_SIZE texts are kept and returned
+    again. The texts on the table change only a few times per round, so
+    most frames don't render any text at all. Only blit the returned
+    surface, don't draw on it.
+
+    :param font: A pygame Font.
+    :param text: <string>
+    :param antialias: <bool>
+    :param color: A color tuple.
+    :return: The text in pygame Surface object format.
+
+    """
+    return font.render(text, antialias, color)
+
+
+def text_cache_info():
+    """
+    :return: Hits, misses and size of the text cache, see \
+    functools.lru_cache.
+
+    """
+    return render_text.cache_info()
+
+
+def text_cache_clear():
+    """
+    Empty the text cache.
+
+    :return: None
+
+    """
+    render_text.cache_clear()
+
+
+@plotting
 def plot_players_hands(screen,
                        player_pos_start,
                        player_hands,
@@ -42,20 +86,20 @@ def plot_players_hands(screen,
     :return: None
 
     """
-    logging.debug(inspect.stack()[0][3] + ': enter')
+    logging.debug('plot_players_hands: enter')
 
     player_x_pos, player_y_pos = player_pos_start
     image_db = ImageDB.get_instance()
+    card_atlas = CardAtlas.get_instance()
+    cards = card_atlas.get_cards()
     for index_x, hand in enumerate(player_hands):
         for index_y, card in enumerate(hand):
-            image = BlackJackCardFormatter.get_instance(IMAGE_PATH_CARDS).get_string(card)
-
             if index_y == 2 and len(hand) == 3 and double_downs[index_x]:
                 # rotate the third card if we have a double down in current hand
-                screen.blit(pygame.transform.rotate(image_db.get_image(image), 90),
+                screen.blit(card_atlas.get_card_variant(card.code, rotation=90),
                             (player_x_pos, player_y_pos))
             else:
-                screen.blit(image_db.get_image(image), (player_x_pos, player_y_pos))
+                screen.blit(cards[card.code], (player_x_pos, player_y_pos))
             player_x_pos += GAP_BETWEEN_CARDS
             player_y_pos -= 14
 
@@ -85,6 +129,7 @@ def plot_players_hands(screen,
         player_x_pos += GAP_BETWEEN_SPLIT
 
 
+@plotting
 def plot_dealers_hand(screen,
                       dealer_card_start_pos,
                       dealer_cards,
@@ -100,23 +145,22 @@ def plot_dealers_hand(screen,
     :return: None
 
     """
-    logging.debug(inspect.stack()[0][3] + ': enter')
+    logging.debug('plot_dealers_hand: enter')
 
     dealer_x_pos, dealer_y_pos = dealer_card_start_pos
-    image_db = ImageDB.get_instance()
+    cards = CardAtlas.get_instance().get_cards()
     for card in dealer_cards:
         if first_card_hidden is True:
             # Show first dealer card hidden
-            screen.blit(image_db.get_image(IMAGE_PATH_CARDS + CARDBACK_FILENAME),
-                        (dealer_x_pos, dealer_y_pos))
+            screen.blit(cards[CARDBACK_CODE], (dealer_x_pos, dealer_y_pos))
         else:
-            image = BlackJackCardFormatter.get_instance(IMAGE_PATH_CARDS).get_string(card)
-            screen.blit(image_db.get_image(image), (dealer_x_pos, dealer_y_pos))
+            screen.blit(cards[card.code], (dealer_x_pos, dealer_y_pos))
         first_card_hidden = False
         dealer_x_pos += GAP_BETWEEN_CARDS
         dealer_y_pos += 14
 
 
+@plotting
 def plot_chips(screen,
                player_cash,
                chips_image_width,
@@ -132,7 +176,7 @@ def plot_chips(screen,
     :return: None
 
     """
-    logging.debug(inspect.stack()[0][3] + ': enter')
+    logging.debug('plot_chips: enter')
     chips_x_pos, chips_y_pos = CHIPS_START_POS
     gap = chips_image_width + GAP_BETWEEN_CHIPS
     image_db = ImageDB.get_instance()
@@ -172,6 +216,7 @@ def plot_chips(screen,
                         (chips_x_pos, chips_y_pos))
 
 
+@plotting
 def plot_bets(screen, player_bets):
     """
     Plot all the bet 'piles' which are available in the players bet stack.
@@ -185,7 +230,7 @@ def plot_bets(screen, player_bets):
     :return: None
 
     """
-    logging.debug(inspect.stack()[0][3] + ': enter')
+    logging.debug('plot_bets: enter')
     image_db = ImageDB.get_instance()
     chip_x_pos = 30
     chip_y_pos = 360
@@ -198,6 +243,7 @@ def plot_bets(screen, player_bets):
         chip_x_pos += 50
 
 
+@plotting
 def plot_buttons(screen, button_status):
     """
     Plot all the buttons on the game board and based on the button_status
@@ -209,7 +255,7 @@ def plot_buttons(screen, button_status):
     :return: None
 
     """
-    logging.debug(inspect.stack()[0][3] + ': enter')
+    logging.debug('plot_buttons: enter')
     button_x_pos, button_y_pos = BUTTONS_START_POS
     image_db = ImageDB.get_instance()
     if button_status.play is True:
@@ -266,6 +312,7 @@ def plot_buttons(screen, button_status):
 #     screen.blit(account_text, (620, GAME_BOARD_Y_SIZE - 33))
 
 
+@plotting
 def plot_results(screen, text_font, message):
     """
     Plot a text message down in the status bar at the same location
@@ -279,157 +326,14 @@ def plot_results(screen, text_font, message):
     :return: None
 
     """
-    logging.debug(inspect.stack()[0][3] + ': enter')
+    logging.debug('plot_results: enter')
 
     assert isinstance(message, str)
-    text_to_plot = text_font.render(message, False, GOLD_COLOR)
+    text_to_plot = render_text(text_font, message, False, GOLD_COLOR)
     x_pos, y_pos = STATUS_START_POS
     screen.blit(text_to_plot, (x_pos, y_pos + 50))
 
 
-def get_value_of_players_hand(hand):
-    """
-    Calculate the value of the players hand according to the Black Jack
-    rules. First of all treat all face cards as 10.
-    If the player gets an ace and the value of the rest of the
-    hand is equal or lower than 10 the ace will be treated as a
-    "Soft ace" with value 11. If the player has an ace or more and gets
-    busted, aces will be changed to hard aces with value 1 one by
-    one if a new bust occurs.
-
-    :param hand: A list of :meth:`lib.playingcard.PlayingCard` objects.
-    :return: Total value of the hand as an integer.
-
-    """
-    logging.debug(inspect.stack()[0][3] + ': enter')
-    assert isinstance(hand, list)
-    summary = 0
-    num_of_soft_aces = 0
-    for card in hand:
-        assert isinstance(card, PlayingCard)
-        rank = card.get_rank()
-        if rank > 10:
-            # Treat all face cards as 10
-            summary += 10
-            logging.debug(inspect.stack()[0][3] + ': face')
-        elif rank == 1 and summary <= 10:
-            # If an ace, start treating as Soft hand "high ace"
-            summary += 11
-            num_of_soft_aces += 1
-            logging.debug(inspect.stack()[0][3] + ': soft ace')
-        else:
-            summary += rank
-            logging.debug(inspect.stack()[0][3] + ': add rank {0} to summary givs {1}'.format(rank, summary))
-
-        if num_of_soft_aces and summary > 21:
-            # turn soft to hard ace , decrease with 10 since we already accounted for 11
-            summary -= 10
-            num_of_soft_aces -= 1
-            logging.debug(inspect.stack()[0][3] + ': busted, toggle soft to hard ace')
-
-    return summary
-
-
-def get_value_of_dealers_hand(hand):
-    """
-    Calculate the value of the dealers hand according to the Black Jack
-    rules. First of all treat all face cards as 10.
-    If the card is an ace and if the total summary of the current hand
-    will be 17 or more but less than 21 the dealer has to count the ace
-    as a "soft" ace.
-
-    :param hand: A list of :meth:`lib.playingcard.PlayingCard` objects.
-    :return: Total value of the hand as an integer.
-
-    """
-    logging.debug(inspect.stack()[0][3] + ': enter')
-    assert isinstance(hand, list)
-    summary = 0
-    hard_ace = 0
-    for card in hand:
-        assert isinstance(card, PlayingCard)
-        rank = card.get_rank()
-        if rank > 10:
-            # Treat all face cards as 10
-            summary += 10
-            logging.debug(inspect.stack()[0][3] + ': face')
-        elif rank == 1:
-            # If the card is an ace and if the total summary of the current hand will be 17 or more
-            # but less than 21 the dealer has to count the ace as a "soft" ace.
-            if 17 <= (summary + 11) < 22:
-                summary += 11
-                logging.debug(inspect.stack()[0][3] + ': soft ace')
-            else:
-                # Save the ace for later evaluation when more cards are added to the summary
-                hard_ace = 1
-                summary += 1
-                logging.debug(inspect.stack()[0][3] + ': hard ace')
-                continue
-        else:
-            summary += rank
-            logging.debug(inspect.stack()[0][3] + ': add rank {0} to summary givs {1}'.format(rank, summary))
-
-        if hard_ace and 17 <= (summary + hard_ace * 10) < 22:
-            # turn hard ace to soft, increase with 10 since 1 is already in the summary, total 11
-            summary += 10
-            logging.debug(inspect.stack()[0][3] + ': toggle hard to soft ace')
-
-    return summary
-
-
-def is_cut_passed(shoe_of_decks):
-    """
-    Check that we haven't passed the "cut" in the shoe of decks where
-    cut should be approx 18% of total shoe size.
-
-    :param shoe_of_decks:
-    :return: True if cut is passed else False.
-
-    """
-    logging.debug(inspect.stack()[0][3] + ': enter')
-
-    status = False
-    if shoe_of_decks is None or shoe_of_decks.length() < (NUM_OF_DECKS * 52 * 0.18):
-        logging.debug(inspect.stack()[0][3] + 'Passed the "cut" in the shoe')
-        status = True
-    return status
-
-
-def is_possible_split(player_cards):
-    """
-    Compare the first and second card in the players hand and if the
-    rank of both cards are equal return True else return False.
-
-    :param player_cards:
-    :return: True or False
-
-    """
-    logging.debug(inspect.stack()[0][3] + ': enter')
-
-    if len(player_cards) != 2:
-        return False
-    if player_cards[0].get_rank() != player_cards[1].get_rank():
-        return False
-    else:
-        return True
-
-
-def can_double_bet(player_bets, player_cash):
-    """
-    If the player has at least the amount of money as the first bet
-    return True else return False
-
-    :param player_bets:
-    :param player_cash:
-    :return: True or False
-
-    """
-    if player_cash < sum(player_bets[0]):
-        return False
-    else:
-        return True
-
-
 ##########################
 # Common support classes #
 ##########################
@@ -441,6 +345,8 @@ class ImageDB:
     which contains a library (dict) that stores the images when loaded.
     This will avoid reloading the image every time the function is called
     in the main game loop.
+    When the display exists the images are converted to the pixel format
+    of the display, so they don't have to be converted in every blit.
     Usage:
     instance = ImageDB.get_instance()
     image = instance.get_image(path)
@@ -464,8 +370,12 @@ class ImageDB:
         return cls.instance
 
     def __init__(self):
-        logging.info(inspect.stack()[0][3] + ':' + 'ImageDb instance created')
+        logging.info('ImageDB: instance created')
         self.image_library = {}
+        self.unconverted = set()  # Paths of images loaded before the display existed
+        self.table_background = None
+        # (path, area, rotation, size, alpha): (source image, variant), least recently used first
+        self.variants = collections.OrderedDict()
 
     def get_image(self, path):
         """
@@ -478,16 +388,215 @@ class ImageDB:
         :return: An image in pygame Surface object format.
 
         """
-        logging.debug(inspect.stack()[0][3] + ':' + 'enter')
+        logging.debug('ImageDB.get_image: enter')
 
         image = self.image_library.get(path)
-        if image is None:
-            logging.info(inspect.stack()[0][3] + ':' + path)
-            canonicalized_path = path.replace('/', os.sep).replace('\\', os.sep)
-            image = pygame.image.load(canonicalized_path)
+        if image is None or path in self.unconverted:
+            if image is None:
+                logging.info('ImageDB.get_image: %s', path)
+                image = self.load_image(path)
+            image = self.convert_image(image, path)
             self.image_library[path] = image
         return image
 
+    @staticmethod
+    def load_image(path):
+        """
+        Load an image from the file system, without adding it to the
+        library. Can be called from any thread.
+
+        :param path: <string> containing the directory path to the image.
+        :return: The image as loaded in pygame Surface object format.
+
+        """
+        canonicalized_path = path.replace('/', os.sep).replace('\\', os.sep)
+        return pygame.image.load(canonicalized_path)
+
+    def add_image(self, path, image):
+        """
+        Add an image loaded with :meth:`load_image` to the library.
+
+        :param path: <string> which the image is found by.
+        :param image: A pygame Surface.
+        :return: The image converted to the pixel format of the display.
+
+        """
+        image = self.convert_image(image, path)
+        self.image_library[path] = image
+        return image
+
+    def convert_image(self, image, path):
+        """
+        Convert the image to the pixel format of the display, with per
+        pixel alpha if the image has it. Before the display exists the
+        image is kept as it is, and converted when it is asked for again.
+
+        :param image: A pygame Surface.
+        :param path: The path of the image in the library.
+        :return: The converted image, or the same image without a display.
+
+        """
+        if pygame.display.get_surface() is None:
+            self.unconverted.add(path)
+            return image
+        self.unconverted.discard(path)
+        if image.get_flags() & pygame.SRCALPHA:
+            return image.convert_alpha()
+        return image.convert()
+
+    def get_variant(self, path, area=None, rotation=0, size=None, alpha=None):
+        """
+        A transformed variant of an image, computed once and then returned
+        from the library. The image is scaled, rotated and faded in that
+        order. The variant is computed again if the image is converted.
+        The last VARIANT_CACHE_SIZE variants used are kept.
+
+        :param path: <string> containing the directory path to the image.
+        :param area: Optional (x, y, width, height) of a part of the image, \
+        e.g. a card in the card atlas.
+        :param rotation: Degrees counterclockwise.
+        :param size: Optional (width, height) to scale to.
+        :param alpha: Optional alpha 0 to 255 of the whole image.
+        :return: The variant in pygame Surface object format.
+
+        """
+        key = (path, area, rotation, size, alpha)
+        image = self.get_image(path)
+        cached = self.variants.get(key)
+        if cached is not None and cached[0] is image:
+            self.variants.move_to_end(key)
+            return cached[1]
+
+        variant = image if area is None else image.subsurface(area)
+        if size is not None:
+            variant = pygame.transform.smoothscale(variant, size)
+        if rotation:
+            variant = pygame.transform.rotate(variant, rotation)
+        if alpha is not None:
+            variant = variant.copy()
+            variant.set_alpha(alpha)
+        self.variants[key] = (image, variant)
+        self.variants.move_to_end(key)
+        if len(self.variants) > VARIANT_CACHE_SIZE:
+            self.variants.popitem(last=False)
+        return variant
+
+    def variant_cache_clear(self):
+        """
+        Forget all variants, they are computed again when asked for.
+
+        :return: None
+
+        """
+        self.variants.clear()
+
+    def get_table_background(self):
+        """
+        The base table, the table color, the box for the bets and the black
+        jack banner, drawn once in a surface with the size of the game board.
+
+        :return: The table background in pygame Surface object format.
+
+        """
+        if self.table_background is None or pygame.display.get_surface() is not None and \
+                TABLE_BACKGROUND in self.unconverted:
+            background = pygame.Surface(GAME_BOARD_SIZE)
+            background.fill(GAME_BOARD_COLOR)
+            # TODO: Can handle scaling much better to be prepared for other board sizes.
+            x_pos = int(GAME_BOARD_X_SIZE * 0.12)
+            y_pos = GAME_BOARD_Y_SIZE - 240
+            background.blit(self.get_image(IMAGE_PATH + 'yellow_box_179_120.png'), (x_pos, y_pos))
+            banner = self.get_image(IMAGE_PATH + 'bj_banner_yellow2.png')
+            x_pos = int((GAME_BOARD_X_SIZE - banner.get_width()) / 2)
+            y_pos = GAME_BOARD_Y_SIZE - 500
+            background.blit(banner, (x_pos, y_pos))
+            self.table_background = self.convert_image(background, TABLE_BACKGROUND)
+        return self.table_background
+
+
+class CardAtlas:
+    """
+    Instantiating this class into an object will create a singleton object
+    which contains the card images as subsurfaces of the atlas, in a tuple
+    indexed by card code, see :mod:`includes.cardatlas`.
+    Usage:
+    cards = CardAtlas.get_instance().get_cards()
+    screen.blit(cards[card.code], (x_pos, y_pos))
+    screen.blit(cards[CARDBACK_CODE], (x_pos, y_pos))
+
+    """
+    instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """
+        If instance is None create an instance of this class
+        and return it, else return the existing instance.
+
+        :return: A CardAtlas instance.
+
+        """
+        if cls.instance is None:
+            cls.instance = cls()
+        return cls.instance
+
+    def __init__(self, cards_path=None, cache_path=None):
+        """
+        :param cards_path: Directory of the card images, default \
+        IMAGE_PATH_CARDS in the project root.
+        :param cache_path: Directory of the atlas, default CACHE_PATH in \
+        the project root.
+        """
+        if cards_path is None:
+            cards_path = os.path.join(MAIN_DIR, IMAGE_PATH_CARDS)
+        if cache_path is None:
+            cache_path = os.path.join(MAIN_DIR, CACHE_PATH)
+        self.rects = load_card_atlas_index(cards_path, cache_path)
+        self.filename = os.path.join(cache_path, CARD_ATLAS_FILENAME)
+        self.atlas = None
+        self.cards = ()
+
+    def get_cards(self):
+        """
+        The atlas is taken from the ImageDB, which converts it to the pixel
+        format of the display, and the subsurfaces are created again only
+        when the atlas has been converted.
+
+        :return: A tuple with a card image (pygame Surface) for each code.
+
+        """
+        atlas = ImageDB.get_instance().get_image(self.filename)
+        if atlas is not self.atlas:
+            self.atlas = atlas
+            self.cards = tuple(atlas.subsurface(rect) for rect in self.rects)
+        return self.cards
+
+    def get_card_variant(self, code, rotation=0, size=None, alpha=None):
+        """
+        A transformed card, see :meth:`ImageDB.get_variant`.
+
+        :param code: The card code, or CARDBACK_CODE.
+        :return: The transformed card in pygame Surface object format.
+
+        """
+        return ImageDB.get_instance().get_variant(self.filename, self.rects[code], rotation, size, alpha)
+
+
+class NoSound:
+    """
+    A sound which plays nothing, used when the mixer isn't initialized.
+
+    """
+    def play(self, *args, **kwargs):
+        """
+        :return: None
+
+        """
+        return None
+
+
+NO_SOUND = NoSound()
+
 
 class SoundDB:
     """
@@ -518,7 +627,7 @@ class SoundDB:
         return cls.instance
 
     def __init__(self):
-        logging.info(inspect.stack()[0][3] + ':' + 'SoundDb instance created')
+        logging.info('SoundDB: instance created')
         self.sound_library = {}
 
     def get_sound(self, path):
@@ -529,19 +638,45 @@ class SoundDB:
 
         :param path: <string> containing the absolute directory path \
         to where the expected sound is located.
-        :return: An sound in pygame Surface object format.
+        :return: A pygame Sound object, or NO_SOUND without a mixer.
 
         """
-        logging.debug(inspect.stack()[0][3] + ':' + 'enter')
+        logging.debug('SoundDB.get_sound: enter')
 
         sound = self.sound_library.get(path)
         if sound is None:
-            logging.info(inspect.stack()[0][3] + ':' + path)
-            canonicalized_path = path.replace('/', os.sep).replace('\\', os.sep)
-            sound = pygame.mixer.Sound(canonicalized_path)
+            if not pygame.mixer.get_init():
+                # Headless or no sound card, nothing to play
+                return NO_SOUND
+            logging.info('SoundDB.get_sound: %s', path)
+            sound = self.load_sound(path)
             self.sound_library[path] = sound
         return sound
 
+    @staticmethod
+    def load_sound(path):
+        """
+        Load a sound from the file system, without adding it to the
+        library. Can be called from any thread.
+
+        :param path: <string> containing the directory path to the sound.
+        :return: A pygame Sound object.
+
+        """
+        canonicalized_path = path.replace('/', os.sep).replace('\\', os.sep)
+        return pygame.mixer.Sound(canonicalized_path)
+
+    def add_sound(self, path, sound):
+        """
+        Add a sound loaded with :meth:`load_sound` to the library.
+
+        :param path: <string> which the sound is found by.
+        :param sound: A pygame Sound object.
+        :return: None
+
+        """
+        self.sound_library[path] = sound
+
 
 class BlackJackCardFormatter:
     """
@@ -574,7 +709,7 @@ class BlackJackCardFormatter:
 
         :param path:
         """
-        logging.info(inspect.stack()[0][3] + ':' + 'BlackJackCardFormatter instance created')
+        logging.info('BlackJackCardFormatter: instance created')
         self.path = path
         self.card_rank = ["Invalid", "ace", "2", "3", "4", "5", "6", "7",
                           "8", "9", "10", "jack", "queen", "king"]
@@ -591,7 +726,7 @@ class BlackJackCardFormatter:
         :return: <string>
 
         """
-        logging.debug(inspect.stack()[0][3] + ':' + 'enter')
+        logging.debug('BlackJackCardFormatter.get_string: enter')
 
         image = self.path + self.card_rank[card.get_rank()] + "_of_" \
             + self.card_suit[card.get_suit()] + ".png"
@@ -630,7 +765,7 @@ class ButtonCollideArea:
 
         :param common_vars:
         """
-        logging.info(inspect.stack()[0][3] + ':' + 'ButtonCollideArea instance created')
+        logging.info('ButtonCollideArea: instance created')
         button_x_pos, button_y_pos = BUTTONS_START_POS
 
         self.play_button_area = pygame.Rect(button_x_pos,
@@ -696,7 +831,7 @@ class ChipsCollideArea:
 
         :param common_vars:
         """
-        logging.info(inspect.stack()[0][3] + ':' + 'ChipsCollideArea instance created')
+        logging.info('ChipsCollideArea: instance created')
         chips_x_pos, chips_y_pos = CHIPS_START_POS
         gap = common_vars.chips_image_width + GAP_BETWEEN_CHIPS
         self.chip_5_area = pygame.Rect(chips_x_pos,
@@ -752,6 +887,7 @@ class CommonVariables:
         self.done = None
         self.screen = None
         self.shoe_of_decks = None
+        self.game_round = None
         self.player_hands = None
         self.hands_status = None
         self.double_downs = None
@@ -761,6 +897,7 @@ class CommonVariables:
         self.player_hit = None
         self.player_cash = None
         self.player_bets = None
+        self.player_actions = None
         self.bets_pos = None
         self.game_rounds = None
         self.text_font = None
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""
+Drivers playing the game in place of a player, e.g. in the headless game.
+
+A driver is called by the main loop before each call of the current FSM
+state. When the state waits for the player, the driver posts a left mouse
+click on the button or chip of its next action, so the states get their
+input exactly as from a player. In the FinalState, or when there is no
+next action, the driver posts a QUIT event which ends the game.
+
+The actions are the names of the buttons, as in ButtonStatus, or the
+value of a chip.
+
+Usage:
+driver = StrategyDriver(load_strategy(NUM_OF_DECKS), bet=10)
+Or:
+driver = ScriptedDriver([10, 10, PLAY, HIT, STAND])
+...
+driver(current_state, common_vars, button_status)
+current_state(common_vars, button_status)
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import sys
+import os
+import abc
+import pygame
+
+# Local imports
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from common import *
+
+# Betting actions, the player actions HIT, STAND, DOUBLE_DOWN and SPLIT
+# are found in includes.engine
+PLAY = 'play'
+UNDO_BET = 'undo_bet'
+CHIPS = (100, 50, 10, 5)  # Values of the chips, largest first
+
+
+class Driver(abc.ABC):
+    """
+    Base class of the drivers, which knows when the states wait for the
+    player and how to click on the buttons and chips. A driver implements
+    bet() and decide().
+
+    """
+    def __call__(self, state, common_vars, button_status):
+        """
+        Post a click for the next action if the state waits for one.
+
+        :param state: The current FSM state.
+        :param common_vars:
+        :param button_status:
+        :return: None
+
+        """
+        name = type(state).__name__
+        if name == 'FinalState':
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+            return
+        if name == 'BettingState':
+            if common_vars.player_cash < LOWEST_BET and not sum(state._current_bet):
+                return  # Out of money, on the way to the FinalState
+            action = self.bet(state, common_vars)
+        elif name in ('DealingState', 'PlayerHitState') and button_status.hit:
+            action = self.decide(common_vars.game_round, common_vars)
+        else:
+            return
+
+        if action is None:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        else:
+            self.click(action, common_vars)
+
+    @staticmethod
+    def click(action, common_vars):
+        """
+        Post a left mouse button click in the middle of the button or chip.
+
+        :param action: A button name or a chip value.
+        :param common_vars:
+        :return: None
+
+        """
+        if action in CHIPS:
+            area = getattr(ChipsCollideArea.get_instance(common_vars), 'chip_{0}_area'.format(action))
+        else:
+            area = getattr(ButtonCollideArea.get_instance(common_vars), action + '_button_area')
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=area.center))
+
+    @abc.abstractmethod
+    def bet(self, state, common_vars):
+        """
+        :param state: The BettingState.
+        :param common_vars:
+        :return: The next betting action, a chip value, PLAY or \
+        UNDO_BET, or None to quit.
+
+        """
+
+    @abc.abstractmethod
+    def decide(self, game_round, common_vars):
+        """
+        :param game_round: The :class:`includes.engine.Round` in play.
+        :param common_vars:
+        :return: The next player action, one of game_round.options(), \
+        or None to quit.
+
+        """
+
+
+class ScriptedDriver(Driver):
+    """
+    Take the actions from a list, one each time the states wait for the
+    player, and quit at the end of the list.
+
+    """
+    def __init__(self, actions):
+        """
+        :param actions: A list of button names and chip values, the chip \
+        values can also be given as strings.
+        """
+        self.actions = [int(action) if str(action).isdigit() else action for action in actions]
+        self._next = 0
+
+    def _next_action(self):
+        if self._next >= len(self.actions):
+            return None
+        self._next += 1
+        return self.actions[self._next - 1]
+
+    def bet(self, state, common_vars):
+        return self._next_action()
+
+    def decide(self, game_round, common_vars):
+        return self._next_action()
+
+
+class StrategyDriver(Driver):
+    """
+    Bet the same each round and play each hand by a strategy, e.g. a
+    :class:`includes.strategy.BasicStrategy`.
+
+    """
+    def __init__(self, strategy, bet=LOWEST_BET):
+        """
+        :param strategy: An object with action(hand, up_card, options), \
+        see :meth:`includes.strategy.BasicStrategy.action`.
+        :param bet: The bet of each round, paid with the largest chips.
+        """
+        self.strategy = strategy
+        self.bet_per_round = bet
+
+    def bet(self, state, common_vars):
+        current_bet = sum(state._current_bet)
+        if len(state._current_bet) < 14:
+            for chip in CHIPS:
+                if chip <= self.bet_per_round - current_bet and chip <= common_vars.player_cash:
+                    return chip
+        if current_bet:
+            return PLAY
+        return CHIPS[-1]  # The bet is less than the smallest chip
+
+    def decide(self, game_round, common_vars):
+        # The dealers first card is hidden
+        return self.strategy.action(game_round.player_hands[game_round.current_hand], game_round.dealer_up_card(),
+                                    game_round.options())
@@ -0,0 +1,522 @@
+#!/usr/bin/env python
+"""
+A headless rules engine for the Black Jack game.
+
+All rules of the game (dealing, split, double down, the dealers rules of
+16 & 17 and the payouts) are collected here without any dependency to
+pygame, so a complete round can be played and settled at full CPU speed.
+The GUI states in :mod:`includes.blackjackfsm` play each round with a
+:class:`Round` and only show it.
+
+Usage:
+result = play_round(shoe, 10, ['hit', 'stand'])
+Or:
+game_round = Round(shoe, 10)
+while not game_round.done:
+    game_round.act(my_decision(game_round))
+result = game_round.result
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import sys
+import os
+
+# Local imports
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from globals import *
+from playingcard import PlayingCard
+from carddecks import CardDecks
+from hand import Hand, DealersHand
+
+# Player actions, named as the corresponding buttons in ButtonStatus
+HIT = 'hit'
+STAND = 'stand'
+DOUBLE_DOWN = 'double_down'
+SPLIT = 'split'
+
+# Hand outcomes, named as the keys (without hand prefix) in hands_status
+BLACKJACK = 'blackjack'
+WIN = 'win'
+PUSH = 'push'
+LOOSE = 'loose'
+BUSTED = 'busted'
+
+##################
+# Rule functions #
+##################
+
+
+def get_value_of_players_hand(hand):
+    """
+    Calculate the value of the players hand according to the Black Jack
+    rules. First of all treat all face cards as 10.
+    If the player gets an ace and the value of the rest of the
+    hand is equal or lower than 10 the ace will be treated as a
+    "Soft ace" with value 11. If the player has an ace or more and gets
+    busted, aces will be changed to hard aces with value 1 one by
+    one if a new bust occurs.
+
+    :param hand: A list of :meth:`lib.playingcard.PlayingCard` objects \
+    or a :class:`includes.hand.Hand`.
+    :return: Total value of the hand as an integer.
+
+    """
+    if type(hand) is Hand:
+        # Already up to date in the hand
+        return hand.value
+    debug = logging.root.isEnabledFor(logging.DEBUG)  # Checked once, not for each card
+    if debug:
+        logging.debug('get_value_of_players_hand: enter')
+    assert isinstance(hand, (list, Hand))
+    summary = 0
+    num_of_soft_aces = 0
+    for card in hand:
+        assert isinstance(card, PlayingCard)
+        rank = card.get_rank()
+        if rank > 10:
+            # Treat all face cards as 10
+            summary += 10
+            if debug:
+                logging.debug('get_value_of_players_hand: face')
+        elif rank == 1 and summary <= 10:
+            # If an ace, start treating as Soft hand "high ace"
+            summary += 11
+            num_of_soft_aces += 1
+            if debug:
+                logging.debug('get_value_of_players_hand: soft ace')
+        else:
+            summary += rank
+            if debug:
+                logging.debug('get_value_of_players_hand: add rank %s to summary givs %s', rank, summary)
+
+        if num_of_soft_aces and summary > 21:
+            # turn soft to hard ace , decrease with 10 since we already accounted for 11
+            summary -= 10
+            num_of_soft_aces -= 1
+            if debug:
+                logging.debug('get_value_of_players_hand: busted, toggle soft to hard ace')
+
+    return summary
+
+
+def get_value_of_dealers_hand(hand):
+    """
+    Calculate the value of the dealers hand according to the Black Jack
+    rules. First of all treat all face cards as 10.
+    If the card is an ace and if the total summary of the current hand
+    will be 17 or more but less than 21 the dealer has to count the ace
+    as a "soft" ace.
+
+    :param hand: A list of :meth:`lib.playingcard.PlayingCard` objects \
+    or a :class:`includes.hand.DealersHand`.
+    :return: Total value of the hand as an integer.
+
+    """
+    if type(hand) is DealersHand:
+        # Already up to date in the hand
+        return hand.value
+    debug = logging.root.isEnabledFor(logging.DEBUG)  # Checked once, not for each card
+    if debug:
+        logging.debug('get_value_of_dealers_hand: enter')
+    assert isinstance(hand, (list, Hand))
+    summary = 0
+    hard_ace = 0
+    for card in hand:
+        assert isinstance(card, PlayingCard)
+        rank = card.get_rank()
+        if rank > 10:
+            # Treat all face cards as 10
+            summary += 10
+            if debug:
+                logging.debug('get_value_of_dealers_hand: face')
+        elif rank == 1:
+            # If the card is an ace and if the total summary of the current hand will be 17 or more
+            # but less than 21 the dealer has to count the ace as a "soft" ace.
+            if 17 <= (summary + 11) < 22:
+                summary += 11
+                if debug:
+                    logging.debug('get_value_of_dealers_hand: soft ace')
+            else:
+                # Save the ace for later evaluation when more cards are added to the summary
+                hard_ace = 1
+                summary += 1
+                if debug:
+                    logging.debug('get_value_of_dealers_hand: hard ace')
+                continue
+        else:
+            summary += rank
+            if debug:
+                logging.debug('get_value_of_dealers_hand: add rank %s to summary givs %s', rank, summary)
+
+        if hard_ace and 17 <= (summary + hard_ace * 10) < 22:
+            # turn hard ace to soft, increase with 10 since 1 is already in the summary, total 11
+            summary += 10
+            if debug:
+                logging.debug('get_value_of_dealers_hand: toggle hard to soft ace')
+
+    return summary
+
+
+def is_cut_passed(shoe_of_decks):
+    """
+    Check that we haven't passed the "cut" in the shoe of decks where
+    cut should be approx 18% of total shoe size.
+
+    :param shoe_of_decks:
+    :return: True if cut is passed else False.
+
+    """
+    logging.debug('is_cut_passed: enter')
+
+    status = False
+    if shoe_of_decks is None or shoe_of_decks.length() < (NUM_OF_DECKS * 52 * CUT_RATIO):
+        logging.debug('is_cut_passed: Passed the "cut" in the shoe')
+        status = True
+    return status
+
+
+def shuffle_shoe(shoe_of_decks):
+    """
+    Shuffle all cards back into the shoe in place, or create a new shoe
+    with NUM_OF_DECKS decks if there is none yet.
+
+    :param shoe_of_decks: A :meth:`lib.carddecks.CardDecks` or None.
+    :return: The shuffled shoe.
+
+    """
+    if shoe_of_decks is None:
+        return CardDecks(NUM_OF_DECKS)
+    shoe_of_decks.shuffle()
+    return shoe_of_decks
+
+
+def is_possible_split(player_cards):
+    """
+    Compare the first and second card in the players hand and if the
+    rank of both cards are equal return True else return False.
+
+    :param player_cards:
+    :return: True or False
+
+    """
+    logging.debug('is_possible_split: enter')
+
+    if len(player_cards) != 2:
+        return False
+    if player_cards[0].get_rank() != player_cards[1].get_rank():
+        return False
+    else:
+        return True
+
+
+def can_double_bet(player_bets, player_cash):
+    """
+    If the player has at least the amount of money as the first bet
+    return True else return False
+
+    :param player_bets:
+    :param player_cash:
+    :return: True or False
+
+    """
+    if player_cash < sum(player_bets[0]):
+        return False
+    else:
+        return True
+
+
+def dealer_must_hit(value_of_dealers_hand, value_of_players_hand):
+    """
+    The dealers rules of 16 & 17. The dealer is forced to hit until 16 no
+    matter what hand the player has, and hits a 16 only if it is less than
+    the players current hand.
+
+    :param value_of_dealers_hand:
+    :param value_of_players_hand:
+    :return: True or False
+
+    """
+    if value_of_dealers_hand < 16:
+        return True
+    return value_of_dealers_hand < 17 and value_of_dealers_hand < value_of_players_hand
+
+
+def get_blackjack_payout(bet):
+    """
+    A Black Jack pays 3/2 (1.5) and the bet is paid back as well.
+
+    :param bet: Total amount of the bet(s).
+    :return: The amount paid back to the player as an integer.
+
+    """
+    return bet + int(bet * BLACKJACK_PAYOUT)
+
+
+##################
+# Engine classes #
+##################
+
+
+class RoundResult(object):
+    """
+    The settled result of one round.
+
+    Attributes:
+    player_hands: A list with one or two (after split) :class:`includes.hand.Hand`.
+    dealer_cards: The dealers cards as a :class:`includes.hand.DealersHand`.
+    hand_bets: The total bet on each hand, including double downs.
+    double_downs: A flag for each hand if it has been doubled down.
+    outcomes: One of 'blackjack', 'win', 'push', 'loose' or 'busted' per hand.
+    actions: All player actions in the order they were made.
+    values_of_players_hands: Final value of each players hand.
+    value_of_dealers_hand: Final value of the dealers hand.
+    payout: The amount paid back to the player, bets included.
+    net: The win (positive) or loss (negative) of the round.
+
+    """
+
+    def __init__(self, game_round):
+        """
+        Collect the result from a finished :class:`Round`.
+
+        :param game_round:
+        """
+        self.player_hands = game_round.player_hands
+        self.dealer_cards = game_round.dealer_cards
+        self.hand_bets = game_round.hand_bets
+        self.double_downs = game_round.double_downs
+        self.outcomes = game_round.outcomes
+        self.actions = game_round.actions
+        self.values_of_players_hands = [hand.value for hand in game_round.player_hands]
+        self.value_of_dealers_hand = game_round.dealer_cards.value
+        self.payout = game_round.payout
+        self.net = game_round.payout - sum(game_round.hand_bets)
+
+
+class Round(object):
+    """
+    One round of Black Jack played from a shoe of decks.
+
+    The player and dealer get two cards each when instantiated, then the
+    player makes decisions with :meth:`act` until :attr:`done` is True
+    and the settled :attr:`result` is available.
+    The rules are single split only, double down on any two card hand
+    (also after a split) and a two card 21 pays 3/2 unless the dealer
+    also has 21. The GUI states play their rounds with this class.
+
+    """
+    __slots__ = ('shoe_of_decks', 'bet', 'player_cash', 'player_hands', 'dealer_cards', 'hand_bets',
+                 'double_downs', 'outcomes', 'actions', 'current_hand', 'payout', 'done', 'result')
+
+    def __init__(self, shoe_of_decks, bet, player_cash=None):
+        """
+        Deal the first two cards for both player and dealer, in the order
+        :class:`includes.blackjackfsm.DealingState` shows them.
+
+        :param shoe_of_decks: Any object with a pop() returning a \
+        :meth:`lib.playingcard.PlayingCard`, e.g. a \
+        :meth:`lib.carddecks.CardDecks`.
+        :param bet: The amount of the initial bet.
+        :param player_cash: Remaining cash after the bet is placed, used \
+        to allow double down and split. None means unlimited.
+        """
+        if bet <= 0:
+            raise ValueError("Error: bet has to be positive: " + str(bet))
+        self.shoe_of_decks = shoe_of_decks
+        self.bet = bet
+        self.player_cash = player_cash
+        self.player_hands = [Hand()]
+        self.dealer_cards = DealersHand()
+        self.hand_bets = [bet]
+        self.double_downs = [False, False]
+        self.outcomes = [None]
+        self.actions = []
+        self.current_hand = 0
+        self.payout = 0
+        self.done = False
+        self.result = None
+
+        pop = shoe_of_decks.pop
+        players_hand = self.player_hands[0]
+        players_hand.append(pop())
+        self.dealer_cards.append(pop())
+        players_hand.append(pop())
+        self.dealer_cards.append(pop())
+
+        if players_hand.is_blackjack:
+            # A Black Jack, compare with the dealers two cards
+            if self.dealer_cards.value == 21:
+                self._settle_all(PUSH)
+            else:
+                self._settle_all(BLACKJACK)
+
+    def value_of_players_hand(self, index=None):
+        """
+        :param index: Index of the hand, default the current hand.
+        :return: Value of the players hand as an integer.
+
+        """
+        if index is None:
+            index = self.current_hand
+        return self.player_hands[index].value
+
+    def is_soft(self, index=None):
+        """
+        :param index: Index of the hand, default the current hand.
+        :return: True if the players hand has a soft ace (counted as 11).
+
+        """
+        if index is None:
+            index = self.current_hand
+        return self.player_hands[index].soft == 1
+
+    def dealer_up_card(self):
+        """
+        :return: The dealers visible card, the first card is hidden.
+
+        """
+        return self.dealer_cards[1]
+
+    def options(self):
+        """
+        :return: A list of the actions allowed for the current hand.
+
+        """
+        if self.done:
+            return []
+        actions = [HIT, STAND]
+        hand = self.player_hands[self.current_hand]
+        if hand.num_of_cards == 2 and self._can_afford():
+            actions.append(DOUBLE_DOWN)
+            if hand.is_pair and len(self.player_hands) == 1:
+                actions.append(SPLIT)
+        return actions
+
+    def act(self, action):
+        """
+        Apply one player action on the current hand.
+
+        :param action: One of 'hit', 'stand', 'double_down' or 'split'.
+        :return: None
+
+        """
+        if self.done or action != HIT and action != STAND and action not in self.options():
+            # Hit and stand are always allowed until the round is settled
+            raise ValueError("Error: action not allowed: " + str(action))
+        self.actions.append(action)
+        index = self.current_hand
+        hand = self.player_hands[index]
+
+        if action == HIT:
+            hand.append(self.shoe_of_decks.pop())
+            if hand.value >= 21:
+                self._next_hand()
+        elif action == STAND:
+            self._next_hand()
+        elif action == DOUBLE_DOWN:
+            self._place_bet()
+            self.hand_bets[index] += self.bet
+            self.double_downs[index] = True
+            hand.append(self.shoe_of_decks.pop())
+            self._next_hand()
+        else:
+            self._place_bet()
+            second_hand = Hand((hand.pop(),))
+            self.player_hands.append(second_hand)
+            self.hand_bets.append(self.bet)
+            self.outcomes.append(None)
+            hand.append(self.shoe_of_decks.pop())
+            second_hand.append(self.shoe_of_decks.pop())
+            if hand.value == 21 and second_hand.value == 21:
+                # Double Black Jack, both hands are settled together
+                if self.dealer_cards.value == 21:
+                    self._settle_all(PUSH)
+                else:
+                    self._settle_all(BLACKJACK)
+            elif hand.value == 21:
+                self._next_hand()
+
+    def _can_afford(self):
+        return self.player_cash is None or self.player_cash >= self.bet
+
+    def _place_bet(self):
+        if self.player_cash is not None:
+            self.player_cash -= self.bet
+
+    def _next_hand(self):
+        """
+        Step to the next hand, or let the dealer play when all hands are
+        done. A second hand with 21 is never played any further.
+
+        """
+        self.current_hand += 1
+        if self.current_hand < len(self.player_hands):
+            if self.player_hands[self.current_hand].value == 21:
+                self._next_hand()
+            return
+        self.current_hand = len(self.player_hands) - 1
+
+        pop = self.shoe_of_decks.pop
+        dealer_cards = self.dealer_cards
+        for index, hand in enumerate(self.player_hands):
+            value_of_players_hand = hand.value
+            if value_of_players_hand > 21:
+                self.outcomes[index] = BUSTED
+                continue
+            while dealer_must_hit(dealer_cards.value, value_of_players_hand):
+                dealer_cards.append(pop())
+            value_of_dealers_hand = dealer_cards.value
+            if value_of_dealers_hand > 21 or value_of_players_hand > value_of_dealers_hand:
+                self.outcomes[index] = WIN
+                self.payout += self.hand_bets[index] * 2
+            elif value_of_dealers_hand == value_of_players_hand:
+                self.outcomes[index] = PUSH
+                self.payout += self.hand_bets[index]
+            else:
+                self.outcomes[index] = LOOSE
+        self._finish()
+
+    def _settle_all(self, outcome):
+        for index in range(len(self.outcomes)):
+            self.outcomes[index] = outcome
+        if outcome == PUSH:
+            self.payout = sum(self.hand_bets)
+        else:
+            self.payout = get_blackjack_payout(sum(self.hand_bets))
+        self._finish()
+
+    def _finish(self):
+        self.done = True
+        self.result = RoundResult(self)
+
+
+def play_round(shoe_of_decks, bet, decisions, player_cash=None):
+    """
+    Play one complete round and return the settled result.
+
+    :param shoe_of_decks: Shoe to deal the cards from.
+    :param bet: The amount of the initial bet.
+    :param decisions: Either a function called as \
+    decisions(game_round) returning the next action for the current \
+    hand, or a sequence of actions to be played in order.
+    :param player_cash: Remaining cash after the bet is placed. \
+    None means unlimited.
+    :return: A :class:`RoundResult`.
+
+    """
+    game_round = Round(shoe_of_decks, bet, player_cash)
+    if callable(decisions):
+        while not game_round.done:
+            game_round.act(decisions(game_round))
+    else:
+        actions = iter(decisions)
+        while not game_round.done:
+            game_round.act(next(actions))
+    return game_round.result
@@ -10,7 +10,6 @@ root for full license information.
 """
 
 # Standard imports
-# import inspect  # To be used to print function name in log statements
 import logging
 
 # Set log level
@@ -32,7 +31,10 @@ IMAGE_PATH = 'images/'
 IMAGE_PATH_CARDS = 'images/cards/'
 IMAGE_PATH_CHIPS = 'images/casino_chips/'
 IMAGE_PATH_BUTTONS = 'images/buttons/'
+# Name of the prerendered table background in the ImageDB
+TABLE_BACKGROUND = 'table_background'
 SOUND_PATH = 'sounds/'
+CACHE_PATH = 'cache/'  # Generated files, e.g. the basic strategy tables
 # previously using IMAGE_PATH = "./images/" which works as well
 
 # The card back image used to print the dealers initial hidden card
@@ -62,6 +64,21 @@ CHIP_50_FILENAME_OFF = "chip_50_w85h85_fade.png"
 CHIP_100_FILENAME_ON = "chip_100_w85h85.png"
 CHIP_100_FILENAME_OFF = "chip_100_w85h85_fade.png"
 
+# Images and sounds loaded in the background at startup, see includes/preload.py.
+# The cards are loaded from the card atlas.
+BUTTON_FILENAMES = (PLAY_BUTTON_FILENAME_ON, PLAY_BUTTON_FILENAME_OFF,
+                    HIT_BUTTON_FILENAME_ON, HIT_BUTTON_FILENAME_OFF,
+                    STAND_BUTTON_FILENAME_ON, STAND_BUTTON_FILENAME_OFF,
+                    SPLIT_BUTTON_FILENAME_ON, SPLIT_BUTTON_FILENAME_OFF,
+                    DOUBLE_DOWN_BUTTON_FILENAME_ON, DOUBLE_DOWN_BUTTON_FILENAME_OFF,
+                    UNDO_BET_BUTTON_FILENAME_ON, UNDO_BET_BUTTON_FILENAME_OFF)
+CHIP_FILENAMES = (CHIP_5_FILENAME_ON, CHIP_5_FILENAME_OFF, CHIP_10_FILENAME_ON, CHIP_10_FILENAME_OFF,
+                  CHIP_50_FILENAME_ON, CHIP_50_FILENAME_OFF, CHIP_100_FILENAME_ON, CHIP_100_FILENAME_OFF)
+TABLE_IMAGE_FILENAMES = ("yellow_box_179_120.png", "bj_banner_yellow2.png", "blackjack.png", "you_win.png",
+                         "push.png", "you_loose.png", "busted.png", "hand.png")
+SOUND_FILENAMES = ("cardslide.wav", "chipsstack.wav")
+PRELOAD_WORKERS = 4
+
 # Colors
 GAME_BOARD_COLOR = (34, 139,  34)  # Nice TexasHoldem table color
 GOLD_COLOR = (255, 215, 0)
@@ -91,8 +108,21 @@ PAUSE_TIMER1 = 0.5
 PAUSE_TIMER2 = 1
 PAUSE_TIMER3 = 3
 
+# Frame rate of the main loop while the game is busy, e.g. dealing cards.
+# When idle, waiting for the player or at a pause, the loop waits for an
+# event instead, at most MAX_IDLE_WAIT seconds. Set WAIT_WHEN_IDLE to False
+# to run at FRAME_RATE all the time.
+FRAME_RATE = 30
+WAIT_WHEN_IDLE = True
+MAX_IDLE_WAIT = 1.0
+
 # Misc
 NUM_OF_DECKS = 4
+CUT_RATIO = 0.18  # Approx part of the shoe left when the "cut" is passed
+BLACKJACK_PAYOUT = 1.5  # 3/2
 LOWEST_BET = 5
 DEFAULT_PLAYER_BALANCE = 5000
 COUNTING_HELP = True
+PROFILE_FILENAME = 'frame_profile.json'  # Saved with PROFILER_DUMP_KEY in the game
+TEXT_CACHE_SIZE = 64  # Number of rendered texts kept, see render_text() in includes/common.py
+VARIANT_CACHE_SIZE = 128  # Number of transformed images kept, see ImageDB.get_variant() in includes/common.py
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+"""
+Class Hand and DealersHand
+
+A hand of :meth:`lib.playingcard.PlayingCard` objects which keeps the
+Black Jack value of the hand up to date as each card is added, so the
+value is a field read instead of a loop over all cards.
+
+A Hand use the players rules of
+:func:`includes.engine.get_value_of_players_hand` and a DealersHand the
+dealers rules of :func:`includes.engine.get_value_of_dealers_hand`.
+Both rules are precomputed into lookup tables, PLAYERS_VALUE_TABLE and
+DEALERS_VALUE_TABLE, so adding a card is a single table lookup.
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Black Jack value of each rank, index 0 is unused
+_RANK_VALUES = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+
+# Highest total of a hand which isn't busted
+MAX_TOTAL = 21
+
+
+def _add_to_players_value(value, soft, rank):
+    """
+    Add one card to a players hand value, the same rules as in
+    :func:`includes.engine.get_value_of_players_hand` but one card at
+    the time.
+
+    :param value: Current value of the hand.
+    :param soft: Number of soft aces (0 or 1) in the hand.
+    :param rank: Rank of the added card.
+    :return: Tuple with the new (value, soft).
+
+    """
+    if rank == 1 and value <= 10:
+        return value + 11, 1
+    value += _RANK_VALUES[rank]
+    if soft and value > 21:
+        return value - 10, 0
+    return value, soft
+
+
+def _add_to_dealers_value(value, hard_ace, rank):
+    """
+    Add one card to a dealers hand value, the same rules as in
+    :func:`includes.engine.get_value_of_dealers_hand` but one card at
+    the time.
+
+    :param value: Current value of the hand.
+    :param hard_ace: 1 if there is a hard ace saved for later evaluation.
+    :param rank: Rank of the added card.
+    :return: Tuple with the new (value, hard_ace).
+
+    """
+    if rank == 1:
+        if 17 <= value + 11 < 22:
+            return value + 11, hard_ace
+        return value + 1, 1
+    value += _RANK_VALUES[rank]
+    if hard_ace and 17 <= value + 10 < 22:
+        value += 10
+    return value, hard_ace
+
+
+def _build_value_table(add_to_value):
+    """
+    Precompute the result of adding each rank to each hand which can
+    take another card, i.e. all totals up to 21 with and without the
+    soft (or for the dealer hard) ace flag.
+
+    :param add_to_value: :func:`_add_to_players_value` or \
+    :func:`_add_to_dealers_value`.
+    :return: A tuple with (new total, new flag, busted) for each \
+    (total, flag, rank), see :func:`value_table_index`.
+
+    """
+    table = []
+    for total in range(0, MAX_TOTAL + 1):
+        for flag in (0, 1):
+            for rank in range(0, 14):
+                new_total, new_flag = add_to_value(total, flag, rank)
+                table.append((new_total, new_flag, new_total > MAX_TOTAL))
+    return tuple(table)
+
+
+def value_table_index(total, flag, rank):
+    """
+    :param total: Current value of the hand, 0 to 21.
+    :param flag: The soft (or for the dealer hard) ace flag, 0 or 1.
+    :param rank: Rank of the added card, 1 to 13.
+    :return: The index into PLAYERS_VALUE_TABLE or DEALERS_VALUE_TABLE.
+
+    """
+    return (total * 2 + flag) * 14 + rank
+
+
+# (new total, new flag, busted) indexed by value_table_index(total, flag, rank)
+PLAYERS_VALUE_TABLE = _build_value_table(_add_to_players_value)
+DEALERS_VALUE_TABLE = _build_value_table(_add_to_dealers_value)
+
+
+class Hand(object):
+    """
+    A players hand. Behaves as a list of cards (append, pop, len, index
+    and iterate) and keeps these attributes updated for each added card:
+
+    value: Black Jack value of the hand.
+    soft: 1 if the hand has a soft ace (counted as 11) else 0.
+    num_of_cards: Number of cards in the hand.
+    is_pair: True if the hand has two cards of the same rank.
+    is_blackjack: True if the hand has two cards with the value 21.
+    is_busted: True if the value is above 21.
+
+    """
+    __slots__ = ('cards', 'value', 'soft', 'num_of_cards', 'is_pair', 'is_blackjack', 'is_busted')
+
+    _add_to_value = staticmethod(_add_to_players_value)
+    _value_table = PLAYERS_VALUE_TABLE
+
+    def __init__(self, cards=()):
+        """
+        :param cards: Optional cards to start the hand with.
+        """
+        self.cards = []
+        self.value = 0
+        self.soft = 0
+        self.num_of_cards = 0
+        self.is_pair = False
+        self.is_blackjack = False
+        self.is_busted = False
+        for card in cards:
+            self.append(card)
+
+    def append(self, card):
+        """
+        Add a card to the hand and update the value and flags.
+
+        :param card: A :meth:`lib.playingcard.PlayingCard` object.
+        :return: None
+
+        """
+        cards = self.cards
+        cards.append(card)
+        if self.is_busted:
+            # Beyond the table, only when cards are added to a busted hand
+            self.value, self.soft = self._add_to_value(self.value, self.soft, card.rank)
+        else:
+            self.value, self.soft, self.is_busted = \
+                self._value_table[(self.value * 2 + self.soft) * 14 + card.rank]
+        self.num_of_cards += 1
+        if self.num_of_cards == 2:
+            self.is_pair = cards[0].rank == card.rank
+            self.is_blackjack = self.value == 21
+        else:
+            self.is_pair = False
+            self.is_blackjack = False
+
+    def pop(self):
+        """
+        Pop (pull and remove) the last card in the hand, used when a pair
+        is split. The value is calculated again from the remaining cards.
+
+        :return: A :meth:`lib.playingcard.PlayingCard` object.
+
+        """
+        cards = self.cards
+        card = cards.pop()
+        self.__init__(cards)
+        return card
+
+    def __len__(self):
+        return self.num_of_cards
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def __getitem__(self, index):
+        return self.cards[index]
+
+    def __repr__(self):
+        return '{0}({1})'.format(type(self).__name__, self.cards)
+
+
+class DealersHand(Hand):
+    """
+    The dealers hand, the same as :class:`Hand` but valued with the
+    dealers rules where soft is 1 if there is a hard ace saved for later
+    evaluation.
+
+    """
+    __slots__ = ()
+
+    _add_to_value = staticmethod(_add_to_dealers_value)
+    _value_table = DEALERS_VALUE_TABLE
@@ -0,0 +1,354 @@
+#!/usr/bin/env python
+"""
+An append-only binary journal of all played rounds, and the replay which
+verifies it with the rules engine.
+
+The journal starts with JOURNAL_MAGIC and then has one record per round,
+each round with the bet, the net win or loss, the players cash after the
+round, the card codes in dealt order and the player actions. A shoe
+record with the seed of the shoe and the players cash is written when a
+game starts, so each game can be followed from its first cash. The card
+codes take 6 bits each and the actions 2 bits each, an ordinary round
+takes about 20 bytes.
+
+The records are packed where the round ends and written by a background
+thread, which flushes the file whenever it has written all records, so a
+frame never waits for the disk.
+
+Usage:
+journal = RoundJournal(filename)
+journal.write_shoe(seed, player_cash)
+journal.write_round(bet, net, player_cash, card_codes, actions)
+journal.close()
+...
+result = replay_journal(filename)
+result.mismatches  # A list of (round number, reason), empty if all is right
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import sys
+import os
+import queue
+import atexit
+import struct
+import threading
+
+# Local imports
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from globals import *
+from playingcard import CARDS
+from engine import Round, HIT, STAND, DOUBLE_DOWN, SPLIT
+
+JOURNAL_MAGIC = b'BJRJ\x01'  # Black Jack Round Journal, version 1
+
+# Record types
+SHOE_RECORD = 1
+ROUND_RECORD = 2
+
+# Type, seed and the players cash when the game starts
+SHOE_STRUCT = struct.Struct('<BQq')
+MAX_SEED = 2 ** 64 - 1  # The seed is an unsigned 64 bit integer in a shoe record
+# Type, bet, net, the players cash after the round, number of cards and number of actions
+ROUND_STRUCT = struct.Struct('<BIiqBB')
+
+CARD_BITS = 6
+ACTION_BITS = 2
+ACTIONS = (HIT, STAND, DOUBLE_DOWN, SPLIT)  # Code of each action by index
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+
+def pack_bits(values, bits):
+    """
+    Pack small integers into bytes, the first value in the lowest bits.
+
+    :param values: A sequence of integers in range 0 to 2 ** bits - 1.
+    :param bits: Number of bits of each value.
+    :return: The packed bytes.
+
+    """
+    packed = 0
+    for index, value in enumerate(values):
+        packed |= value << (index * bits)
+    return packed.to_bytes((len(values) * bits + 7) // 8, 'little')
+
+
+def unpack_bits(data, count, bits):
+    """
+    Unpack integers packed with :func:`pack_bits`.
+
+    :param data: The packed bytes.
+    :param count: Number of values.
+    :param bits: Number of bits of each value.
+    :return: A list of the values.
+
+    """
+    packed = int.from_bytes(data, 'little')
+    mask = (1 << bits) - 1
+    return [(packed >> (index * bits)) & mask for index in range(0, count)]
+
+
+class RoundJournal(object):
+    """
+    A journal file opened for appending, with the thread writing the
+    records.
+
+    """
+
+    def __init__(self, filename):
+        """
+        Open the journal, it is created if it doesn't exist.
+
+        :param filename:
+        """
+        if os.path.exists(filename) and os.path.getsize(filename):
+            with open(filename, 'rb') as journal_file:
+                if journal_file.read(len(JOURNAL_MAGIC)) != JOURNAL_MAGIC:
+                    raise ValueError('Error: not a round journal: ' + filename)
+            self._file = open(filename, 'ab')
+        else:
+            self._file = open(filename, 'wb')
+            self._file.write(JOURNAL_MAGIC)
+        self.filename = filename
+        self.rounds = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write_records, name='RoundJournal', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write_shoe(self, seed, player_cash):
+        """
+        Record the start of a game.
+
+        :param seed: The seed of the shoe, 0 to MAX_SEED.
+        :param player_cash: The players cash when the game starts.
+        :return: None
+
+        """
+        if not 0 <= seed <= MAX_SEED:
+            raise ValueError("Error: seed has to be 0 to {0}: {1}".format(MAX_SEED, seed))
+        self._queue.put(SHOE_STRUCT.pack(SHOE_RECORD, seed, player_cash))
+
+    def write_round(self, bet, net, player_cash, card_codes, actions):
+        """
+        Record a played round.
+
+        :param bet: The initial bet.
+        :param net: The win (positive) or loss (negative) of the round.
+        :param player_cash: The players cash after the round.
+        :param card_codes: Codes of all dealt cards, in dealt order.
+        :param actions: All player actions, in the order they were made.
+        :return: None
+
+        """
+        self._queue.put(ROUND_STRUCT.pack(ROUND_RECORD, bet, net, player_cash, len(card_codes), len(actions)) +
+                        pack_bits(card_codes, CARD_BITS) +
+                        pack_bits([ACTION_CODES[action] for action in actions], ACTION_BITS))
+        self.rounds += 1
+
+    def _write_records(self):
+        journal_file = self._file
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            journal_file.write(record)
+            if self._queue.empty():
+                journal_file.flush()
+        journal_file.close()
+
+    def close(self):
+        """
+        Write all waiting records and close the file.
+
+        :return: None
+
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+
+class RecordingShoe(object):
+    """
+    A shoe which remembers the codes of the cards dealt from it. All
+    other methods are the ones of the shoe.
+
+    """
+
+    def __init__(self, shoe_of_decks):
+        """
+        :param shoe_of_decks: A :meth:`lib.carddecks.CardDecks`.
+        """
+        self.shoe_of_decks = shoe_of_decks
+        self.dealt = []
+
+    def pop(self):
+        """
+        :return: The next card of the shoe.
+
+        """
+        card = self.shoe_of_decks.pop()
+        self.dealt.append(card.code)
+        return card
+
+    def __getattr__(self, name):
+        return getattr(self.shoe_of_decks, name)
+
+
+class RoundRecorder(object):
+    """
+    Follow the game states and write each round to the journal when it is
+    settled. A round starts when the player has placed the bet and the
+    DealingState is entered, and ends when the InitialState is entered
+    again. A round which isn't played to the end isn't written.
+
+    """
+
+    def __init__(self, journal, shoe_of_decks):
+        """
+        :param journal: A :class:`RoundJournal`.
+        :param shoe_of_decks: The :class:`RecordingShoe` of the game.
+        """
+        self.journal = journal
+        self.shoe_of_decks = shoe_of_decks
+        self._bet = None  # Of the round in progress, if any
+        self._cash_before = None
+
+    def __call__(self, state, common_vars):
+        """
+        Called after each call of an FSM state.
+
+        :param state: The FSM state after the call.
+        :param common_vars:
+        :return: None
+
+        """
+        name = type(state).__name__
+        if self._bet is None:
+            if name == 'DealingState':
+                self._bet = sum(common_vars.player_bets[0])
+                self._cash_before = common_vars.player_cash + self._bet
+                del self.shoe_of_decks.dealt[:]
+        elif name == 'InitialState':
+            self.journal.write_round(self._bet, common_vars.player_cash - self._cash_before, common_vars.player_cash,
+                                     self.shoe_of_decks.dealt, common_vars.player_actions)
+            self._bet = None
+
+
+class ReplayResult(object):
+    """
+    The result of a replayed journal.
+
+    Attributes:
+    rounds: Number of replayed rounds.
+    games: Number of games, i.e. shoe records.
+    net: Sum of the net of all rounds.
+    mismatches: A list of (round number, reason) of each round where the \
+    journal doesn't agree with the rules engine, the first round is 1.
+
+    """
+
+    def __init__(self):
+        self.rounds = 0
+        self.games = 0
+        self.net = 0
+        self.mismatches = []
+
+
+def read_journal(filename):
+    """
+    Read all records of a journal.
+
+    :param filename:
+    :return: A generator of records, (SHOE_RECORD, seed, player_cash) or \
+    (ROUND_RECORD, bet, net, player_cash, card codes, actions).
+
+    """
+    with open(filename, 'rb') as journal_file:
+        data = journal_file.read()
+    if not data.startswith(JOURNAL_MAGIC):
+        raise ValueError('Error: not a round journal: ' + filename)
+    offset = len(JOURNAL_MAGIC)
+    while offset < len(data):
+        record_type = data[offset]
+        if record_type == SHOE_RECORD:
+            yield SHOE_STRUCT.unpack_from(data, offset)
+            offset += SHOE_STRUCT.size
+        elif record_type == ROUND_RECORD:
+            record_type, bet, net, player_cash, num_of_cards, num_of_actions = ROUND_STRUCT.unpack_from(data, offset)
+            offset += ROUND_STRUCT.size
+            cards_size = (num_of_cards * CARD_BITS + 7) // 8
+            actions_size = (num_of_actions * ACTION_BITS + 7) // 8
+            card_codes = unpack_bits(data[offset:offset + cards_size], num_of_cards, CARD_BITS)
+            offset += cards_size
+            actions = [ACTIONS[code] for code in unpack_bits(data[offset:offset + actions_size],
+                                                              num_of_actions, ACTION_BITS)]
+            offset += actions_size
+            yield record_type, bet, net, player_cash, card_codes, actions
+        else:
+            raise ValueError('Error: unknown record type {0} at {1} in {2}'.format(record_type, offset, filename))
+
+
+def replay_round(bet, player_cash, card_codes, actions):
+    """
+    Play a round again with the rules engine.
+
+    :param bet: The initial bet.
+    :param player_cash: The players cash before the bet is placed.
+    :param card_codes: Codes of the dealt cards, in dealt order.
+    :param actions: The player actions.
+    :return: A tuple with the :class:`includes.engine.RoundResult` and \
+    the number of cards not dealt.
+
+    """
+    cards = [CARDS[code] for code in reversed(card_codes)]
+    game_round = Round(cards, bet, player_cash - bet)
+    for action in actions:
+        game_round.act(action)
+    return game_round.result, len(cards)
+
+
+def replay_journal(filename):
+    """
+    Replay all rounds of a journal with the rules engine and verify that
+    each round has the same net as in the journal, with all cards and
+    actions used, and that the cash of each round follows from the one
+    before.
+
+    :param filename:
+    :return: A :class:`ReplayResult`.
+
+    """
+    result = ReplayResult()
+    player_cash = None
+    for record in read_journal(filename):
+        if record[0] == SHOE_RECORD:
+            result.games += 1
+            player_cash = record[2]
+            continue
+        record_type, bet, net, cash_after, card_codes, actions = record
+        result.rounds += 1
+        result.net += net
+        if player_cash is not None and cash_after - net != player_cash:
+            result.mismatches.append((result.rounds, 'cash {0} before the round, not {1}'.format(
+                cash_after - net, player_cash)))
+        player_cash = cash_after
+        try:
+            round_result, cards_left = replay_round(bet, cash_after - net, card_codes, actions)
+        except (ValueError, IndexError, AttributeError) as error:
+            result.mismatches.append((result.rounds, 'not played: {0!r}'.format(error)))
+            continue
+        if round_result is None:
+            result.mismatches.append((result.rounds, 'not done after all actions'))
+        elif round_result.net != net:
+            result.mismatches.append((result.rounds, 'net {0}, not {1}'.format(round_result.net, net)))
+        elif cards_left:
+            result.mismatches.append((result.rounds, '{0} cards not dealt'.format(cards_left)))
+    return result
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Logging in a background thread, so a log statement never blocks a frame.
+
+When started, the handlers of the root logger (set up by basicConfig in
+:mod:`includes.globals`) are moved to a thread which takes the records
+from a queue, and the root logger only puts the records in the queue.
+The records are still created where they are logged, with the module and
+line number of the log statement.
+
+The log statements on the hot paths cost nothing when their level is
+disabled as long as they are written as:
+logging.debug('get_image: enter')  # A static name, not inspect.stack()
+logging.debug('get_value: %s', value)  # Formatted only when enabled
+And in a loop, with the level checked once before the loop:
+debug = logging.root.isEnabledFor(logging.DEBUG)
+for card in hand:
+    if debug:
+        logging.debug('get_value: %s', card)
+
+Usage:
+log_thread = LogThread.get_instance()
+log_thread.start()
+...
+log_thread.stop()  # Or at exit, all waiting records are handled first
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import queue
+import atexit
+import logging
+import logging.handlers
+
+
+class LogThread:
+    """
+    Instantiating this class into an object will create a singleton object
+    with the thread which handles the log records of the root logger.
+
+    """
+    instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """
+        If instance is None create an instance of this class
+        and return it, else return the existing instance.
+
+        :return: A LogThread instance.
+
+        """
+        if cls.instance is None:
+            cls.instance = cls()
+        return cls.instance
+
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+        self._listener = None
+        self._handlers = []  # The handlers of the root logger before start
+        atexit.register(self.stop)
+
+    @property
+    def running(self):
+        """
+        :return: True while the records are handled in the thread.
+
+        """
+        return self._listener is not None
+
+    def start(self):
+        """
+        Move the handlers of the root logger to the thread.
+
+        :return: None
+
+        """
+        if self.running:
+            return
+        root = logging.getLogger()
+        self._handlers = root.handlers[:]
+        self._listener = logging.handlers.QueueListener(self.queue, *self._handlers, respect_handler_level=True)
+        for handler in self._handlers:
+            root.removeHandler(handler)
+        root.addHandler(logging.handlers.QueueHandler(self.queue))
+        self._listener.start()
+
+    def stop(self):
+        """
+        Handle all waiting records, stop the thread and give the handlers
+        back to the root logger.
+
+        :return: None
+
+        """
+        if not self.running:
+            return
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is self.queue:
+                root.removeHandler(handler)
+        self._listener.stop()
+        self._listener = None
+        for handler in self._handlers:
+            root.addHandler(handler)
+        self._handlers = []
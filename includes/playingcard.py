@@ -5,6 +5,12 @@ Class Playing Card
 This class creates an instance of a playing card with the valid
 value of rank in range 1 to 13 and suit in range of 0 to 3
 
+The 52 distinct cards are created once when this module is imported and
+are shared as immutable flyweights, i.e. PlayingCard(rank, suit) always
+returns the same object for the same rank and suit. Each card also has an
+integer code in range 0 to 51 and all cards are available by code in
+CARDS.
+
 Copyright (C) Torbjorn Hedqvist - All Rights Reserved
 You may use, distribute and modify this code under the
 terms of the MIT license. See LICENSE file in the project
@@ -17,9 +23,23 @@ import traceback
 
 class PlayingCard(object):
     """
-    TODO: Write comment
+    An immutable playing card. Read the attributes rank, suit, code and
+    value (Black Jack value of the rank, ace as 1 and face cards as 10)
+    directly or use the get_rank() and get_suit() methods.
+
     """
-    def __init__(self, rank, suit):
+    __slots__ = ('rank', 'suit', 'code', 'value')
+
+    def __new__(cls, rank, suit):
+        """
+        Return the shared instance of the card, validate rank and suit
+        only if the card isn't found.
+
+        """
+        card = _INTERNED.get((rank, suit))
+        if card is not None and isinstance(rank, int) and isinstance(suit, int):
+            return card
+
         try:
             if not isinstance(rank, int):
                 raise ValueError("Error: rank has to be integer: "
@@ -27,8 +47,6 @@ class PlayingCard(object):
             elif rank < 1 or rank > 13:
                 raise ValueError("Error: rank out of range (1-13): "
                                  + str(rank))
-            else:
-                self.__rank = rank
         except ValueError:
             traceback.print_exc()
             sys.exit()
@@ -40,25 +58,54 @@ class PlayingCard(object):
             elif suit < 0 or suit > 3:
                 raise ValueError("Error: suit out of range (0-3): "
                                  + str(suit))
-            else:
-                self.__suit = suit
         except ValueError:
             traceback.print_exc()
             sys.exit()
 
+        return _INTERNED[(rank, suit)]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Error: PlayingCard is immutable")
+
+    def __reduce__(self):
+        return PlayingCard, (self.rank, self.suit)
+
+    def __repr__(self):
+        return 'PlayingCard({0}, {1})'.format(self.rank, self.suit)
+
     def get_rank(self):
         """
         :return: The rank of this instance.
 
         """
-        return self.__rank
+        return self.rank
 
     def get_suit(self):
         """
         :return: The suit of this instance.
 
         """
-        return self.__suit
+        return self.suit
+
+
+def _create(cls, rank, suit):
+    """
+    Create and intern a card, only used when this module is imported.
+
+    """
+    card = object.__new__(cls)
+    object.__setattr__(card, 'rank', rank)
+    object.__setattr__(card, 'suit', suit)
+    object.__setattr__(card, 'code', suit * 13 + rank - 1)
+    object.__setattr__(card, 'value', min(rank, 10))
+    _INTERNED[(rank, suit)] = card
+    return card
+
+
+_INTERNED = {}
+
+# All 52 cards in code order, which is the same order as a new deck
+CARDS = tuple(_create(PlayingCard, rank, suit) for suit in range(0, 4) for rank in range(1, 14))
 
 # Experimental
 # class PlayingCardError(BaseException):
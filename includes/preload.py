@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""
+Background loading of the images and sounds at startup.
+
+The manifest lists all images and sounds of the game, from the file names
+in :mod:`includes.globals`, and the card atlas. The files are loaded and
+decoded by a pool of threads while the main loop shows a progress bar.
+The loaded images are converted and added to the ImageDB, and the sounds
+to the SoundDB, in the main thread when the loop polls the preloader, so
+the game never loads a file in the middle of a round.
+
+Usage:
+preloader = AssetPreloader(preload_manifest())
+while not preloader.poll():
+    plot_preload_progress(screen, preloader.progress())
+    screen.update()
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import sys
+import os
+import time
+import logging
+import concurrent.futures
+import pygame
+
+# Local imports
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from common import *
+
+# Kinds of assets in the manifest
+IMAGE = 'image'
+SOUND = 'sound'
+CARD_ATLAS = 'card_atlas'
+
+PROGRESS_BAR_SIZE = (400, 24)
+
+
+def preload_manifest():
+    """
+    :return: A list of (kind, path) of all assets in the game. The path \
+    of the card atlas is None, it's given by :class:`includes.common.CardAtlas`.
+
+    """
+    manifest = [(IMAGE, IMAGE_PATH_BUTTONS + filename) for filename in BUTTON_FILENAMES]
+    manifest += [(IMAGE, IMAGE_PATH_CHIPS + filename) for filename in CHIP_FILENAMES]
+    manifest += [(IMAGE, IMAGE_PATH + filename) for filename in TABLE_IMAGE_FILENAMES]
+    manifest += [(SOUND, SOUND_PATH + filename) for filename in SOUND_FILENAMES]
+    manifest.append((CARD_ATLAS, None))
+    return manifest
+
+
+def _load(kind, path):
+    """
+    Load one asset, called in a worker thread.
+
+    :return: A tuple with (kind, path, asset).
+
+    """
+    if kind == CARD_ATLAS:
+        # Builds the atlas if needed
+        path = CardAtlas.get_instance().filename
+        kind = IMAGE
+    if kind == IMAGE:
+        return kind, path, ImageDB.load_image(path)
+    return kind, path, SoundDB.load_sound(path)
+
+
+class AssetPreloader:
+    """
+    Load the assets of a manifest in a pool of threads. The loaded assets
+    are added to the ImageDB and SoundDB by :meth:`poll`.
+
+    """
+
+    def __init__(self, manifest, workers=PRELOAD_WORKERS):
+        """
+        :param manifest: A list of (kind, path), see :func:`preload_manifest`.
+        :param workers: Number of threads loading the assets.
+        """
+        if not pygame.mixer.get_init():
+            logging.warning('AssetPreloader: No sound, the sounds are not loaded')
+            manifest = [(kind, path) for kind, path in manifest if kind != SOUND]
+        self.total = len(manifest)
+        self.loaded = 0
+        self.start_time = time.perf_counter()
+        self.load_time = None
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self._pending = {self._executor.submit(_load, kind, path) for kind, path in manifest}
+
+    def poll(self):
+        """
+        Add the assets loaded since the last poll to the ImageDB and the
+        SoundDB. An asset which couldn't be loaded raises its exception here.
+
+        :return: True when all assets are loaded.
+
+        """
+        if not self._pending:
+            return True
+        done = {future for future in self._pending if future.done()}
+        self._pending -= done
+        image_db = ImageDB.get_instance()
+        sound_db = SoundDB.get_instance()
+        for future in done:
+            kind, path, asset = future.result()
+            if kind == IMAGE:
+                image_db.add_image(path, asset)
+            else:
+                sound_db.add_sound(path, asset)
+            self.loaded += 1
+
+        if self._pending:
+            return False
+        self._executor.shutdown()
+        self.load_time = time.perf_counter() - self.start_time
+        logging.info('AssetPreloader: Loaded %d assets in %.3f s', self.total, self.load_time)
+        return True
+
+    def wait(self):
+        """
+        Wait until all assets are loaded and added.
+
+        :return: None
+
+        """
+        concurrent.futures.wait(self._pending)
+        self.poll()
+
+    def progress(self):
+        """
+        :return: The part of the assets loaded, 0.0 to 1.0.
+
+        """
+        if self.total == 0:
+            return 1.0
+        return self.loaded / self.total
+
+
+def plot_preload_progress(screen, progress, font):
+    """
+    Plot the startup screen with a progress bar in the middle.
+
+    :param screen:
+    :param progress: The part loaded, 0.0 to 1.0.
+    :param font: A pygame Font for the text above the bar.
+    :return: None
+
+    """
+    screen.fill(GAME_BOARD_COLOR)
+    width, height = PROGRESS_BAR_SIZE
+    frame = pygame.Rect(0, 0, width + 4, height + 4)
+    frame.center = (GAME_BOARD_X_SIZE // 2, GAME_BOARD_Y_SIZE // 2)
+    screen.fill(YELLOW_COLOR, frame)
+    screen.fill(GAME_BOARD_COLOR, frame.inflate(-2, -2))
+    screen.fill(YELLOW_COLOR, (frame.x + 2, frame.y + 2, int(width * progress), height))
+    message = font.render('Loading {0} %'.format(int(100 * progress)), False, YELLOW_COLOR)
+    screen.blit(message, (frame.x, frame.y - message.get_height() - 6))
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+"""
+Exact probabilities of the dealers final hand.
+
+Given the composition of the cards not yet seen (the number of cards of
+each rank left in the shoe) and the dealers up card, the probability of
+each final value of the dealers hand is calculated by going through every
+possible hole card and every possible sequence of dealer hits, with the
+dealers rules of :func:`includes.engine.get_value_of_dealers_hand` and
+:func:`includes.engine.dealer_must_hit`.
+
+The recursion is memoized on a canonical composition key, the number of
+cards of each value 1 to 10 (all ten valued cards are the same to the
+dealer), with a bounded LRU cache.
+
+Usage:
+outcomes = dealer_outcomes(shoe_composition(NUM_OF_DECKS), up_card=10)
+probability_of_bust = outcomes[BUSTED]
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import sys
+import os
+import functools
+
+# Local imports
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from globals import *
+from hand import DEALERS_VALUE_TABLE, value_table_index
+from engine import dealer_must_hit, BUSTED, BLACKJACK
+
+# All final outcomes of the dealers hand. The dealer stands on 16 when
+# the players hand is 16 or less, a Black Jack is a two card 21.
+DEALER_OUTCOMES = (16, 17, 18, 19, 20, 21, BUSTED, BLACKJACK)
+
+# Max number of (composition, dealers hand) entries kept in the cache
+DEALER_CACHE_SIZE = 2 ** 18
+
+_NUM_OF_OUTCOMES = len(DEALER_OUTCOMES)
+_INDEX_OF_BUSTED = DEALER_OUTCOMES.index(BUSTED)
+_INDEX_OF_BLACKJACK = DEALER_OUTCOMES.index(BLACKJACK)
+
+
+def shoe_composition(num_of_decks=NUM_OF_DECKS):
+    """
+    :param num_of_decks:
+    :return: A list with the number of cards of each rank 1 to 13 in a \
+    full shoe, the count of rank r at index r - 1.
+
+    """
+    return [4 * num_of_decks] * 13
+
+
+def composition_key(composition):
+    """
+    Make the canonical key of a composition, where all ten valued ranks
+    are counted together.
+
+    :param composition: The number of cards of each rank 1 to 13 as \
+    returned by :func:`shoe_composition`.
+    :return: A tuple with the number of cards of each value 1 to 10.
+
+    """
+    return tuple(composition[:9]) + (sum(composition[9:13]),)
+
+
+def remove_card(key, value):
+    """
+    :param key: A composition key, see :func:`composition_key`.
+    :param value: Value of the card, ace as 1.
+    :return: The composition key with one card of the value removed.
+
+    """
+    key = list(key)
+    key[value - 1] -= 1
+    return tuple(key)
+
+
+def dealer_outcomes(composition, up_card, value_of_players_hand=0):
+    """
+    Calculate the probability of each final outcome of the dealers hand.
+
+    :param composition: The number of cards of each rank 1 to 13 not \
+    seen, i.e. with the dealers up card and all dealt cards removed.
+    :param up_card: Rank of the dealers up card.
+    :param value_of_players_hand: Used for the dealers rule to hit 16, \
+    the default never hits 16.
+    :return: A dict with the probability for each of DEALER_OUTCOMES.
+
+    """
+    key = composition_key(composition)
+    if sum(key) == 0:
+        raise ValueError("Error: no cards left in the composition")
+    # Any value below 16 or above 17 has the same effect on the dealer
+    value_of_players_hand = min(max(value_of_players_hand, 16), 17)
+
+    probabilities = [0.0] * _NUM_OF_OUTCOMES
+    num_of_cards = sum(key)
+    for value, count in enumerate(key, 1):
+        if not count:
+            continue
+        # The hole card is dealt before the up card
+        total, hard_ace, busted = DEALERS_VALUE_TABLE[value_table_index(0, 0, value)]
+        total, hard_ace, busted = DEALERS_VALUE_TABLE[value_table_index(total, hard_ace, up_card)]
+        probability = count / num_of_cards
+        if total == 21:
+            probabilities[_INDEX_OF_BLACKJACK] += probability
+            continue
+        outcomes = _dealer_outcomes(remove_card(key, value), total, hard_ace, value_of_players_hand)
+        for index in range(0, _NUM_OF_OUTCOMES):
+            probabilities[index] += probability * outcomes[index]
+    return dict(zip(DEALER_OUTCOMES, probabilities))
+
+
+def dealer_cache_info():
+    """
+    :return: Hits, misses and size of the dealers cache, see \
+    functools.lru_cache.
+
+    """
+    return _dealer_outcomes.cache_info()
+
+
+def dealer_cache_clear():
+    """
+    Empty the dealers cache.
+
+    :return: None
+
+    """
+    _dealer_outcomes.cache_clear()
+
+
+@functools.lru_cache(maxsize=DEALER_CACHE_SIZE)
+def _dealer_outcomes(key, total, hard_ace, value_of_players_hand):
+    """
+    The probabilities of the final outcomes of a dealers hand with two
+    or more cards, as a tuple in the order of DEALER_OUTCOMES.
+
+    """
+    if total > 21:
+        outcomes = [0.0] * _NUM_OF_OUTCOMES
+        outcomes[_INDEX_OF_BUSTED] = 1.0
+        return tuple(outcomes)
+    if not dealer_must_hit(total, value_of_players_hand):
+        outcomes = [0.0] * _NUM_OF_OUTCOMES
+        outcomes[total - 16] = 1.0
+        return tuple(outcomes)
+
+    num_of_cards = sum(key)
+    if num_of_cards == 0:
+        raise ValueError("Error: no cards left in the composition for the dealer")
+    probabilities = [0.0] * _NUM_OF_OUTCOMES
+    for value, count in enumerate(key, 1):
+        if not count:
+            continue
+        new_total, new_hard_ace, busted = DEALERS_VALUE_TABLE[value_table_index(total, hard_ace, value)]
+        outcomes = _dealer_outcomes(remove_card(key, value), new_total, new_hard_ace, value_of_players_hand)
+        probability = count / num_of_cards
+        for index in range(0, _NUM_OF_OUTCOMES):
+            probabilities[index] += probability * outcomes[index]
+    return tuple(probabilities)
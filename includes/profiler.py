@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+"""
+Frame time profiling of the main game loop.
+
+Each frame is split into sections, the time from the previous mark to
+the next, and the plot functions in :mod:`includes.common` add their time
+to the plotting section through the :func:`plotting` decorator. The frame
+times are also collected in a histogram per FSM state.
+
+The profiler is turned on and off in the game with PROFILER_TOGGLE_KEY,
+which also shows an overlay with the average time of each section, and
+the collected times are saved as JSON with PROFILER_DUMP_KEY.
+When turned off each mark is a method call which returns at once.
+
+Usage:
+profiler = FrameProfiler.get_instance()
+profiler.start_frame()
+draw_background()
+profiler.mark(BACKGROUND)
+...
+profiler.end_frame(state_name)
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import sys
+import os
+import json
+import time
+import logging
+import functools
+import collections
+import pygame
+
+# Local imports
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from globals import *
+
+# Sections of a frame
+BACKGROUND = 'background'
+STATE = 'state'
+PLOTTING = 'plotting'
+FLIP = 'flip'
+SLEEP = 'sleep'
+SECTIONS = (BACKGROUND, STATE, PLOTTING, FLIP, SLEEP)
+
+PROFILER_TOGGLE_KEY = pygame.K_F3
+PROFILER_DUMP_KEY = pygame.K_F4
+
+# Upper limits in ms of the frame time histogram, the last bin is open
+HISTOGRAM_LIMITS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+# Number of frames in the averages of the overlay
+FRAMES_IN_OVERLAY = 30
+
+
+def plotting(function):
+    """
+    Decorator adding the time of a plot function to the plotting
+    section, when the profiler is turned on. The plot function is skipped
+    when the screen, the first argument, is None as in the headless game.
+
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if args and args[0] is None:
+            return None  # No screen to plot on
+        profiler = FrameProfiler.instance
+        if profiler is None or not profiler.enabled:
+            return function(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.plotting_time += time.perf_counter() - start
+    return wrapper
+
+
+class FrameProfiler:
+    """
+    Instantiating this class into an object will create a singleton object
+    collecting the time of each section of the frames and a frame time
+    histogram for each FSM state.
+
+    """
+    instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """
+        If instance is None create an instance of this class
+        and return it, else return the existing instance.
+
+        :return: A FrameProfiler instance.
+
+        """
+        if cls.instance is None:
+            cls.instance = cls()
+        return cls.instance
+
+    def __init__(self):
+        self.enabled = False
+        self.plotting_time = 0.0
+        self.time_to_first_frame = None  # Seconds from start to the first frame of the game
+        self._font = None
+        # Two overlays, the lines are drawn on the one not blitted in the last frame
+        self._overlays = [None, None]
+        self._overlay_lines = None
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all collected times.
+
+        :return: None
+
+        """
+        self.frames = 0
+        self.totals = dict.fromkeys(SECTIONS, 0.0)
+        self.recent = collections.deque(maxlen=FRAMES_IN_OVERLAY)
+        self.states = {}  # State name: [frames, total time, histogram]
+        self._frame = dict.fromkeys(SECTIONS, 0.0)
+        self._frame_start = None
+        self._last_mark = None
+
+    def toggle(self):
+        """
+        Turn the profiler and the overlay on or off.
+
+        :return: None
+
+        """
+        self.enabled = not self.enabled
+        self._frame_start = None
+        logging.info('FrameProfiler: %s', 'enabled' if self.enabled else 'disabled')
+
+    def start_frame(self):
+        """
+        Mark the start of a frame.
+
+        :return: None
+
+        """
+        if not self.enabled:
+            return
+        self._frame_start = self._last_mark = time.perf_counter()
+        self.plotting_time = 0.0
+        for section in SECTIONS:
+            self._frame[section] = 0.0
+
+    def mark(self, section):
+        """
+        Add the time since the previous mark to the section. Time in the
+        plot functions is moved from the section to PLOTTING.
+
+        :param section: One of SECTIONS.
+        :return: None
+
+        """
+        if not self.enabled or self._frame_start is None:
+            return
+        now = time.perf_counter()
+        elapsed = now - self._last_mark
+        if self.plotting_time:
+            elapsed -= self.plotting_time
+            self._frame[PLOTTING] += self.plotting_time
+            self.plotting_time = 0.0
+        self._frame[section] += elapsed
+        self._last_mark = now
+
+    def end_frame(self, state_name):
+        """
+        Add the frame to the totals and the histogram of the state.
+
+        :param state_name: Name of the FSM state called in this frame.
+        :return: None
+
+        """
+        if not self.enabled or self._frame_start is None:
+            return
+        frame_time = sum(self._frame.values())
+        self.frames += 1
+        for section in SECTIONS:
+            self.totals[section] += self._frame[section]
+        self.recent.append(dict(self._frame))
+
+        state = self.states.get(state_name)
+        if state is None:
+            state = self.states[state_name] = [0, 0.0, [0] * (len(HISTOGRAM_LIMITS_MS) + 1)]
+        state[0] += 1
+        state[1] += frame_time
+        frame_time_ms = frame_time * 1000
+        for index, limit in enumerate(HISTOGRAM_LIMITS_MS):
+            if frame_time_ms < limit:
+                break
+        else:
+            index = len(HISTOGRAM_LIMITS_MS)
+        state[2][index] += 1
+
+    def plot(self, screen):
+        """
+        Plot the overlay with the average time of each section over the
+        last frames and the average frame time of each state. The time to
+        plot the overlay isn't added to any section.
+
+        :param screen:
+        :return: None
+
+        """
+        if not self.enabled or not self.recent:
+            return
+        start = time.perf_counter()
+        if self._font is None:
+            self._font = pygame.font.SysFont('Arial', 14)
+        lines = []
+        frame_times = [sum(frame.values()) for frame in self.recent]
+        lines.append('Frame {0:.1f} ms'.format(1000 * sum(frame_times) / len(frame_times)))
+        for section in SECTIONS:
+            average = sum(frame[section] for frame in self.recent) / len(self.recent)
+            lines.append('{0} {1:.1f} ms'.format(section, 1000 * average))
+        for state_name, (frames, total, histogram) in sorted(self.states.items()):
+            lines.append('{0} {1:.1f} ms'.format(state_name, 1000 * total / frames))
+
+        if lines != self._overlay_lines:
+            # The screen compares the surfaces by identity, so changed lines are drawn on the other overlay
+            self._overlays.reverse()
+            line_height = self._font.get_linesize()
+            size = (200, line_height * len(lines) + 8)
+            if self._overlays[0] is None or self._overlays[0].get_size() != size:
+                self._overlays[0] = pygame.Surface(size, pygame.SRCALPHA)
+            overlay = self._overlays[0]
+            overlay.fill((0, 0, 0, 160))
+            for index, line in enumerate(lines):
+                overlay.blit(self._font.render(line, True, YELLOW_COLOR), (6, 4 + index * line_height))
+            self._overlay_lines = lines
+        screen.blit(self._overlays[0], (10, 10))
+        if self._last_mark is not None:
+            self._last_mark += time.perf_counter() - start
+
+    def to_dict(self):
+        """
+        :return: The collected times in seconds as a dict.
+
+        """
+        return {'frames': self.frames,
+                'time_to_first_frame': self.time_to_first_frame,
+                'sections': self.totals,
+                'histogram_limits_ms': HISTOGRAM_LIMITS_MS,
+                'states': {name: {'frames': frames, 'total': total, 'histogram': histogram}
+                           for name, (frames, total, histogram) in self.states.items()}}
+
+    def dump(self, filename=None):
+        """
+        Save the collected times as JSON.
+
+        :param filename: Default PROFILE_FILENAME in the project root.
+        :return: The name of the saved file.
+
+        """
+        if filename is None:
+            filename = os.path.join(MAIN_DIR, PROFILE_FILENAME)
+        with open(filename, 'w') as profile_file:
+            json.dump(self.to_dict(), profile_file, indent=2)
+        logging.info('FrameProfiler: Saved in %s', filename)
+        return filename
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+"""
+Dirty rectangle rendering of the game board.
+
+The game states plot the whole board every frame. Instead of drawing
+directly on the display, all blit() and fill() calls of a frame are
+recorded in a display list, which at the end of the frame is compared
+with the display list of the previous frame. Only the areas where
+something has changed (a new card, a bet, a button turned on or off, a
+new text) are drawn again and updated on the display, so a frame where
+nothing has changed doesn't draw anything at all.
+
+The surfaces are compared by identity and not by their pixels, which
+would take longer than to draw them. The same image or text has to be
+blitted as the same surface object every frame, e.g. from the ImageDB or
+render_text(), and a surface which is drawn on again has to be blitted
+as another surface object to be drawn again.
+
+Usage:
+screen = DirtyRectRenderer(pygame.display.set_mode(GAME_BOARD_SIZE))
+screen.fill(GAME_BOARD_COLOR)
+screen.blit(image, (x_pos, y_pos))
+screen.update()  # Instead of pygame.display.flip()
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import pygame
+
+# With more dirty areas than this, they are updated as one area
+MAX_DIRTY_RECTS = 8
+
+
+class DirtyRectRenderer(object):
+    """
+    A drop in replacement of the display surface for blit() and fill(),
+    other attributes are taken from the display surface.
+
+    """
+
+    def __init__(self, display):
+        """
+        :param display: The display surface from pygame.display.set_mode().
+        """
+        self.display = display
+        self._items = []
+        self._previous_items = []
+        self._full_update = True
+
+    def __getattr__(self, name):
+        return getattr(self.display, name)
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        """
+        Record a blit, see pygame.Surface.blit().
+
+        :return: The area of the display which will be drawn.
+
+        """
+        if area is None:
+            width, height = source.get_size()
+        else:
+            area = pygame.Rect(area)
+            width, height = area.size
+        rect = pygame.Rect(dest[0], dest[1], width, height)
+        self._items.append((source, rect, area, special_flags))
+        return rect
+
+    def fill(self, color, rect=None, special_flags=0):
+        """
+        Record a fill, see pygame.Surface.fill().
+
+        :return: The area of the display which will be filled.
+
+        """
+        if rect is None:
+            rect = self.display.get_rect()
+        else:
+            rect = pygame.Rect(rect)
+        self._items.append((tuple(pygame.Color(color)), rect, None, special_flags))
+        return rect
+
+    def invalidate(self):
+        """
+        Draw and update the whole display at the next update, e.g. when
+        the window has been hidden.
+
+        :return: None
+
+        """
+        self._full_update = True
+
+    def repeat(self):
+        """
+        Record the same frame as the previous one, e.g. when the game states
+        are paused, so nothing has to be drawn again.
+
+        :return: None
+
+        """
+        self._items = list(self._previous_items)
+
+    def update(self):
+        """
+        Draw the areas which differ from the previous frame and update
+        them on the display. Start recording the next frame.
+
+        :return: A list with the updated areas.
+
+        """
+        if self._full_update:
+            dirty_rects = [self.display.get_rect()]
+            self._full_update = False
+        else:
+            dirty_rects = _merge(self._changed_rects())
+
+        for dirty_rect in dirty_rects:
+            self.display.set_clip(dirty_rect)
+            for source, rect, area, special_flags in self._items:
+                if not rect.colliderect(dirty_rect):
+                    continue
+                if isinstance(source, tuple):
+                    self.display.fill(source, rect, special_flags)
+                else:
+                    self.display.blit(source, rect, area, special_flags)
+        self.display.set_clip(None)
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+
+        self._previous_items = self._items
+        self._items = []
+        return dirty_rects
+
+    def _changed_rects(self):
+        """
+        Compare the display lists item by item, both the old and the new
+        area of a changed item has to be drawn again.
+
+        """
+        changed = []
+        previous_items = self._previous_items
+        for index, item in enumerate(self._items):
+            if index >= len(previous_items):
+                changed.append(item[1])
+                continue
+            previous = previous_items[index]
+            if item[1] != previous[1] or item[2] != previous[2] or item[3] != previous[3] \
+                    or not _same_source(item[0], previous[0]):
+                changed.append(item[1])
+                changed.append(previous[1])
+        for previous in previous_items[len(self._items):]:
+            changed.append(previous[1])
+        return changed
+
+
+def _same_source(source, previous):
+    """
+    :return: True if both are the same fill color or the same surface \
+    object, see the module description.
+
+    """
+    if source is previous:
+        return True
+    return isinstance(source, tuple) and source == previous
+
+
+def _merge(rects):
+    """
+    Merge overlapping areas, or all areas into one if there are many.
+
+    """
+    if len(rects) > MAX_DIRTY_RECTS:
+        return [rects[0].unionall(rects[1:])]
+    merged = []
+    for rect in rects:
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect = rect.union(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""
+Delayed actions run by the main game loop.
+
+Instead of sleeping, the main loop posts the pauses asked for by the game
+states (common_vars.pause_time) to the scheduler, which holds the FSM
+until the pause is over. The loop keeps handling events and updating the
+display in the meantime, so the window can be closed at any time and a
+mouse click skips the pause. Any other action can be posted to be run
+after a delay in the same way.
+
+All delays are multiplied by time_scale, set it to 0 to run without any
+pauses, e.g. in a benchmark or without a display.
+
+Usage:
+scheduler = FrameScheduler.get_instance()
+scheduler.pause(PAUSE_TIMER3)
+scheduler.call_later(PAUSE_TIMER1, card_sound.play)
+...
+scheduler.run_due()  # Once per frame
+if not scheduler.paused:
+    current_state(common_vars, button_status)
+...
+scheduler.wait(MAX_IDLE_WAIT)  # When nothing is changing on the display
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import math
+import time
+import heapq
+import itertools
+import pygame
+
+
+class FrameScheduler:
+    """
+    Instantiating this class into an object will create a singleton object
+    with the actions waiting to be run, ordered by the time they are due.
+
+    """
+    instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """
+        If instance is None create an instance of this class
+        and return it, else return the existing instance.
+
+        :return: A FrameScheduler instance.
+
+        """
+        if cls.instance is None:
+            cls.instance = cls()
+        return cls.instance
+
+    def __init__(self):
+        self.time_scale = 1.0
+        self._actions = []  # A heap of (due time, order, action)
+        self._order = itertools.count()  # Actions due at the same time are run in posted order
+        self._pauses = 0
+
+    @property
+    def paused(self):
+        """
+        :return: True while the FSM is held by a pause.
+
+        """
+        return self._pauses > 0
+
+    def call_later(self, delay, action):
+        """
+        Run the action in the first frame after the delay.
+
+        :param delay: Seconds, multiplied by time_scale.
+        :param action: A function without arguments.
+        :return: None
+
+        """
+        due = time.perf_counter() + delay * self.time_scale
+        heapq.heappush(self._actions, (due, next(self._order), action))
+
+    def pause(self, delay):
+        """
+        Hold the FSM for the delay.
+
+        :param delay: Seconds, multiplied by time_scale.
+        :return: None
+
+        """
+        self._pauses += 1
+        self.call_later(delay, self._resume)
+
+    def _resume(self):
+        self._pauses -= 1
+
+    def run_due(self):
+        """
+        Run the actions which are due.
+
+        :return: The number of actions run.
+
+        """
+        now = time.perf_counter()
+        count = 0
+        while self._actions and self._actions[0][0] <= now:
+            heapq.heappop(self._actions)[2]()
+            count += 1
+        return count
+
+    def skip(self):
+        """
+        Fast forward, run all waiting actions at once in due order.
+
+        :return: The number of actions run.
+
+        """
+        count = 0
+        while self._actions:
+            heapq.heappop(self._actions)[2]()
+            count += 1
+        return count
+
+    def timeout(self):
+        """
+        :return: Seconds until the next action is due, 0 if it's already \
+        due or None if no action is waiting.
+
+        """
+        if not self._actions:
+            return None
+        return max(0.0, self._actions[0][0] - time.perf_counter())
+
+    def wait(self, max_wait):
+        """
+        Sleep until an event arrives or the next action is due, but at most
+        max_wait seconds. There is no wait at all if the event queue isn't
+        empty, and the event is put back in the queue.
+
+        :param max_wait: Seconds.
+        :return: True if an event arrived.
+
+        """
+        # Note! Not pygame.event.peek(), which loses the attributes of
+        # posted events in pygame 2.6
+        timeout = self.timeout()
+        if timeout is None or timeout > max_wait:
+            timeout = max_wait
+        if timeout <= 0:
+            return False
+        event = pygame.event.wait(int(math.ceil(timeout * 1000)))
+        if event.type == pygame.NOEVENT:
+            return False
+        pygame.event.post(event)
+        return True
+
+    def clear(self):
+        """
+        Forget all waiting actions and pauses.
+
+        :return: None
+
+        """
+        self._actions = []
+        self._pauses = 0
@@ -0,0 +1,338 @@
+#!/usr/bin/env python
+"""
+A NumPy vectorized Monte Carlo simulator for the Black Jack game.
+
+Thousands of shoes are dealt at once as rows in a NumPy integer array and
+every shoe is played round by round until the "cut" is passed, with the
+player and dealer rules of :mod:`includes.engine` applied as batched
+array operations on all shoes at the same time.
+
+The player follows a strategy table indexed as
+strategy[soft, value of players hand, value of dealers up card] with one
+of the actions STAND, HIT or DOUBLE_DOWN. Split is not part of the
+vectorized simulation.
+
+Usage:
+rng = numpy.random.default_rng(4711)
+result = simulate_shoes(make_shoes(10000, NUM_OF_DECKS, rng), hit_until(17))
+house_edge, variance = result.house_edge(), result.variance()
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import sys
+import os
+import numpy as np
+
+# Local imports
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from globals import *
+from playingcard import CARDS
+from hand import MAX_TOTAL, PLAYERS_VALUE_TABLE, DEALERS_VALUE_TABLE
+import engine
+
+# Actions in the strategy table
+STAND = 0
+HIT = 1
+DOUBLE_DOWN = 2
+
+# Black Jack value of each rank, index 0 is unused
+RANK_VALUES = np.array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10], dtype=np.int16)
+
+######################
+# Shoes and strategy #
+######################
+
+
+def card_code(rank, suit):
+    """
+    :param rank: Rank of the card in range 1 to 13.
+    :param suit: Suit of the card in range 0 to 3.
+    :return: The card as an integer code in range 0 to 51, \
+    the same as :attr:`lib.playingcard.PlayingCard.code`.
+
+    """
+    return suit * 13 + rank - 1
+
+
+def card_rank(code):
+    """
+    :param code: Card code(s) as an integer or a NumPy array.
+    :return: The rank(s) of the card code(s) in range 1 to 13.
+
+    """
+    return code % 13 + 1
+
+
+def make_shoes(num_of_shoes, num_of_decks, rng):
+    """
+    Create shuffled shoes, one shoe per row with the cards as card codes.
+    Each shoe contain the same cards as a :class:`lib.carddecks.CardDecks`.
+
+    :param num_of_shoes:
+    :param num_of_decks:
+    :param rng: A numpy.random.Generator.
+    :return: A NumPy array with shape (num_of_shoes, num_of_decks * 52).
+
+    """
+    decks = np.tile(np.arange(52, dtype=np.int8), num_of_decks)
+    return rng.permuted(np.tile(decks, (num_of_shoes, 1)), axis=1)
+
+
+def hit_until(value):
+    """
+    Create a strategy table where the player hits until the value of the
+    hand is at least the given value and then stands.
+
+    :param value:
+    :return: A strategy table.
+
+    """
+    strategy = np.full((2, 22, 11), STAND, dtype=np.int8)
+    strategy[:, :value, :] = HIT
+    return strategy
+
+
+def strategy_decisions(strategy):
+    """
+    Create a decision function for :func:`includes.engine.play_round`
+    which plays the strategy table exactly as the vectorized simulation.
+    A double down which is not allowed is played as a hit.
+
+    :param strategy: A strategy table.
+    :return: A function game_round -> action.
+
+    """
+    def decisions(game_round):
+        up_card = game_round.dealer_up_card().value
+        action = strategy[int(game_round.is_soft()), game_round.value_of_players_hand(), up_card]
+        if action == STAND:
+            return engine.STAND
+        if action == DOUBLE_DOWN and engine.DOUBLE_DOWN in game_round.options():
+            return engine.DOUBLE_DOWN
+        return engine.HIT
+    return decisions
+
+
+##############
+# Simulation #
+##############
+
+
+class SimulationResult(object):
+    """
+    The result of a simulation.
+
+    Attributes:
+    nets: The net win (positive) or loss (negative) of every round \
+    as a 2D array with one row per shoe, rounds not played are 0.
+    played: A boolean array of the same shape, True where a round was played.
+    bet: The initial bet of each round.
+
+    """
+
+    def __init__(self, nets, played, bet):
+        self.nets = nets
+        self.played = played
+        self.bet = bet
+
+    def rounds(self):
+        """
+        :return: Total number of rounds played.
+
+        """
+        return int(self.played.sum())
+
+    def round_nets(self):
+        """
+        :return: The net of all played rounds, shoe by shoe, as a 1D array.
+
+        """
+        return self.nets[self.played]
+
+    def house_edge(self):
+        """
+        :return: The average loss per round as a part of the initial bet.
+
+        """
+        return -self.round_nets().mean() / self.bet
+
+    def variance(self):
+        """
+        :return: The variance of the net per round, in units of the initial bet.
+
+        """
+        return (self.round_nets() / self.bet).var()
+
+
+def _value_table_arrays(table):
+    """
+    :param table: PLAYERS_VALUE_TABLE or DEALERS_VALUE_TABLE.
+    :return: Tuple with two flat arrays, (new total, new flag), indexed \
+    as the table with :func:`includes.hand.value_table_index`.
+
+    """
+    return (np.array([entry[0] for entry in table], dtype=np.int16),
+            np.array([entry[1] for entry in table], dtype=bool))
+
+
+PLAYERS_TOTALS, PLAYERS_SOFT = _value_table_arrays(PLAYERS_VALUE_TABLE)
+DEALERS_TOTALS, DEALERS_HARD_ACE = _value_table_arrays(DEALERS_VALUE_TABLE)
+
+
+def _table_index(value, flag, rank):
+    """
+    Vectorized version of :func:`includes.hand.value_table_index`.
+    Busted values are clipped to keep the index inside the table, so
+    lanes with a busted hand get a wrong result and have to be masked.
+
+    """
+    return (np.minimum(value, MAX_TOTAL) * 2 + flag) * 14 + rank
+
+
+def _add_to_players_value(value, soft, rank):
+    """
+    Vectorized version of :func:`includes.hand._add_to_players_value`
+    as lookups in PLAYERS_VALUE_TABLE.
+
+    """
+    index = _table_index(value, soft, rank)
+    return PLAYERS_TOTALS.take(index), PLAYERS_SOFT.take(index)
+
+
+def _add_to_dealers_value(value, hard_ace, rank):
+    """
+    Vectorized version of :func:`includes.hand._add_to_dealers_value`
+    as lookups in DEALERS_VALUE_TABLE.
+
+    """
+    index = _table_index(value, hard_ace, rank)
+    return DEALERS_TOTALS.take(index), DEALERS_HARD_ACE.take(index)
+
+
+def simulate_shoes(shoes, strategy, bet=10, num_of_decks=None):
+    """
+    Play all shoes, round by round until the "cut" is passed, with all
+    shoes in parallel.
+
+    :param shoes: Card codes as returned by :func:`make_shoes`.
+    :param strategy: A strategy table.
+    :param bet: The initial bet of each round.
+    :param num_of_decks: Used for the "cut", default the size of the shoes.
+    :return: A :class:`SimulationResult`.
+
+    """
+    num_of_shoes, shoe_size = shoes.shape
+    if num_of_decks is None:
+        num_of_decks = shoe_size // 52
+    cut = num_of_decks * 52 * CUT_RATIO
+    ranks = card_rank(shoes.astype(np.int16))
+    lanes = np.arange(num_of_shoes)
+    cursor = np.zeros(num_of_shoes, dtype=np.int64)
+    all_nets = []
+    all_played = []
+
+    def draw(mask):
+        if (cursor[mask] >= shoe_size).any():
+            raise IndexError("Error: shoe exhausted before the cut")
+        rank = ranks[lanes, np.minimum(cursor, shoe_size - 1)]
+        cursor[mask] += 1
+        return rank
+
+    while True:
+        active = shoe_size - cursor >= cut
+        if not active.any():
+            break
+        zeros = np.zeros(num_of_shoes, dtype=np.int16)
+        no = np.zeros(num_of_shoes, dtype=bool)
+
+        # Deal two cards each, player first and the dealers second card is the up card
+        players_value, soft = _add_to_players_value(zeros, no, draw(active))
+        dealers_value, hard_ace = _add_to_dealers_value(zeros, no, draw(active))
+        players_value, soft = _add_to_players_value(players_value, soft, draw(active))
+        rank = draw(active)
+        up_card = RANK_VALUES[rank]
+        dealers_value, hard_ace = _add_to_dealers_value(dealers_value, hard_ace, rank)
+
+        stakes = np.where(active, bet, 0)
+        nets = np.zeros(num_of_shoes, dtype=np.int64)
+        blackjack = active & (players_value == 21)
+        nets[blackjack & (dealers_value != 21)] = int(bet * BLACKJACK_PAYOUT)
+
+        # The player follows the strategy
+        playing = active & ~blackjack
+        num_of_cards = 2
+        while playing.any():
+            action = strategy[soft.astype(np.int8), np.minimum(players_value, 21), up_card]
+            if num_of_cards != 2:
+                action = np.where(action == DOUBLE_DOWN, HIT, action)
+            playing &= action != STAND
+            doubling = playing & (action == DOUBLE_DOWN)
+            stakes = np.where(doubling, stakes * 2, stakes)
+            rank = draw(playing)
+            new_value, new_soft = _add_to_players_value(players_value, soft, rank)
+            players_value = np.where(playing, new_value, players_value)
+            soft = np.where(playing, new_soft, soft)
+            playing &= ~doubling & (players_value < 21)
+            num_of_cards += 1
+
+        # The dealer follows the rules of 16 & 17
+        busted = active & (players_value > 21)
+        dealing = active & ~blackjack & ~busted
+        while True:
+            dealing &= (dealers_value < 16) | ((dealers_value == 16) & (players_value > 16))
+            if not dealing.any():
+                break
+            rank = draw(dealing)
+            new_value, new_hard_ace = _add_to_dealers_value(dealers_value, hard_ace, rank)
+            dealers_value = np.where(dealing, new_value, dealers_value)
+            hard_ace = np.where(dealing, new_hard_ace, hard_ace)
+
+        settled = active & ~blackjack
+        win = settled & ~busted & ((dealers_value > 21) | (players_value > dealers_value))
+        loose = settled & ~win & (players_value != dealers_value)
+        nets = np.where(win, stakes, nets)
+        nets = np.where(loose, -stakes, nets)
+        all_nets.append(nets)
+        all_played.append(active)
+
+    return SimulationResult(np.stack(all_nets, axis=1), np.stack(all_played, axis=1), bet)
+
+
+def play_shoe(shoe, strategy, bet=10, num_of_decks=None):
+    """
+    Play one shoe of card codes with the scalar rules engine, round by
+    round until the "cut" is passed, as a reference to the simulation.
+
+    :param shoe: One row of card codes as returned by :func:`make_shoes`.
+    :param strategy: A strategy table.
+    :param bet: The initial bet of each round.
+    :param num_of_decks: Used for the "cut", default the size of the shoe.
+    :return: A list with the net of each round.
+
+    """
+    if num_of_decks is None:
+        num_of_decks = len(shoe) // 52
+    cut = num_of_decks * 52 * CUT_RATIO
+    cards = [CARDS[code] for code in reversed(shoe.tolist())]
+    shoe_of_decks = _ListShoe(cards)
+    decisions = strategy_decisions(strategy)
+    nets = []
+    while len(cards) >= cut:
+        nets.append(engine.play_round(shoe_of_decks, bet, decisions).net)
+    return nets
+
+
+class _ListShoe(object):
+    """
+    A shoe dealing from the end of a list.
+
+    """
+    def __init__(self, cards):
+        self.pop = cards.pop
@@ -0,0 +1,385 @@
+#!/usr/bin/env python
+"""
+Basic strategy for the Black Jack game.
+
+The best action (hit, stand, double down or split) for every players hand
+against every dealers up card is calculated from the expected value (EV)
+of each action with the rules actually used in the game: a Black Jack
+pays 3/2, a single split, double down on any two cards (also after a
+split) and the dealers rules of 16 & 17.
+
+For each up card and each possible first two cards of the player, the
+probabilities of the dealers final hand are calculated exactly by
+:func:`includes.probability.dealer_outcomes` with these three cards
+removed from the shoe. The cards the player draws after the first two
+are not removed again. The EV of all two card hands with the same value
+are then weighted together into one action per value, the same tables as
+a printed basic strategy card. A pair is only two cards of the same rank,
+as in :attr:`includes.hand.Hand.is_pair`, and a pair which is split is
+not weighted into the ordinary hands.
+
+The calculation takes some time, so the tables are saved in CACHE_PATH
+as a JSON file named by the rule set and the number of decks, and loaded
+from there the next time.
+
+Usage:
+strategy = load_strategy(NUM_OF_DECKS)
+action = strategy.action(hand, up_card, game_round.options())
+Or:
+result = play_round(shoe, 10, strategy.decisions)
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import sys
+import os
+import json
+import logging
+
+# Local imports
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from globals import *
+from hand import PLAYERS_VALUE_TABLE, value_table_index
+from probability import dealer_outcomes, shoe_composition, composition_key, remove_card
+from engine import HIT, STAND, DOUBLE_DOWN, SPLIT, BUSTED, BLACKJACK
+
+# Codes in the tables, as on a printed basic strategy card
+CODE_HIT = 'H'
+CODE_STAND = 'S'
+CODE_DOUBLE_OR_HIT = 'Dh'
+CODE_DOUBLE_OR_STAND = 'Ds'
+CODE_SPLIT = 'P'
+
+# Change when the calculation is changed, to not use old cached tables
+STRATEGY_VERSION = 2
+
+
+def rule_set():
+    """
+    :return: A short name of the rules the strategy is calculated for, \
+    used in the name of the cache file.
+
+    """
+    return 'bj{0}-split1-double2-dealer1617-v{1}'.format(BLACKJACK_PAYOUT, STRATEGY_VERSION)
+
+
+class BasicStrategy(object):
+    """
+    The basic strategy tables. Each table is a list of rows, indexed
+    first by the value of the players hand (by the value of the card in
+    the pair for the pairs table) and then by the value of the dealers up
+    card, ace as 1. The pairs table only has CODE_SPLIT or None, where
+    None means to play the pair as an ordinary hand.
+
+    """
+
+    def __init__(self, hard, soft, pairs, num_of_decks):
+        """
+        :param hard: Table with a code for each hand without a soft ace.
+        :param soft: Table with a code for each hand with a soft ace.
+        :param pairs: Table with CODE_SPLIT or None for each pair.
+        :param num_of_decks:
+        """
+        self.hard = hard
+        self.soft = soft
+        self.pairs = pairs
+        self.num_of_decks = num_of_decks
+
+    def code(self, hand, up_card, can_split=False):
+        """
+        :param hand: A :class:`includes.hand.Hand`.
+        :param up_card: The dealers up card, a \
+        :meth:`lib.playingcard.PlayingCard`.
+        :param can_split: True if the hand can be split.
+        :return: The code in the tables for the hand.
+
+        """
+        if can_split and self.pairs[hand[0].value][up_card.value] == CODE_SPLIT:
+            return CODE_SPLIT
+        if hand.soft:
+            return self.soft[hand.value][up_card.value]
+        return self.hard[hand.value][up_card.value]
+
+    def action(self, hand, up_card, options):
+        """
+        :param hand: A :class:`includes.hand.Hand`.
+        :param up_card: The dealers up card, a \
+        :meth:`lib.playingcard.PlayingCard`.
+        :param options: The allowed actions, see \
+        :meth:`includes.engine.Round.options`.
+        :return: The best allowed action.
+
+        """
+        code = self.code(hand, up_card, SPLIT in options)
+        if code == CODE_SPLIT:
+            return SPLIT
+        if code == CODE_HIT:
+            return HIT
+        if code == CODE_STAND:
+            return STAND
+        if DOUBLE_DOWN in options:
+            return DOUBLE_DOWN
+        return HIT if code == CODE_DOUBLE_OR_HIT else STAND
+
+    def decisions(self, game_round):
+        """
+        A decision function for :func:`includes.engine.play_round`.
+
+        :param game_round: A :class:`includes.engine.Round`.
+        :return: The best allowed action for the current hand.
+
+        """
+        return self.action(game_round.player_hands[game_round.current_hand],
+                           game_round.dealer_up_card(), game_round.options())
+
+    def to_dict(self):
+        """
+        :return: The tables as a dict which can be saved as JSON.
+
+        """
+        return {'rules': rule_set(), 'num_of_decks': self.num_of_decks,
+                'hard': self.hard, 'soft': self.soft, 'pairs': self.pairs}
+
+
+def load_strategy(num_of_decks=NUM_OF_DECKS, cache_path=None):
+    """
+    Load the basic strategy from the cache, or calculate and save it if
+    not found.
+
+    :param num_of_decks:
+    :param cache_path: Directory of the cache, default CACHE_PATH in \
+    the project root.
+    :return: A :class:`BasicStrategy`.
+
+    """
+    if cache_path is None:
+        cache_path = os.path.join(MAIN_DIR, CACHE_PATH)
+    filename = os.path.join(cache_path, 'basic_strategy_{0}_{1}decks.json'.format(rule_set(), num_of_decks))
+    try:
+        with open(filename) as cache_file:
+            tables = json.load(cache_file)
+        if tables['rules'] == rule_set() and tables['num_of_decks'] == num_of_decks:
+            return BasicStrategy(tables['hard'], tables['soft'], tables['pairs'], num_of_decks)
+        logging.warning('load_strategy: %s is for other rules, calculate again', filename)
+    except (OSError, ValueError, KeyError):
+        logging.info('load_strategy: No cached strategy in %s', filename)
+
+    strategy = calculate_strategy(num_of_decks)
+    os.makedirs(cache_path, exist_ok=True)
+    with open(filename, 'w') as cache_file:
+        json.dump(strategy.to_dict(), cache_file)
+    return strategy
+
+
+def calculate_strategy(num_of_decks=NUM_OF_DECKS):
+    """
+    Calculate the basic strategy tables, see the module description.
+
+    :param num_of_decks:
+    :return: A :class:`BasicStrategy`.
+
+    """
+    # Sum of weighted EV per (soft, value of hand, up card) for each action
+    evs = {}
+    pairs = [[None] * 11 for value in range(0, 11)]
+    ranks = shoe_composition(num_of_decks)
+    full_shoe = composition_key(ranks)
+
+    for up_card in range(1, 11):
+        shoe = remove_card(full_shoe, up_card)
+        num_of_cards = sum(shoe)
+        for first in range(1, 11):
+            for second in range(first, 11):
+                if first == second:
+                    weight = shoe[first - 1] * (shoe[first - 1] - 1)
+                else:
+                    weight = 2 * shoe[first - 1] * shoe[second - 1]
+                weight /= num_of_cards * (num_of_cards - 1)
+                if not weight:
+                    continue
+                value, soft, busted = _add_cards(0, 0, (first, second))
+                if value == 21:
+                    # A Black Jack, no decisions
+                    continue
+                hand_evs = _HandEV(remove_card(remove_card(shoe, first), second), up_card)
+                stand, hit, double = hand_evs.two_card_evs(value, soft)
+                if first == second and hand_evs.split_ev(first) > max(stand, hit, double):
+                    pairs[first][up_card] = CODE_SPLIT
+                    # Only the cards of the same rank are split, e.g. not a jack and a queen
+                    weight *= 1 - _pair_fraction(ranks, first, up_card)
+                    if not weight:
+                        continue
+                key = (soft, value, up_card)
+                total = evs.setdefault(key, [0.0, 0.0, 0.0])
+                total[0] += weight * stand
+                total[1] += weight * hit
+                total[2] += weight * double
+
+    hard = _empty_table()
+    soft = _empty_table()
+    for (is_soft, value, up_card), (stand, hit, double) in evs.items():
+        table = soft if is_soft else hard
+        if double > max(stand, hit):
+            table[value][up_card] = CODE_DOUBLE_OR_HIT if hit > stand else CODE_DOUBLE_OR_STAND
+        else:
+            table[value][up_card] = CODE_HIT if hit > stand else CODE_STAND
+    return BasicStrategy(hard, soft, pairs, num_of_decks)
+
+
+class _HandEV(object):
+    """
+    The EV of a players hand in units of the initial bet, for a given
+    composition of the remaining cards and dealers up card.
+
+    """
+
+    def __init__(self, shoe, up_card):
+        """
+        :param shoe: Composition key with the number of cards of each \
+        value, see :func:`includes.probability.composition_key`.
+        :param up_card: Value of the dealers up card.
+        """
+        num_of_cards = sum(shoe)
+        self._probabilities = [(value, count / num_of_cards) for value, count in enumerate(shoe, 1) if count]
+        composition = list(shoe) + [0, 0, 0]
+        # The dealer only hits 16 when the player has more than 16
+        self._dealer_stands_on_16 = dealer_outcomes(composition, up_card, 16)
+        self._dealer_hits_16 = dealer_outcomes(composition, up_card, 17)
+        self._best = {}
+
+    def stand_ev(self, value):
+        """
+        :param value: Value of the players hand.
+        :return: EV when standing.
+
+        """
+        if value > 21:
+            return -1.0
+        outcomes = self._dealer_hits_16 if value > 16 else self._dealer_stands_on_16
+        ev = outcomes[BUSTED]
+        for dealers_value in range(16, 22):
+            if dealers_value < value:
+                ev += outcomes[dealers_value]
+            elif dealers_value > value:
+                ev -= outcomes[dealers_value]
+        if value < 21:
+            # A Black Jack is a 21 for the dealer, a push against 21
+            ev -= outcomes[BLACKJACK]
+        return ev
+
+    def best_ev(self, value, soft):
+        """
+        :return: EV of the best of stand and hit, when double down isn't \
+        allowed.
+
+        """
+        key = (value, soft)
+        if key not in self._best:
+            self._best[key] = max(self.stand_ev(value), self.hit_ev(value, soft))
+        return self._best[key]
+
+    def hit_ev(self, value, soft):
+        """
+        :return: EV when hitting once and then playing the best way.
+
+        """
+        ev = 0.0
+        for card, probability in self._probabilities:
+            new_value, new_soft, busted = PLAYERS_VALUE_TABLE[value_table_index(value, soft, card)]
+            if busted:
+                ev -= probability
+            elif new_value == 21:
+                # The hand is done on 21
+                ev += probability * self.stand_ev(21)
+            else:
+                ev += probability * self.best_ev(new_value, new_soft)
+        return ev
+
+    def double_ev(self, value, soft):
+        """
+        :return: EV when doubling down, one card and twice the bet.
+
+        """
+        ev = 0.0
+        for card, probability in self._probabilities:
+            new_value, new_soft, busted = PLAYERS_VALUE_TABLE[value_table_index(value, soft, card)]
+            ev += probability * self.stand_ev(new_value)
+        return 2 * ev
+
+    def two_card_evs(self, value, soft):
+        """
+        :return: A tuple with the EV of (stand, hit, double down).
+
+        """
+        return self.stand_ev(value), self.hit_ev(value, soft), self.double_ev(value, soft)
+
+    def split_ev(self, card):
+        """
+        EV when splitting a pair. Each hand gets a second card and is
+        then played as a two card hand, without any more split. A 21 is
+        played no further, and two hands with 21 pay 3/2 on both bets
+        unless the dealer has a Black Jack.
+
+        :param card: Value of the cards in the pair.
+        :return: EV for both hands together.
+
+        """
+        value, soft, busted = PLAYERS_VALUE_TABLE[value_table_index(0, 0, card)]
+        ev = 0.0
+        probability_of_21 = 0.0
+        for second, probability in self._probabilities:
+            new_value, new_soft, busted = PLAYERS_VALUE_TABLE[value_table_index(value, soft, second)]
+            if new_value == 21:
+                probability_of_21 += probability
+                ev += probability * self.stand_ev(21)
+            else:
+                ev += probability * max(self.two_card_evs(new_value, new_soft))
+        # Two hands with 21 are settled before the dealer draws, 3/2 on both
+        # bets unless the dealer has a Black Jack, instead of 1/1 each also
+        # when the dealer draws to 21
+        outcomes = self._dealer_hits_16
+        ev_of_two_21 = (2 * BLACKJACK_PAYOUT - 2) * (1 - outcomes[BLACKJACK]) + 2 * outcomes[21]
+        return 2 * ev + probability_of_21 ** 2 * ev_of_two_21
+
+
+def _add_cards(value, soft, cards):
+    for card in cards:
+        value, soft, busted = PLAYERS_VALUE_TABLE[value_table_index(value, soft, card)]
+    return value, soft, value > 21
+
+
+def _pair_fraction(ranks, value, up_card):
+    """
+    :param ranks: The number of cards of each rank 1 to 13 in the shoe.
+    :param value: Value of both cards of the players hand.
+    :param up_card: Value of the dealers up card, removed from the shoe.
+    :return: The part of the hands with two cards of the value that \
+    are two cards of the same rank.
+
+    """
+    def same_rank(counts):
+        num_of_cards = sum(counts)
+        return sum(count * (count - 1) for count in counts) / (num_of_cards * (num_of_cards - 1))
+
+    counts = [count for rank, count in enumerate(ranks, 1) if min(rank, 10) == value]
+    if up_card != value:
+        return same_rank(counts)
+    # The up card is any of the ranks with the value, as often as there are cards of it
+    num_of_cards = sum(counts)
+    return sum(count / num_of_cards * same_rank(counts[:index] + [count - 1] + counts[index + 1:])
+               for index, count in enumerate(counts))
+
+
+def _empty_table():
+    """
+    :return: A table where all values not reached with two cards hit \
+    below 17 and stand from 17.
+
+    """
+    return [[CODE_HIT if value < 17 else CODE_STAND] * 11 for value in range(0, 22)]
@@ -0,0 +1,427 @@
+#!/usr/bin/env python
+"""
+An asyncio game server hosting many Black Jack tables in one process, on
+top of the rules engine in :mod:`includes.engine` without any pygame.
+
+A client connects over TCP or a Unix socket and speaks JSON lines, one
+request per line and one reply per line, in the order of the requests.
+A request is an object with the command in "cmd" and the table id in
+"table", the cards are sent as card codes (see
+:meth:`lib.playingcard.PlayingCard`):
+
+{"cmd": "open", "seed": 4711}       Open a table, the seed is optional
+{"cmd": "bet", "table": 1, "amount": 10}
+{"cmd": "hit", "table": 1}          Also "stand", "double_down" and "split"
+{"cmd": "state", "table": 1}
+{"cmd": "close", "table": 1}
+
+Each reply has "ok", and "error" if not ok, otherwise the state of the
+table, see :meth:`Table.state`. A connection can play any number of
+tables, and all tables of a connection are closed when it's closed.
+
+Usage:
+server = TableServer()
+await server.start(port=DEFAULT_PORT)
+await server.serve_forever()
+...
+client = await TableClient.connect(port=DEFAULT_PORT)
+table = (await client.request('open'))['table']
+state = await client.request('bet', table=table, amount=10)
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import sys
+import os
+import json
+import time
+import stat
+import random
+import asyncio
+
+# Local imports
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from globals import *
+from carddecks import CardDecks
+from engine import Round, is_cut_passed, HIT, STAND, DOUBLE_DOWN, SPLIT
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 4711
+BACKLOG = 1024  # Pending connections, to accept many clients at once
+MAX_LINE_LENGTH = 64 * 1024  # Of a request
+
+# Compact JSON without spaces, created once instead of for each line
+_decode = json.JSONDecoder().decode
+_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+
+class Table(object):
+    """
+    One table with one player, the players cash and a shoe of its own.
+
+    """
+
+    def __init__(self, table_id, seed=None, player_cash=DEFAULT_PLAYER_BALANCE):
+        """
+        :param table_id:
+        :param seed: Seed of the shoe, or None for a random shoe.
+        :param player_cash:
+        """
+        self.table_id = table_id
+        self.shoe_of_decks = CardDecks(NUM_OF_DECKS, random.Random(seed))
+        self.player_cash = player_cash
+        self.game_round = None
+        self.rounds = 0
+
+    def bet(self, amount):
+        """
+        Place the bet and deal a new round.
+
+        :param amount: The initial bet.
+        :return: None
+
+        """
+        if self.game_round is not None and not self.game_round.done:
+            raise ValueError('Error: the round is not done')
+        if type(amount) is not int or not LOWEST_BET <= amount <= self.player_cash:
+            raise ValueError('Error: invalid bet: ' + str(amount))
+        if is_cut_passed(self.shoe_of_decks):
+            self.shoe_of_decks.shuffle()
+        self.player_cash -= amount
+        self.game_round = Round(self.shoe_of_decks, amount, self.player_cash)
+        self.rounds += 1
+        self._settle()
+
+    def act(self, action):
+        """
+        Apply one player action on the current hand.
+
+        :param action: One of 'hit', 'stand', 'double_down' or 'split'.
+        :return: None
+
+        """
+        if self.game_round is None or self.game_round.done:
+            raise ValueError('Error: no round in progress')
+        self.game_round.act(action)
+        self.player_cash = self.game_round.player_cash
+        self._settle()
+
+    def _settle(self):
+        if self.game_round.done:
+            self.player_cash += self.game_round.result.payout
+
+    def state(self):
+        """
+        The dealers first card is hidden (None) until the round is done.
+
+        :return: A dict with "table", "cash" and "rounds", and for the \
+        last round "bet", "player" (a list of card codes for each hand), \
+        "dealer", "hand" (the current hand), "options" and "done". When \
+        the round is done also "outcomes" and "net".
+
+        """
+        state = {'ok': True, 'table': self.table_id, 'cash': self.player_cash, 'rounds': self.rounds}
+        game_round = self.game_round
+        if game_round is None:
+            return state
+        state['bet'] = game_round.bet
+        state['player'] = [[card.code for card in hand] for hand in game_round.player_hands]
+        state['hand'] = game_round.current_hand
+        state['options'] = game_round.options()
+        state['done'] = game_round.done
+        if game_round.done:
+            state['dealer'] = [card.code for card in game_round.dealer_cards]
+            state['outcomes'] = game_round.outcomes
+            state['net'] = game_round.result.net
+        else:
+            state['dealer'] = [None, game_round.dealer_cards[1].code]
+        return state
+
+
+class TableServer(object):
+    """
+    The server, with all open tables of all connections.
+
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.connections = 0
+        self._next_table_id = 1
+        self._server = None
+        self._commands = {
+            'open': self._open,
+            'close': self._close,
+            'state': self._state,
+            'bet': self._bet,
+            HIT: self._act,
+            STAND: self._act,
+            DOUBLE_DOWN: self._act,
+            SPLIT: self._act,
+        }
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        """
+        Start to accept connections.
+
+        :param host:
+        :param port: The TCP port, 0 for any free port.
+        :param path: Path of a Unix socket, used instead of host and port.
+        :return: None
+
+        """
+        loop = asyncio.get_running_loop()
+        if path is not None and os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.remove(path)  # Left by a server which wasn't closed
+        if path is None:
+            self._server = await loop.create_server(lambda: _TableProtocol(self), host, port, backlog=BACKLOG)
+        else:
+            self._server = await loop.create_unix_server(lambda: _TableProtocol(self), path, backlog=BACKLOG)
+        logging.info('TableServer: Listening on %s', self.address())
+
+    def address(self):
+        """
+        :return: The (host, port) or the path the server listens on.
+
+        """
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        """
+        Serve until cancelled.
+
+        :return: None
+
+        """
+        await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stop to accept connections.
+
+        :return: None
+
+        """
+        self._server.close()
+        await self._server.wait_closed()
+
+    def _connection_made(self):
+        self.connections += 1
+        return {}
+
+    def _connection_lost(self, own_tables):
+        self.connections -= 1
+        for table_id in own_tables:
+            del self.tables[table_id]
+
+    def handle_line(self, line, own_tables):
+        """
+        Handle one request.
+
+        :param line: The request as a JSON line.
+        :param own_tables: A dict with the tables of the connection by id.
+        :return: The reply as a JSON line.
+
+        """
+        try:
+            request = _decode(line.decode())
+            reply = self._commands[request['cmd']](request, own_tables)
+        except KeyError as error:
+            reply = {'ok': False, 'error': 'Error: missing or unknown ' + str(error)}
+        except (ValueError, TypeError) as error:
+            reply = {'ok': False, 'error': str(error)}
+        return _encode(reply).encode() + b'\n'
+
+    def _open(self, request, own_tables):
+        table = Table(self._next_table_id, request.get('seed'))
+        self._next_table_id += 1
+        self.tables[table.table_id] = table
+        own_tables[table.table_id] = table
+        return table.state()
+
+    def _close(self, request, own_tables):
+        table = own_tables.pop(request['table'])
+        del self.tables[table.table_id]
+        return {'ok': True, 'table': table.table_id}
+
+    @staticmethod
+    def _state(request, own_tables):
+        return own_tables[request['table']].state()
+
+    @staticmethod
+    def _bet(request, own_tables):
+        table = own_tables[request['table']]
+        table.bet(request['amount'])
+        return table.state()
+
+    @staticmethod
+    def _act(request, own_tables):
+        table = own_tables[request['table']]
+        table.act(request['cmd'])
+        return table.state()
+
+
+class _TableProtocol(asyncio.Protocol):
+    """
+    One connection to the :class:`TableServer`. The requests are handled
+    as soon as the data is received, without a task per connection.
+
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.own_tables = None
+        self._buffer = b''
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.own_tables = self.server._connection_made()
+
+    def data_received(self, data):
+        lines = (self._buffer + data).split(b'\n')
+        self._buffer = lines.pop()  # Not a complete line yet
+        if len(self._buffer) > MAX_LINE_LENGTH:
+            logging.info('TableServer: Line too long, close the connection')
+            self.transport.close()
+            return
+        handle_line = self.server.handle_line
+        own_tables = self.own_tables
+        self.transport.write(b''.join([handle_line(line, own_tables) for line in lines]))
+
+    def connection_lost(self, error):
+        self.server._connection_lost(self.own_tables)
+
+
+class TableClient(object):
+    """
+    A client of the :class:`TableServer`, one request at a time.
+
+    """
+
+    def __init__(self, reader, writer):
+        """
+        :param reader: An asyncio.StreamReader.
+        :param writer: An asyncio.StreamWriter.
+        """
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        """
+        :param host:
+        :param port:
+        :param path: Path of a Unix socket, used instead of host and port.
+        :return: A connected :class:`TableClient`.
+
+        """
+        if path is None:
+            reader, writer = await asyncio.open_connection(host, port)
+        else:
+            reader, writer = await asyncio.open_unix_connection(path)
+        return cls(reader, writer)
+
+    async def request(self, cmd, **parameters):
+        """
+        Send a request and wait for the reply.
+
+        :param cmd: The command.
+        :param parameters: The other members of the request, e.g. table.
+        :return: The reply as a dict.
+
+        """
+        parameters['cmd'] = cmd
+        self.writer.write(_encode(parameters).encode() + b'\n')
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError('Error: closed by the server')
+        return _decode(line.decode())
+
+    async def close(self):
+        """
+        :return: None
+
+        """
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def play_table(client, rounds, think_time, rng, latencies, bet=LOWEST_BET):
+    """
+    Open a table and play rounds on it, hitting until 17, with a random
+    pause before each request as a player would make.
+
+    :param client: A connected :class:`TableClient`.
+    :param rounds: Number of rounds to play.
+    :param think_time: The mean pause in seconds before each request.
+    :param rng: A random.Random for the pauses and the seed.
+    :param latencies: A list to add the time of each request to.
+    :param bet: The bet of each round.
+    :return: The net of all rounds.
+
+    """
+    async def timed_request(cmd, **parameters):
+        if think_time:
+            await asyncio.sleep(rng.uniform(0, 2 * think_time))
+        start = time.perf_counter()
+        reply = await client.request(cmd, **parameters)
+        latencies.append(time.perf_counter() - start)
+        if not reply['ok']:
+            raise ValueError(reply['error'])
+        return reply
+
+    state = await timed_request('open', seed=rng.getrandbits(63))
+    table = state['table']
+    net = 0
+    for num in range(0, rounds):
+        state = await timed_request('bet', table=table, amount=bet)
+        while not state['done']:
+            hand = state['player'][state['hand']]
+            # A soft ace is not taken into account, enough for a load test
+            value = sum(min(code % 13 + 1, 10) for code in hand)
+            state = await timed_request(HIT if value < 17 else STAND, table=table)
+        net += state['net']
+    await timed_request('close', table=table)
+    return net
+
+
+async def load_test(connections, rounds, think_time, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, seed=0):
+    """
+    Connect many clients at once, each playing its own table with
+    :func:`play_table`, and measure the time from each request to its
+    reply.
+
+    :param connections: Number of clients.
+    :param rounds: Number of rounds each client plays.
+    :param think_time: The mean pause in seconds before each request.
+    :param host:
+    :param port:
+    :param path: Path of a Unix socket, used instead of host and port.
+    :param seed: Seed of the pauses and the shoes.
+    :return: A sorted list with the time of each request in seconds.
+
+    """
+    clients = await asyncio.gather(*[TableClient.connect(host, port, path) for num in range(0, connections)])
+    latencies = []
+    await asyncio.gather(*[play_table(client, rounds, think_time, random.Random(seed * connections + num), latencies)
+                           for num, client in enumerate(clients)])
+    await asyncio.gather(*[client.close() for client in clients])
+    latencies.sort()
+    return latencies
+
+
+def percentile(sorted_values, part):
+    """
+    :param sorted_values: A sorted list.
+    :param part: 0.0 to 1.0, e.g. 0.99 for the 99th percentile.
+    :return: The value below which the part of the values are.
+
+    """
+    return sorted_values[min(len(sorted_values) - 1, int(part * len(sorted_values)))]
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""
+Replay a round journal, recorded with blackjack.py --journal, with the
+rules engine and verify each round, without any GUI.
+
+Usage:
+python replay.py rounds.journal
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import sys
+import time
+import argparse
+
+# Local imports
+from includes.journal import replay_journal
+
+
+def main():
+    """
+    Parse the command line, replay the journal and print the result.
+
+    :return: None
+
+    """
+    parser = argparse.ArgumentParser(description='Replay and verify a Black Jack round journal.')
+    parser.add_argument('journal', help='the journal file')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = replay_journal(args.journal)
+    elapsed = time.perf_counter() - start
+
+    print('Games: {0}'.format(result.games))
+    print('Rounds: {0}'.format(result.rounds))
+    print('Net: {0}'.format(result.net))
+    if result.rounds:
+        print('Rounds/sec: {0:.0f}'.format(result.rounds / elapsed))
+    for round_number, reason in result.mismatches:
+        print('Round {0}: {1}'.format(round_number, reason))
+    print('Mismatches: {0}'.format(len(result.mismatches)))
+    if result.mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
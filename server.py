@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Run the Black Jack table server, or a load test of it with many clients
+at once, see :mod:`includes.tableserver` for the protocol.
+
+Usage:
+python server.py --port 4711
+python server.py --unix /tmp/blackjack.sock
+python server.py --load-test 1000 --rounds 10
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import time
+import asyncio
+import argparse
+import multiprocessing
+
+# Local imports
+from includes.tableserver import *
+
+
+async def serve(host, port, path, ready=None):
+    """
+    Run the server until cancelled.
+
+    :param host:
+    :param port:
+    :param path: Path of a Unix socket, used instead of host and port.
+    :param ready: Optional multiprocessing.Event set when listening.
+    :return: None
+
+    """
+    server = TableServer()
+    await server.start(host, port, path)
+    if ready is not None:
+        ready.set()
+    await server.serve_forever()
+
+
+def run_server(host, port, path, ready=None):
+    """
+    Run the server in its own event loop, e.g. in a child process.
+
+    """
+    try:
+        asyncio.run(serve(host, port, path, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    """
+    Parse the command line and run the server or the load test.
+
+    :return: None
+
+    """
+    parser = argparse.ArgumentParser(description='Serve Black Jack tables over TCP or a Unix socket.')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='address to listen on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='TCP port to listen on')
+    parser.add_argument('--unix', default=None, help='path of a Unix socket to listen on instead')
+    parser.add_argument('--load-test', type=int, default=None, metavar='CONNECTIONS',
+                        help='start the server in a child process and connect this many clients')
+    parser.add_argument('--rounds', type=int, default=10, help='rounds played by each client in the load test')
+    parser.add_argument('--think', type=float, default=1.0,
+                        help='mean pause in seconds before each request in the load test')
+    args = parser.parse_args()
+
+    if args.load_test is None:
+        run_server(args.host, args.port, args.unix)
+        return
+
+    ready = multiprocessing.Event()
+    server_process = multiprocessing.Process(target=run_server, args=(args.host, args.port, args.unix, ready),
+                                             daemon=True)
+    server_process.start()
+    ready.wait()
+    start = time.perf_counter()
+    latencies = asyncio.run(load_test(args.load_test, args.rounds, args.think, args.host, args.port, args.unix))
+    elapsed = time.perf_counter() - start
+    server_process.terminate()
+    server_process.join()
+
+    print('Connections: {0}'.format(args.load_test))
+    print('Requests: {0}'.format(len(latencies)))
+    print('Requests/sec: {0:.0f}'.format(len(latencies) / elapsed))
+    for name, part in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0)):
+        print('{0}: {1:.3f} ms'.format(name, percentile(latencies, part) * 1000))
+
+
+if __name__ == '__main__':
+    main()
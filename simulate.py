@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""
+Simulate a large number of Black Jack shoes on all cores, without any GUI.
+
+The shoes are split into fixed size chunks which are fanned out to a
+process pool. Each chunk gets its own random generator seeded from the
+master seed and the chunk number, so a run with a given master seed gives
+the identical result whatever the number of workers.
+
+Usage:
+python simulate.py --shoes 10000 --seed 4711
+python simulate.py --shoes 100000 --seed 4711 --vectorized
+
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+
+# Standard imports
+import argparse
+import hashlib
+import multiprocessing
+import random
+import time
+
+# Local imports
+from includes.engine import *
+
+SHOES_PER_CHUNK = 100
+
+
+def derive_seed(master_seed, chunk):
+    """
+    Derive an independent seed for one chunk from the master seed.
+
+    :param master_seed:
+    :param chunk: Index of the chunk.
+    :return: A 64 bit integer seed.
+
+    """
+    digest = hashlib.sha256('{0}:{1}'.format(master_seed, chunk).encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def simulate_chunk(job):
+    """
+    Play all shoes in one chunk with the rules engine, round by round
+    until the "cut" is passed. The player hits until the stand value.
+
+    :param job: A tuple with (master_seed, chunk, num_of_shoes, \
+    num_of_decks, bet, stand_value).
+    :return: A tuple with (rounds, sum of nets, sum of squared nets).
+
+    """
+    master_seed, chunk, num_of_shoes, num_of_decks, bet, stand_value = job
+    rng = random.Random(derive_seed(master_seed, chunk))
+    cut = num_of_decks * 52 * CUT_RATIO
+
+    def decisions(game_round):
+        if game_round.value_of_players_hand() < stand_value:
+            return HIT
+        return STAND
+
+    rounds = 0
+    sum_of_nets = 0
+    sum_of_squares = 0
+    shoe_of_decks = CardDecks(num_of_decks, rng)
+    for num in range(0, num_of_shoes):
+        if num:
+            shoe_of_decks.shuffle()
+        while shoe_of_decks.length() >= cut:
+            net = play_round(shoe_of_decks, bet, decisions).net
+            rounds += 1
+            sum_of_nets += net
+            sum_of_squares += net * net
+    return rounds, sum_of_nets, sum_of_squares
+
+
+def simulate_chunk_vectorized(job):
+    """
+    Same as :func:`simulate_chunk` but with the NumPy simulator.
+
+    """
+    import numpy as np
+    from includes.simulator import make_shoes, simulate_shoes, hit_until
+
+    master_seed, chunk, num_of_shoes, num_of_decks, bet, stand_value = job
+    rng = np.random.default_rng(derive_seed(master_seed, chunk))
+    result = simulate_shoes(make_shoes(num_of_shoes, num_of_decks, rng), hit_until(stand_value), bet)
+    nets = result.round_nets()
+    return result.rounds(), int(nets.sum()), int((nets * nets).sum())
+
+
+def simulate(num_of_shoes, master_seed, workers=None, num_of_decks=NUM_OF_DECKS,
+             bet=LOWEST_BET, stand_value=17, vectorized=False):
+    """
+    Simulate the shoes in chunks on a process pool.
+
+    :param num_of_shoes:
+    :param master_seed:
+    :param workers: Number of worker processes, default all cores.
+    :param num_of_decks:
+    :param bet: The initial bet of each round.
+    :param stand_value: The player hits until this value.
+    :param vectorized: Use the NumPy simulator in each worker.
+    :return: A tuple with (rounds, sum of nets, sum of squared nets).
+
+    """
+    jobs = []
+    for chunk, first_shoe in enumerate(range(0, num_of_shoes, SHOES_PER_CHUNK)):
+        shoes_in_chunk = min(SHOES_PER_CHUNK, num_of_shoes - first_shoe)
+        jobs.append((master_seed, chunk, shoes_in_chunk, num_of_decks, bet, stand_value))
+    function = simulate_chunk_vectorized if vectorized else simulate_chunk
+
+    if workers == 1:
+        results = list(map(function, jobs))
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(function, jobs, chunksize=1)
+
+    rounds = sum(result[0] for result in results)
+    sum_of_nets = sum(result[1] for result in results)
+    sum_of_squares = sum(result[2] for result in results)
+    return rounds, sum_of_nets, sum_of_squares
+
+
+def positive_int(text):
+    """
+    The type of --shoes, at least one shoe has to be played.
+
+    :param text: The number on the command line.
+    :return: The number as an integer.
+
+    """
+    number = int(text)
+    if number < 1:
+        raise argparse.ArgumentTypeError('has to be at least 1: ' + text)
+    return number
+
+
+def main():
+    """
+    Parse the command line, run the simulation and print the result.
+
+    :return: None
+
+    """
+    parser = argparse.ArgumentParser(description='Simulate Black Jack shoes on all cores.')
+    parser.add_argument('--shoes', type=positive_int, default=1000, help='number of shoes to play')
+    parser.add_argument('--seed', type=int, default=0, help='master seed')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, default all cores')
+    parser.add_argument('--decks', type=int, default=NUM_OF_DECKS, help='number of decks in each shoe')
+    parser.add_argument('--bet', type=int, default=LOWEST_BET, help='initial bet of each round')
+    parser.add_argument('--stand', type=int, default=17, help='player hits until this value')
+    parser.add_argument('--vectorized', action='store_true', help='use the NumPy simulator')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rounds, sum_of_nets, sum_of_squares = simulate(args.shoes, args.seed, args.workers, args.decks,
+                                                   args.bet, args.stand, args.vectorized)
+    elapsed = time.perf_counter() - start
+
+    mean = sum_of_nets / rounds
+    variance = sum_of_squares / rounds - mean * mean
+    print('Rounds: {0}'.format(rounds))
+    print('House edge: {0:.4%}'.format(-mean / args.bet))
+    print('Variance per round: {0:.4f} (bets squared)'.format(variance / args.bet ** 2))
+    print('Rounds/sec: {0:.0f}'.format(rounds / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -73,6 +73,26 @@ class UnitTests(unittest.TestCase):
         card = PlayingCard(1, 0)
         self.assertTrue(card.get_suit() == 0)        
             
+    def test_card_is_shared(self):
+        # Assert if the same rank and suit doesn't give the same instance
+        from playingcard import PlayingCard
+        self.assertIs(PlayingCard(12, 3), PlayingCard(12, 3))
+
+    def test_card_is_immutable(self):
+        # Raises AttributeError if a card attribute can be changed
+        from playingcard import PlayingCard
+        card = PlayingCard(1, 0)
+        with self.assertRaises(AttributeError):
+            card.rank = 2
+
+    def test_card_code_and_value(self):
+        # Assert if the cards in CARDS doesn't match their code and value
+        from playingcard import CARDS
+        self.assertEqual(len(CARDS), 52)
+        for code, card in enumerate(CARDS):
+            self.assertEqual(card.code, code)
+            self.assertEqual(card.value, min(card.get_rank(), 10))
+
     def test_size_of_new_carddeck(self):
         # Asserts if the default size of newly created card deck is not 52 cards
         from carddecks import CardDecks
@@ -92,6 +112,96 @@ class UnitTests(unittest.TestCase):
         deck.pop()
         self.assertTrue(deck.length() == 51)
 
+    def test_carddeck_peek(self):
+        # Asserts if peek doesn't return the next cards without removing them
+        from carddecks import CardDecks
+        deck = CardDecks()
+        cards = deck.peek(3)
+        self.assertEqual(deck.length(), 52)
+        self.assertEqual([deck.pop(), deck.pop(), deck.pop()], cards)
+
+    def test_carddeck_shuffle_in_place(self):
+        # Asserts if shuffle doesn't put back all dealt cards
+        from carddecks import CardDecks
+        decks = CardDecks(2)
+        for num in range(0, 52):
+            decks.pop()
+        self.assertEqual(decks.remaining(), 52)
+        self.assertEqual(decks.penetration(), 0.5)
+        decks.shuffle()
+        self.assertEqual(decks.remaining(), 104)
+        self.assertEqual(decks.penetration(), 0.0)
+        codes = sorted(decks.pop().code for num in range(0, 104))
+        self.assertEqual(codes, sorted(list(range(0, 52)) * 2))
+
+    def test_carddeck_counting(self):
+        # Asserts if the running count, true count or composition doesn't follow the dealt cards
+        from carddecks import CardDecks, HI_LO, KO, OMEGA_II
+        for counting_system in (HI_LO, KO, OMEGA_II):
+            decks = CardDecks(2, counting_system=counting_system)
+            dealt = [decks.pop() for num in range(0, 52)]
+            running_count = sum(counting_system[card.rank - 1] for card in dealt)
+            self.assertEqual(decks.running_count(), running_count)
+            self.assertEqual(decks.true_count(), running_count)  # One deck left
+            composition = decks.composition()
+            for rank in range(1, 14):
+                dealt_of_rank = len([card for card in dealt if card.rank == rank])
+                self.assertEqual(composition[rank - 1], 8 - dealt_of_rank)
+            decks.shuffle()
+            self.assertEqual(decks.running_count(), 0)
+            self.assertEqual(decks.composition(), [8] * 13)
+        decks = CardDecks(1, counting_system=HI_LO)
+        for num in range(0, 52):
+            decks.pop()
+        self.assertEqual(decks.running_count(), 0)  # Hi-Lo is balanced
+
+    def test_carddeck_seed(self):
+        # Asserts if two shoes with the same seed are not in the same order
+        from carddecks import CardDecks
+        decks = CardDecks(2, 4711)
+        self.assertEqual(decks.peek(104), CardDecks(2, 4711).peek(104))
+        self.assertNotEqual(decks.peek(104), CardDecks(2, 4712).peek(104))
+
+    def test_carddeck_snapshot(self):
+        # Asserts if a restored shoe doesn't deal, count and shuffle as the shoe did after the snapshot
+        import random
+        from carddecks import CardDecks
+        rng = random.Random(4711)
+        decks = CardDecks(6, rng)
+        for num in range(0, 100):
+            decks.pop()
+        snapshot = decks.snapshot()
+        restored_rng = random.Random()
+        restored_rng.setstate(rng.getstate())
+        self.assertEqual(len(snapshot), 3 + 6 * 52)
+        dealt = [decks.pop() for num in range(0, 50)]
+        running_count = decks.running_count()
+        composition = decks.composition()
+
+        restored = CardDecks(1, restored_rng, snapshot=snapshot)
+        self.assertEqual(restored.remaining(), 6 * 52 - 100)
+        self.assertEqual([restored.pop() for num in range(0, 50)], dealt)
+        self.assertEqual(restored.running_count(), running_count)
+        self.assertEqual(restored.composition(), composition)
+        decks.restore(snapshot)
+        self.assertEqual(decks.snapshot(), snapshot)
+        decks.shuffle()
+        restored.shuffle()
+        self.assertEqual(restored.snapshot(), decks.snapshot())
+        self.assertEqual(restored.composition(), [24] * 13)
+
+        for invalid in (b'', b'\x02\x00\x00', b'\x01\x02\x00\x00', b'\x01\x00\x00\x34'):
+            with self.assertRaises(ValueError):
+                decks.restore(invalid)
+
+    def test_testing_card_deck(self):
+        # Asserts if the testing deck doesn't start with the split scenario
+        from carddecks import TestingCardDeck
+        from playingcard import PlayingCard
+        deck = TestingCardDeck()
+        self.assertEqual(deck.length(), 75)
+        self.assertEqual(deck.peek(4), [PlayingCard(8, 0), PlayingCard(4, 1), PlayingCard(8, 1), PlayingCard(6, 2)])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import tempfile
+import sys
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from common import CardAtlas, ImageDB, BlackJackCardFormatter, IMAGE_PATH_CARDS, CARDBACK_FILENAME
+from cardatlas import CARDBACK_CODE, CARD_ATLAS_INDEX_FILENAME, load_card_atlas_index
+from playingcard import CARDS
+
+CARDS_PATH = os.path.join(MAIN_DIR, IMAGE_PATH_CARDS)
+
+
+class CardAtlasTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = tempfile.TemporaryDirectory()
+        pygame.display.init()
+        ImageDB.instance = None
+
+    def tearDown(self):
+        pygame.display.quit()
+        ImageDB.instance = None
+        self.cache.cleanup()
+
+    def assertSamePixels(self, image, filename):
+        expected = pygame.image.load(filename)
+        self.assertEqual(image.get_size(), expected.get_size())
+        self.assertEqual(pygame.image.tostring(image, 'RGBA'), pygame.image.tostring(expected, 'RGBA'), filename)
+
+    def test_cards_by_code(self):
+        """
+        Each card in the atlas is the same as the image of the card.
+
+        :return: None
+
+        """
+        atlas = CardAtlas(CARDS_PATH, self.cache.name)
+        cards = atlas.get_cards()
+        self.assertEqual(len(cards), CARDBACK_CODE + 1)
+        formatter = BlackJackCardFormatter(CARDS_PATH)
+        for card in CARDS:
+            self.assertSamePixels(cards[card.code], formatter.get_string(card))
+        self.assertSamePixels(cards[CARDBACK_CODE], os.path.join(CARDS_PATH, CARDBACK_FILENAME))
+
+    def test_converted_with_the_display(self):
+        """
+        The cards are taken again from the atlas when it's converted to
+        the pixel format of the display.
+
+        :return: None
+
+        """
+        atlas = CardAtlas(CARDS_PATH, self.cache.name)
+        cards = atlas.get_cards()
+        self.assertIs(atlas.get_cards(), cards)
+        pygame.display.set_mode((200, 150))
+        converted_cards = atlas.get_cards()
+        self.assertIsNot(converted_cards, cards)
+        self.assertIs(converted_cards[0].get_parent(), ImageDB.get_instance().get_image(atlas.filename))
+
+    def test_card_variant(self):
+        """
+        A rotated card is the card rotated, computed once.
+
+        :return: None
+
+        """
+        atlas = CardAtlas(CARDS_PATH, self.cache.name)
+        card = atlas.get_cards()[CARDS[10].code]
+        rotated = atlas.get_card_variant(CARDS[10].code, rotation=90)
+        self.assertIs(atlas.get_card_variant(CARDS[10].code, rotation=90), rotated)
+        self.assertEqual(rotated.get_size(), (card.get_height(), card.get_width()))
+        self.assertEqual(pygame.image.tostring(rotated, 'RGBA'),
+                         pygame.image.tostring(pygame.transform.rotate(card, 90), 'RGBA'))
+
+    def test_index_is_reused(self):
+        """
+        The atlas is only built when missing or older than the images.
+
+        :return: None
+
+        """
+        rects = load_card_atlas_index(CARDS_PATH, self.cache.name)
+        index = os.path.join(self.cache.name, CARD_ATLAS_INDEX_FILENAME)
+        built = os.stat(index).st_mtime_ns
+        self.assertEqual(load_card_atlas_index(CARDS_PATH, self.cache.name), rects)
+        self.assertEqual(os.stat(index).st_mtime_ns, built)
+
+
+if __name__ == "__main__":
+    unittest.main()
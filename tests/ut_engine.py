@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import sys
+import os
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from engine import Round, play_round, dealer_must_hit, get_value_of_players_hand, get_value_of_dealers_hand
+from playingcard import PlayingCard
+from carddecks import CardDecks
+
+
+class FixedShoe(object):
+    """
+    A shoe dealing the given ranks in the given order.
+
+    """
+    def __init__(self, ranks):
+        self.cards = [PlayingCard(rank, 0) for rank in reversed(ranks)]
+
+    def pop(self):
+        return self.cards.pop()
+
+
+class Engine(unittest.TestCase):
+
+    def test_blackjack(self):
+        """
+        Player gets ace and king, dealer 10 and 7. Pays 3/2.
+
+        :return: None
+
+        """
+        result = play_round(FixedShoe([1, 10, 13, 7]), 10, [])
+        self.assertEqual(result.outcomes, ['blackjack'])
+        self.assertEqual(result.payout, 25)
+        self.assertEqual(result.net, 15)
+
+    def test_blackjack_push(self):
+        """
+        Both player and dealer gets a Black Jack, a push.
+
+        :return: None
+
+        """
+        result = play_round(FixedShoe([1, 1, 12, 11]), 10, [])
+        self.assertEqual(result.outcomes, ['push'])
+        self.assertEqual(result.net, 0)
+
+    def test_dealer_hits_16_below_player(self):
+        """
+        Player stands on 17, dealer has 16 and has to hit.
+
+        :return: None
+
+        """
+        result = play_round(FixedShoe([10, 10, 7, 6, 5]), 10, ['stand'])
+        self.assertEqual(len(result.dealer_cards), 3)
+        self.assertEqual(result.value_of_dealers_hand, 21)
+        self.assertEqual(result.outcomes, ['loose'])
+        self.assertEqual(result.net, -10)
+
+    def test_dealer_stands_16_above_player(self):
+        """
+        Player stands on 15, dealer stands on 16 and wins.
+
+        :return: None
+
+        """
+        result = play_round(FixedShoe([10, 10, 5, 6, 5]), 10, ['stand'])
+        self.assertEqual(len(result.dealer_cards), 2)
+        self.assertEqual(result.outcomes, ['loose'])
+
+    def test_player_busted(self):
+        """
+        Player hits and gets busted, the dealer never draws.
+
+        :return: None
+
+        """
+        result = play_round(FixedShoe([10, 10, 6, 6, 9, 5]), 10, ['hit'])
+        self.assertEqual(result.outcomes, ['busted'])
+        self.assertEqual(len(result.dealer_cards), 2)
+        self.assertEqual(result.net, -10)
+
+    def test_double_down(self):
+        """
+        Player doubles on 11 and gets 21 against dealer 18.
+
+        :return: None
+
+        """
+        result = play_round(FixedShoe([5, 10, 6, 8, 10]), 10, ['double_down'], player_cash=100)
+        self.assertEqual(result.double_downs[0], True)
+        self.assertEqual(result.hand_bets, [20])
+        self.assertEqual(result.outcomes, ['win'])
+        self.assertEqual(result.net, 20)
+
+    def test_double_down_not_allowed_without_cash(self):
+        """
+        Double down and split are not allowed without enough cash.
+
+        :return: None
+
+        """
+        game_round = Round(FixedShoe([8, 10, 8, 8]), 10, player_cash=5)
+        self.assertEqual(game_round.options(), ['hit', 'stand'])
+        with self.assertRaises(ValueError):
+            game_round.act('double_down')
+
+    def test_split(self):
+        """
+        Split two eights, first hand stands on 18, second hand busted.
+
+        :return: None
+
+        """
+        result = play_round(FixedShoe([8, 10, 8, 7, 10, 4, 10]),
+                            10, ['split', 'stand', 'hit'], player_cash=100)
+        self.assertEqual([len(hand) for hand in result.player_hands], [2, 3])
+        self.assertEqual(result.outcomes, ['win', 'busted'])
+        self.assertEqual(result.net, 0)
+
+    def test_double_blackjack(self):
+        """
+        Split two aces and get a Black Jack in both hands.
+
+        :return: None
+
+        """
+        result = play_round(FixedShoe([1, 10, 1, 9, 10, 13]), 10, ['split'], player_cash=100)
+        self.assertEqual(result.outcomes, ['blackjack', 'blackjack'])
+        self.assertEqual(result.payout, 50)
+
+    def test_dealer_must_hit(self):
+        """
+        The rules of 16 & 17.
+
+        :return: None
+
+        """
+        self.assertTrue(dealer_must_hit(15, 12))
+        self.assertTrue(dealer_must_hit(16, 17))
+        self.assertFalse(dealer_must_hit(16, 16))
+        self.assertFalse(dealer_must_hit(17, 20))
+
+    def test_values_match_rule_functions(self):
+        """
+        Play a full shoe and compare the engine hand values with the rule
+        functions used by the GUI.
+
+        :return: None
+
+        """
+        shoe = CardDecks(4)
+        while shoe.length() > 40:
+            result = play_round(shoe, 10, lambda game_round: 'hit'
+                                if game_round.value_of_players_hand() < 17 else 'stand')
+            self.assertEqual(result.value_of_dealers_hand, get_value_of_dealers_hand(list(result.dealer_cards)))
+            self.assertEqual(result.values_of_players_hands,
+                             [get_value_of_players_hand(list(hand)) for hand in result.player_hands])
+
+    def test_what_if(self):
+        """
+        Restore the shoe from a snapshot to play the same round again with
+        another decision.
+
+        :return: None
+
+        """
+        shoe = CardDecks(4, 4711)
+        snapshot = shoe.snapshot()
+        stand = play_round(shoe, 10, ['stand'])
+        shoe.restore(snapshot)
+        hit = Round(shoe, 10)
+        self.assertEqual(list(hit.player_hands[0]), list(stand.player_hands[0]))
+        self.assertEqual(list(hit.dealer_cards), list(stand.dealer_cards[:2]))
+        next_card = shoe.peek()[0]
+        hit.act('hit')
+        self.assertEqual(hit.player_hands[0][2], next_card)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import collections
+import sys
+import os
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from engine import get_value_of_players_hand, get_value_of_dealers_hand
+from hand import Hand, DealersHand, PLAYERS_VALUE_TABLE, DEALERS_VALUE_TABLE, value_table_index
+from playingcard import PlayingCard
+from carddecks import CardDecks
+
+
+class Hands(unittest.TestCase):
+
+    def test_value_follows_rule_functions(self):
+        """
+        Add the cards of a shoe one by one, six cards to each hand, and
+        compare the value after each card with the rule functions.
+
+        :return: None
+
+        """
+        shoe = CardDecks(4)
+        while shoe.length() >= 6:
+            hand = Hand()
+            dealers_hand = DealersHand()
+            cards = []
+            for num in range(0, 6):
+                card = shoe.pop()
+                cards.append(card)
+                hand.append(card)
+                dealers_hand.append(card)
+                self.assertEqual(hand.value, get_value_of_players_hand(cards))
+                self.assertEqual(dealers_hand.value, get_value_of_dealers_hand(cards))
+                self.assertEqual(hand.is_busted, hand.value > 21)
+                self.assertEqual(len(hand), len(cards))
+
+    def test_flags(self):
+        """
+        Check the pair and Black Jack flags.
+
+        :return: None
+
+        """
+        hand = Hand([PlayingCard(1, 0), PlayingCard(13, 2)])
+        self.assertTrue(hand.is_blackjack)
+        self.assertFalse(hand.is_pair)
+        self.assertEqual(hand.soft, 1)
+        hand.append(PlayingCard(5, 1))
+        self.assertFalse(hand.is_blackjack)
+        self.assertEqual(hand.value, 16)
+        self.assertEqual(hand.soft, 0)
+        hand = Hand([PlayingCard(8, 0), PlayingCard(8, 3)])
+        self.assertTrue(hand.is_pair)
+
+    def test_pop_for_split(self):
+        """
+        Pop the second card of a pair, the value should be recalculated.
+
+        :return: None
+
+        """
+        hand = Hand([PlayingCard(1, 0), PlayingCard(1, 1)])
+        self.assertEqual(hand.value, 12)
+        card = hand.pop()
+        self.assertIs(card, PlayingCard(1, 1))
+        self.assertEqual(hand.value, 11)
+        self.assertEqual(len(hand), 1)
+        self.assertFalse(hand.is_pair)
+
+    def _check_value_table(self, table, hand_class, value_of_hand):
+        """
+        Go through every hand of up to 11 cards, which is the most cards
+        a hand can have without being busted, and compare each entry in
+        the table with the rule function. Hands ending in the same table
+        entry are continued the same way, so each entry is continued from
+        the first (shortest) hand which reaches it.
+
+        :return: None
+
+        """
+        queue = collections.deque([[]])
+        continued = set()
+        while queue:
+            cards = queue.popleft()
+            hand = hand_class(cards)
+            if (hand.value, hand.soft) in continued:
+                continue
+            continued.add((hand.value, hand.soft))
+            for rank in range(1, 14):
+                new_cards = cards + [PlayingCard(rank, 0)]
+                value = value_of_hand(new_cards)
+                new_value, new_flag, busted = table[value_table_index(hand.value, hand.soft, rank)]
+                self.assertEqual(new_value, value, new_cards)
+                self.assertEqual(busted, value > 21, new_cards)
+                if hand_class is Hand:
+                    hard_value = sum(card.value for card in new_cards)
+                    self.assertEqual(new_flag, int(value != hard_value), new_cards)
+                if not busted and len(new_cards) < 11:
+                    queue.append(new_cards)
+
+    def test_players_value_table(self):
+        self._check_value_table(PLAYERS_VALUE_TABLE, Hand, get_value_of_players_hand)
+
+    def test_dealers_value_table(self):
+        self._check_value_table(DEALERS_VALUE_TABLE, DealersHand, get_value_of_dealers_hand)
+
+
+if __name__ == "__main__":
+    unittest.main()
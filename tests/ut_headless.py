@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import random
+import sys
+import os
+import pygame
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, MAIN_DIR)
+import blackjack
+from includes.playingcard import PlayingCard
+from includes.strategy import load_strategy
+from blackjack import BlackJack, ScriptedDriver, StrategyDriver, PLAY
+
+
+class FixedShoe(object):
+    """
+    A shoe dealing the given ranks in the given order, followed by enough
+    twos to never pass the "cut".
+
+    """
+    def __init__(self, ranks):
+        self.cards = [PlayingCard(rank, 0) for rank in [2] * 60 + list(reversed(ranks))]
+
+    def pop(self):
+        return self.cards.pop()
+
+    def length(self):
+        return len(self.cards)
+
+
+class HitUntil17(object):
+
+    def action(self, hand, up_card, options):
+        return blackjack.HIT if hand.value < 17 else blackjack.STAND
+
+
+class Headless(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        os.chdir(MAIN_DIR)  # The image paths are relative to the project root
+        blackjack.CommonVariables.instance = None
+        blackjack.ImageDB.instance = None
+
+    def tearDown(self):
+        pygame.display.quit()
+        os.chdir(self.cwd)
+
+    def test_strategy_driver(self):
+        """
+        The rounds are played to the end without a screen, and the same
+        seed gives the same game.
+
+        :return: None
+
+        """
+        credits = []
+        for run in range(0, 2):
+            random.seed(4711)
+            game = BlackJack(headless=True, driver=StrategyDriver(HitUntil17(), bet=50), rounds=200)
+            game.common_vars.shoe_of_decks = None
+            self.assertEqual(game.run(), 200)
+            self.assertIsNone(game.common_vars.screen)
+            self.assertFalse(game.scheduler.paused)
+            credits.append(game.common_vars.player_cash)
+        self.assertEqual(credits[0], credits[1])
+        self.assertNotEqual(credits[0], blackjack.DEFAULT_PLAYER_BALANCE)
+
+    def test_scripted_driver(self):
+        """
+        A scripted round gives the same result as in the rules engine, and
+        the game ends with the script.
+
+        :return: None
+
+        """
+        game = BlackJack(headless=True, driver=ScriptedDriver(['5', 50, blackjack.UNDO_BET, PLAY, blackjack.STAND]))
+        game.common_vars.shoe_of_decks = blackjack.CardDecks(blackjack.NUM_OF_DECKS, random.Random(42))
+        expected = blackjack.play_round(blackjack.CardDecks(blackjack.NUM_OF_DECKS, random.Random(42)), 5,
+                                        [blackjack.STAND])
+        self.assertEqual(game.run(), 1)
+        self.assertTrue(game.common_vars.done)
+        self.assertEqual(game.common_vars.player_cash, blackjack.DEFAULT_PLAYER_BALANCE + expected.net)
+
+    def test_bet_of_previous_game(self):
+        """
+        The chips bet in one game are not bet again in the next game.
+
+        :return: None
+
+        """
+        expected = blackjack.play_round(blackjack.CardDecks(blackjack.NUM_OF_DECKS, random.Random(0)), 10,
+                                        [blackjack.STAND])
+        for run in range(0, 2):
+            blackjack.CommonVariables.instance = None
+            game = BlackJack(headless=True, driver=ScriptedDriver(['10', PLAY, blackjack.STAND]))
+            game.common_vars.shoe_of_decks = blackjack.CardDecks(blackjack.NUM_OF_DECKS, random.Random(0))
+            self.assertEqual(game.run(), 1)
+            self.assertEqual(game.common_vars.player_cash, blackjack.DEFAULT_PLAYER_BALANCE + expected.net)
+
+    def test_same_credits_as_rules_engine(self):
+        """
+        The game and the rules engine played by the same strategy on the
+        same shoe, shuffled between the rounds when the cut is passed,
+        end with the same credits.
+
+        :return: None
+
+        """
+        strategy = load_strategy(blackjack.NUM_OF_DECKS)
+        game = BlackJack(headless=True, driver=StrategyDriver(strategy, bet=10), rounds=1000)
+        game.common_vars.shoe_of_decks = blackjack.CardDecks(blackjack.NUM_OF_DECKS, 4711)
+        self.assertEqual(game.run(), 1000)
+
+        shoe_of_decks = blackjack.CardDecks(blackjack.NUM_OF_DECKS, 4711)
+        net = 0
+        for num in range(0, 1000):
+            if blackjack.is_cut_passed(shoe_of_decks):
+                shoe_of_decks.shuffle()
+            net += blackjack.play_round(shoe_of_decks, 10, strategy.decisions).net
+        self.assertEqual(game.common_vars.player_cash, blackjack.DEFAULT_PLAYER_BALANCE + net)
+
+    def test_abstract_driver(self):
+        """
+        A driver without bet() and decide() can't be created.
+
+        :return: None
+
+        """
+        class BetOnly(blackjack.Driver):
+            def bet(self, state, common_vars):
+                return PLAY
+
+        with self.assertRaises(TypeError):
+            blackjack.Driver()
+        with self.assertRaises(TypeError):
+            BetOnly()
+
+    def play_script(self, ranks, actions):
+        """
+        Play one round from a fixed shoe.
+
+        :param ranks: The ranks of the cards, in dealt order.
+        :param actions: The script of the round.
+        :return: The game, after the round.
+
+        """
+        game = BlackJack(headless=True, driver=ScriptedDriver(actions))
+        game.common_vars.shoe_of_decks = FixedShoe(ranks)
+        self.assertEqual(game.run(), 1)
+        return game
+
+    def test_push_before_doubled_hand(self):
+        """
+        Split eights, stand on 18 and double down the second hand to 17,
+        the dealer has 18. The first hand is a push and the doubled
+        second hand is lost.
+
+        :return: None
+
+        """
+        game = self.play_script([8, 10, 8, 8, 10, 3, 6],
+                                [5, PLAY, blackjack.SPLIT, blackjack.STAND, blackjack.DOUBLE_DOWN])
+        self.assertEqual(game.common_vars.player_cash, blackjack.DEFAULT_PLAYER_BALANCE - 10)
+
+    def test_busted_hand_against_dealer_21(self):
+        """
+        Double down on 16 and bust, the dealer has 21. The doubled bet is
+        lost.
+
+        :return: None
+
+        """
+        game = self.play_script([10, 1, 6, 13, 10], [5, PLAY, blackjack.DOUBLE_DOWN])
+        self.assertEqual(game.common_vars.player_cash, blackjack.DEFAULT_PLAYER_BALANCE - 10)
+
+    def test_dealer_against_busted_hand(self):
+        """
+        Split eights, stand on 16 and bust the second hand, the dealer has
+        16. The first hand is a push and the dealer does not draw against
+        the busted second hand.
+
+        :return: None
+
+        """
+        game = self.play_script([8, 10, 8, 6, 8, 5, 10],
+                                [5, PLAY, blackjack.SPLIT, blackjack.STAND, blackjack.HIT])
+        self.assertEqual(game.common_vars.shoe_of_decks.length(), 60)
+        self.assertEqual(game.common_vars.player_cash, blackjack.DEFAULT_PLAYER_BALANCE - 5)
+
+    def test_strategy_driver_doubles_down(self):
+        """
+        The basic strategy doubles down a hard 10 and 11 against a low up
+        card of the dealer, and wins the doubled bet.
+
+        :return: None
+
+        """
+        for ranks in ([6, 10, 5, 6, 10], [6, 10, 4, 5, 10]):
+            blackjack.CommonVariables.instance = None
+            game = BlackJack(headless=True, driver=StrategyDriver(load_strategy(blackjack.NUM_OF_DECKS), bet=10),
+                             rounds=1)
+            game.common_vars.shoe_of_decks = FixedShoe(ranks)
+            self.assertEqual(game.run(), 1)
+            self.assertEqual(game.common_vars.player_cash, blackjack.DEFAULT_PLAYER_BALANCE + 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
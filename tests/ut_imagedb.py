@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import sys
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from common import ImageDB, IMAGE_PATH, IMAGE_PATH_CHIPS, GAME_BOARD_SIZE, GAME_BOARD_COLOR, VARIANT_CACHE_SIZE
+
+CHIP = os.path.join(MAIN_DIR, IMAGE_PATH_CHIPS, 'chip_5_w85h85.png')
+BOX = os.path.join(MAIN_DIR, IMAGE_PATH, 'yellow_box_179_120.png')
+
+
+class ImageDb(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        os.chdir(MAIN_DIR)  # The table background use paths relative to the project root
+        pygame.display.init()
+        self.image_db = ImageDB()
+
+    def tearDown(self):
+        pygame.display.quit()
+        os.chdir(self.cwd)
+
+    def test_convert_when_display_exists(self):
+        """
+        Images loaded before the display exists are converted to the
+        pixel format of the display when they are asked for again.
+
+        :return: None
+
+        """
+        chip = self.image_db.get_image(CHIP)
+        self.assertIn(CHIP, self.image_db.unconverted)
+        display = pygame.display.set_mode((200, 150))
+        converted_chip = self.image_db.get_image(CHIP)
+        self.assertIsNot(converted_chip, chip)
+        self.assertTrue(converted_chip.get_flags() & pygame.SRCALPHA)
+        self.assertIs(self.image_db.get_image(CHIP), converted_chip)
+        self.assertEqual(self.image_db.unconverted, set())
+        box = self.image_db.get_image(BOX)
+        self.assertEqual(box.get_bitsize(), display.get_bitsize())
+
+    def test_table_background(self):
+        """
+        The table background is drawn once.
+
+        :return: None
+
+        """
+        pygame.display.set_mode((200, 150))
+        background = self.image_db.get_table_background()
+        self.assertEqual(background.get_size(), GAME_BOARD_SIZE)
+        self.assertEqual(tuple(background.get_at((0, 0)))[:3], GAME_BOARD_COLOR)
+        self.assertIs(self.image_db.get_table_background(), background)
+
+    def test_variants(self):
+        """
+        A variant is computed once, and again when the image is converted.
+
+        :return: None
+
+        """
+        chip = self.image_db.get_image(CHIP)
+        rotated = self.image_db.get_variant(CHIP, rotation=90)
+        self.assertIs(self.image_db.get_variant(CHIP, rotation=90), rotated)
+        expected = pygame.transform.rotate(chip, 90)
+        self.assertEqual(pygame.image.tostring(rotated, 'RGBA'), pygame.image.tostring(expected, 'RGBA'))
+
+        part = self.image_db.get_variant(CHIP, area=(10, 20, 30, 40), size=(15, 20), alpha=128)
+        self.assertEqual(part.get_size(), (15, 20))
+        self.assertEqual(part.get_alpha(), 128)
+        self.assertNotEqual(chip.get_alpha(), 128)  # The image itself isn't faded
+
+        pygame.display.set_mode((200, 150))
+        converted = self.image_db.get_variant(CHIP, rotation=90)
+        self.assertIsNot(converted, rotated)
+        self.assertIs(self.image_db.get_variant(CHIP, rotation=90), converted)
+
+    def test_variant_cache_size(self):
+        """
+        Only the last VARIANT_CACHE_SIZE variants used are kept, and the
+        cache can be emptied.
+
+        :return: None
+
+        """
+        first = self.image_db.get_variant(CHIP, rotation=1)
+        for rotation in range(2, VARIANT_CACHE_SIZE + 1):
+            self.image_db.get_variant(CHIP, rotation=rotation)
+        self.assertIs(self.image_db.get_variant(CHIP, rotation=1), first)
+        self.image_db.get_variant(CHIP, rotation=VARIANT_CACHE_SIZE + 1)
+        self.assertEqual(len(self.image_db.variants), VARIANT_CACHE_SIZE)
+        self.assertIs(self.image_db.get_variant(CHIP, rotation=1), first)
+        self.assertNotIn((CHIP, None, 2, None, None), self.image_db.variants)
+        self.image_db.variant_cache_clear()
+        self.assertEqual(len(self.image_db.variants), 0)
+        self.assertIsNot(self.image_db.get_variant(CHIP, rotation=1), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import argparse
+import tempfile
+import random
+import sys
+import os
+import pygame
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, MAIN_DIR)
+import blackjack
+from blackjack import BlackJack, StrategyDriver
+from includes.journal import *
+
+
+class SplitAndDouble(object):
+    """
+    Split all pairs and double down on 10 and 11, to get all actions in
+    the journal.
+
+    """
+
+    def action(self, hand, up_card, options):
+        if blackjack.SPLIT in options:
+            return blackjack.SPLIT
+        if blackjack.DOUBLE_DOWN in options and hand.value in (10, 11):
+            return blackjack.DOUBLE_DOWN
+        return blackjack.HIT if hand.value < 17 else blackjack.STAND
+
+
+class Journal(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        os.chdir(MAIN_DIR)  # The image paths are relative to the project root
+        self.filename = tempfile.mktemp(suffix='.journal')
+
+    def tearDown(self):
+        pygame.display.quit()
+        os.chdir(self.cwd)
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def test_pack_bits(self):
+        """
+        All values are unpacked as packed, in as few bytes as possible.
+
+        :return: None
+
+        """
+        rng = random.Random(4711)
+        for bits in (CARD_BITS, ACTION_BITS):
+            for count in (0, 1, 3, 4, 17):
+                values = [rng.randrange(0, 1 << bits) for num in range(0, count)]
+                packed = pack_bits(values, bits)
+                self.assertEqual(len(packed), (count * bits + 7) // 8)
+                self.assertEqual(unpack_bits(packed, count, bits), values)
+
+    def test_write_and_read(self):
+        """
+        The records are read as written, also after the journal is opened
+        again to append to it, and a file which isn't a journal is refused.
+
+        :return: None
+
+        """
+        journal = RoundJournal(self.filename)
+        journal.write_shoe(2 ** 63 - 1, 1000)
+        journal.write_round(10, -10, 990, [0, 51, 12, 40], [blackjack.STAND])
+        journal.close()
+        journal = RoundJournal(self.filename)
+        journal.write_round(10, 20, 1010, [1, 2, 3, 4, 5, 6], [blackjack.SPLIT, blackjack.DOUBLE_DOWN,
+                                                               blackjack.HIT, blackjack.STAND])
+        journal.close()
+        self.assertEqual(journal.rounds, 1)
+        self.assertEqual(list(read_journal(self.filename)), [
+            (SHOE_RECORD, 2 ** 63 - 1, 1000),
+            (ROUND_RECORD, 10, -10, 990, [0, 51, 12, 40], [blackjack.STAND]),
+            (ROUND_RECORD, 10, 20, 1010, [1, 2, 3, 4, 5, 6], [blackjack.SPLIT, blackjack.DOUBLE_DOWN,
+                                                              blackjack.HIT, blackjack.STAND])])
+
+        with open(self.filename, 'wb') as journal_file:
+            journal_file.write(b'Not a journal')
+        with self.assertRaises(ValueError):
+            RoundJournal(self.filename)
+        with self.assertRaises(ValueError):
+            list(read_journal(self.filename))
+
+    def test_seed(self):
+        """
+        Only a seed which fits in the shoe record is taken by --seed and
+        written to the journal.
+
+        :return: None
+
+        """
+        self.assertEqual(blackjack.shoe_seed('0'), 0)
+        self.assertEqual(blackjack.shoe_seed(str(MAX_SEED)), MAX_SEED)
+        for text in ('-1', str(MAX_SEED + 1), 'seed'):
+            with self.assertRaises((argparse.ArgumentTypeError, ValueError)):
+                blackjack.shoe_seed(text)
+        journal = RoundJournal(self.filename)
+        with self.assertRaises(ValueError):
+            journal.write_shoe(-1, 1000)
+        journal.write_shoe(MAX_SEED, 1000)
+        journal.close()
+        self.assertEqual(list(read_journal(self.filename)), [(SHOE_RECORD, MAX_SEED, 1000)])
+
+    def test_replay_headless_game(self):
+        """
+        All rounds of a headless game are recorded and replayed by the
+        rules engine without any mismatch, and a changed win or loss is
+        found.
+
+        :return: None
+
+        """
+        blackjack.CommonVariables.instance = None
+        blackjack.ImageDB.instance = None
+        game = BlackJack(headless=True, driver=StrategyDriver(SplitAndDouble(), bet=20), rounds=500,
+                         seed=4711, journal=self.filename)
+        rounds = game.run()
+        result = replay_journal(self.filename)
+        self.assertEqual(result.games, 1)
+        self.assertEqual(result.rounds, rounds)
+        self.assertEqual(result.net, game.common_vars.player_cash - blackjack.DEFAULT_PLAYER_BALANCE)
+        self.assertEqual(result.mismatches, [])
+
+        records = list(read_journal(self.filename))
+        actions = [action for record in records[1:] for action in record[5]]
+        for action in (blackjack.HIT, blackjack.STAND, blackjack.DOUBLE_DOWN, blackjack.SPLIT):
+            self.assertIn(action, actions)
+
+        # Add one to the net of the second round
+        journal = RoundJournal(self.filename + '.changed')
+        journal.write_shoe(records[0][1], records[0][2])
+        for num, record in enumerate(records[1:]):
+            record_type, bet, net, player_cash, card_codes, actions = record
+            if num == 1:
+                net += 1
+            journal.write_round(bet, net, player_cash, card_codes, actions)
+        journal.close()
+        mismatches = replay_journal(self.filename + '.changed').mismatches
+        os.remove(self.filename + '.changed')
+        self.assertEqual([round_number for round_number, reason in mismatches], [2, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import threading
+import logging
+import sys
+import os
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from logqueue import LogThread
+from engine import get_value_of_players_hand, get_value_of_dealers_hand
+from playingcard import PlayingCard
+
+
+class RecordingHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((threading.current_thread(), record))
+
+
+class LogQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.saved_handlers = self.root.handlers[:]
+        self.saved_level = self.root.level
+        for handler in self.saved_handlers:
+            self.root.removeHandler(handler)
+        self.handler = RecordingHandler()
+        self.root.addHandler(self.handler)
+        self.log_thread = LogThread()
+
+    def tearDown(self):
+        self.log_thread.stop()
+        self.root.removeHandler(self.handler)
+        for handler in self.saved_handlers:
+            self.root.addHandler(handler)
+        self.root.setLevel(self.saved_level)
+
+    def test_handled_in_thread(self):
+        """
+        The records are handled in the thread, in logged order, and the
+        handlers are given back to the root logger when stopped.
+
+        :return: None
+
+        """
+        self.root.setLevel(logging.INFO)
+        self.log_thread.start()
+        self.assertTrue(self.log_thread.running)
+        self.assertNotIn(self.handler, self.root.handlers)
+        for num in range(0, 10):
+            logging.info('test_handled_in_thread: %s', num)
+        logging.debug('test_handled_in_thread: not logged')
+        self.log_thread.stop()
+        self.assertFalse(self.log_thread.running)
+        self.assertEqual(self.root.handlers, [self.handler])
+        messages = [record.getMessage() for thread, record in self.handler.records]
+        self.assertEqual(messages, ['test_handled_in_thread: {0}'.format(num) for num in range(0, 10)])
+        for thread, record in self.handler.records:
+            self.assertIsNot(thread, threading.current_thread())
+            self.assertEqual(record.module, 'ut_logqueue')
+
+    def test_hand_values_traced(self):
+        """
+        The hand values are the same with DEBUG enabled, and each record
+        names the function it's logged in.
+
+        :return: None
+
+        """
+        hand = [PlayingCard(rank, 0) for rank in (1, 13, 5)]
+        players_value = get_value_of_players_hand(hand)
+        dealers_value = get_value_of_dealers_hand(hand)
+        self.root.setLevel(logging.DEBUG)
+        self.assertEqual(get_value_of_players_hand(hand), players_value)
+        self.assertEqual(get_value_of_dealers_hand(hand), dealers_value)
+        functions = [record.getMessage().split(':')[0] for thread, record in self.handler.records]
+        self.assertEqual(functions[0], 'get_value_of_players_hand')
+        self.assertEqual(functions[-1], 'get_value_of_dealers_hand')
+        self.assertEqual(set(functions), {'get_value_of_players_hand', 'get_value_of_dealers_hand'})
+
+
+if __name__ == "__main__":
+    unittest.main()
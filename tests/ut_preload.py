@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import sys
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pygame
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from preload import AssetPreloader, preload_manifest, IMAGE, SOUND, CARD_ATLAS
+from common import ImageDB, SoundDB, CardAtlas, IMAGE_PATH
+
+
+class Preload(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        os.chdir(MAIN_DIR)  # The paths in the manifest are relative to the project root
+        pygame.display.init()
+        pygame.mixer.init()
+        pygame.display.set_mode((200, 150))
+        ImageDB.instance = None
+        SoundDB.instance = None
+
+    def tearDown(self):
+        pygame.mixer.quit()
+        pygame.display.quit()
+        ImageDB.instance = None
+        SoundDB.instance = None
+        os.chdir(self.cwd)
+
+    def test_manifest(self):
+        """
+        All files in the manifest exist.
+
+        :return: None
+
+        """
+        manifest = preload_manifest()
+        self.assertIn((CARD_ATLAS, None), manifest)
+        for kind, path in manifest:
+            if kind != CARD_ATLAS:
+                self.assertTrue(os.path.isfile(path), path)
+
+    def test_all_loaded(self):
+        """
+        All assets are in the ImageDB and SoundDB after the preload.
+
+        :return: None
+
+        """
+        manifest = preload_manifest()
+        preloader = AssetPreloader(manifest)
+        preloader.wait()
+        self.assertTrue(preloader.poll())
+        self.assertEqual(preloader.progress(), 1.0)
+        self.assertIsNotNone(preloader.load_time)
+        image_db = ImageDB.get_instance()
+        sound_db = SoundDB.get_instance()
+        for kind, path in manifest:
+            if kind == IMAGE:
+                self.assertIn(path, image_db.image_library)
+            elif kind == SOUND:
+                self.assertIn(path, sound_db.sound_library)
+        self.assertIn(CardAtlas.get_instance().filename, image_db.image_library)
+        self.assertEqual(image_db.unconverted, set())
+
+    def test_missing_file(self):
+        """
+        A file which can't be loaded raises its exception in the main thread.
+
+        :return: None
+
+        """
+        preloader = AssetPreloader([(IMAGE, IMAGE_PATH + 'missing.png')])
+        with self.assertRaises(FileNotFoundError):
+            preloader.wait()
+
+
+if __name__ == "__main__":
+    unittest.main()
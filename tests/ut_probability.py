@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import sys
+import os
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from probability import dealer_outcomes, shoe_composition, composition_key, dealer_cache_info, \
+    DEALER_OUTCOMES, DEALER_CACHE_SIZE
+from engine import dealer_must_hit, get_value_of_dealers_hand, BUSTED, BLACKJACK
+from playingcard import PlayingCard
+
+
+def play_all_dealers_hands(composition, cards, up_card, value_of_players_hand, probability, outcomes):
+    """
+    Add the probability of every possible way the dealer can play from
+    the cards, one card at the time without any memoization.
+
+    """
+    value = get_value_of_dealers_hand(cards)
+    if len(cards) == 2 and value == 21:
+        outcomes[BLACKJACK] += probability
+        return
+    if len(cards) >= 2 and not dealer_must_hit(value, value_of_players_hand):
+        outcomes[BUSTED if value > 21 else value] += probability
+        return
+    num_of_cards = sum(composition)
+    for rank in range(1, 14):
+        count = composition[rank - 1]
+        if not count:
+            continue
+        composition[rank - 1] -= 1
+        new_cards = cards + [PlayingCard(rank, 0)]
+        if len(cards) == 0:
+            # The up card is dealt after the hole card
+            new_cards.append(up_card)
+        play_all_dealers_hands(composition, new_cards, up_card, value_of_players_hand,
+                               probability * count / num_of_cards, outcomes)
+        composition[rank - 1] += 1
+
+
+class DealersProbability(unittest.TestCase):
+
+    def _compare_with_all_hands(self, composition, up_card, value_of_players_hand):
+        expected = dict.fromkeys(DEALER_OUTCOMES, 0.0)
+        play_all_dealers_hands(list(composition), [], PlayingCard(up_card, 0), value_of_players_hand, 1.0, expected)
+        outcomes = dealer_outcomes(composition, up_card, value_of_players_hand)
+        for outcome in DEALER_OUTCOMES:
+            self.assertAlmostEqual(outcomes[outcome], expected[outcome], places=12, msg=outcome)
+
+    def test_small_compositions(self):
+        """
+        Compare with every possible dealers hand from a few cards, where
+        the dealer hits 16 for a player with 17.
+
+        :return: None
+
+        """
+        composition = [2, 1, 0, 0, 1, 2, 0, 1, 0, 1, 0, 1, 0]
+        for up_card in (1, 6):
+            self._compare_with_all_hands(composition, up_card, 12)
+            self._compare_with_all_hands(composition, up_card, 17)
+
+    def test_full_shoe(self):
+        """
+        A full shoe of four decks, the probabilities should sum to one and
+        the dealer can only stand on 16 when the player has 16 or less.
+
+        :return: None
+
+        """
+        for up_card in range(1, 14):
+            outcomes = dealer_outcomes(shoe_composition(4), up_card, 18)
+            self.assertAlmostEqual(sum(outcomes.values()), 1.0, places=12)
+            self.assertEqual(outcomes[16], 0.0)
+        outcomes = dealer_outcomes(shoe_composition(4), 6, 16)
+        self.assertGreater(outcomes[16], 0.0)
+        self.assertEqual(outcomes[BLACKJACK], 0.0)
+        self.assertLessEqual(dealer_cache_info().currsize, DEALER_CACHE_SIZE)
+
+    def test_composition_key(self):
+        """
+        All ten valued ranks are counted together.
+
+        :return: None
+
+        """
+        self.assertEqual(composition_key(shoe_composition(2)), (8,) * 9 + (32,))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import json
+import tempfile
+import time
+import sys
+import os
+import pygame
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from profiler import FrameProfiler, plotting, BACKGROUND, STATE, PLOTTING, SECTIONS
+
+
+@plotting
+def slow_plot():
+    time.sleep(0.01)
+
+
+class Profiler(unittest.TestCase):
+
+    def setUp(self):
+        FrameProfiler.instance = None
+        self.profiler = FrameProfiler.get_instance()
+
+    def play_frame(self, state_name):
+        self.profiler.start_frame()
+        self.profiler.mark(BACKGROUND)
+        slow_plot()
+        self.profiler.mark(STATE)
+        self.profiler.end_frame(state_name)
+
+    def test_disabled(self):
+        """
+        Nothing is collected when the profiler is turned off.
+
+        :return: None
+
+        """
+        self.play_frame('BettingState')
+        self.assertEqual(self.profiler.frames, 0)
+        self.assertEqual(self.profiler.states, {})
+
+    def test_sections_and_states(self):
+        """
+        The time in a plot function is moved from the state to plotting,
+        and each frame is added to the histogram of its state.
+
+        :return: None
+
+        """
+        self.profiler.toggle()
+        self.play_frame('BettingState')
+        self.play_frame('BettingState')
+        self.play_frame('DealingState')
+        self.assertEqual(self.profiler.frames, 3)
+        self.assertGreaterEqual(self.profiler.totals[PLOTTING], 0.03)
+        self.assertLess(self.profiler.totals[STATE], self.profiler.totals[PLOTTING])
+        frames, total, histogram = self.profiler.states['BettingState']
+        self.assertEqual(frames, 2)
+        self.assertEqual(sum(histogram), 2)
+        self.assertEqual(self.profiler.states['DealingState'][0], 1)
+
+    def test_dump(self):
+        """
+        The collected times are saved as JSON.
+
+        :return: None
+
+        """
+        self.profiler.toggle()
+        self.play_frame('BettingState')
+        with tempfile.TemporaryDirectory() as directory:
+            filename = self.profiler.dump(os.path.join(directory, 'profile.json'))
+            with open(filename) as profile_file:
+                profile = json.load(profile_file)
+        self.assertEqual(profile['frames'], 1)
+        self.assertEqual(sorted(profile['sections']), sorted(SECTIONS))
+        self.assertEqual(profile['states']['BettingState']['frames'], 1)
+
+    def test_overlay(self):
+        """
+        The overlay is blitted as the same surface while the lines are
+        the same, and the lines changed are drawn on the other of two
+        surfaces.
+
+        :return: None
+
+        """
+        class Screen(object):
+            def blit(self, source, dest):
+                self.source = source
+
+        pygame.font.init()
+        screen = Screen()
+        self.profiler.toggle()
+        self.play_frame('BettingState')
+        self.profiler.plot(screen)
+        first = screen.source
+        self.profiler.plot(screen)
+        self.assertIs(screen.source, first)
+        self.profiler.states['BettingState'][1] += 1.0
+        self.profiler.plot(screen)
+        self.assertIsNot(screen.source, first)
+        self.profiler.states['BettingState'][1] += 1.0
+        self.profiler.plot(screen)
+        self.assertIs(screen.source, first)
+
+
+if __name__ == "__main__":
+    unittest.main()
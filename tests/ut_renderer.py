@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import random
+import sys
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from renderer import DirtyRectRenderer
+
+
+class Renderer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.display.init()
+        cls.display = pygame.display.set_mode((200, 150))
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.display.quit()
+
+    def setUp(self):
+        self.tiles = []
+        for color in ((255, 0, 0), (0, 0, 255), (255, 255, 0)):
+            tile = pygame.Surface((20, 30))
+            tile.fill(color)
+            self.tiles.append(tile)
+
+    def draw_frame(self, screen, frame):
+        """
+        Draw a frame from a list of (tile, position).
+
+        """
+        screen.fill((0, 128, 0))
+        for tile, position in frame:
+            screen.blit(tile, position)
+
+    def test_same_as_full_redraw(self):
+        """
+        Draw random frames, where a few tiles are moved, added or removed
+        from frame to frame, and compare the display with the frame drawn
+        on an ordinary surface.
+
+        :return: None
+
+        """
+        rng = random.Random(4711)
+        screen = DirtyRectRenderer(self.display)
+        reference = pygame.Surface(self.display.get_size())
+        frame = []
+        for num in range(0, 50):
+            change = rng.randint(0, 3)
+            if change == 1 or not frame:
+                frame.append((rng.choice(self.tiles), (rng.randint(-10, 190), rng.randint(-10, 140))))
+            elif change == 2:
+                frame.pop(rng.randrange(len(frame)))
+            elif change == 3:
+                frame[rng.randrange(len(frame))] = (rng.choice(self.tiles),
+                                                    (rng.randint(-10, 190), rng.randint(-10, 140)))
+            self.draw_frame(screen, frame)
+            screen.update()
+            self.draw_frame(reference, frame)
+            self.assertEqual(pygame.image.tostring(self.display, 'RGB'),
+                             pygame.image.tostring(reference, 'RGB'), num)
+
+    def test_nothing_changed(self):
+        """
+        A frame equal to the previous one, or a repeated frame, doesn't
+        update anything.
+
+        :return: None
+
+        """
+        screen = DirtyRectRenderer(self.display)
+        frame = [(self.tiles[0], (10, 10)), (self.tiles[1], (50, 20))]
+        self.draw_frame(screen, frame)
+        self.assertEqual(screen.update(), [self.display.get_rect()])
+        self.draw_frame(screen, frame)
+        self.assertEqual(screen.update(), [])
+        frame[1] = (self.tiles[1], (60, 20))
+        self.draw_frame(screen, frame)
+        self.assertEqual(screen.update(), [pygame.Rect(50, 20, 30, 30)])
+        screen.repeat()
+        self.assertEqual(screen.update(), [])
+        screen.repeat()
+        screen.invalidate()
+        self.assertEqual(screen.update(), [self.display.get_rect()])
+        # Another surface is drawn again, also with the same pixels
+        frame[0] = (self.tiles[0].copy(), (10, 10))
+        self.draw_frame(screen, frame)
+        self.assertEqual(screen.update(), [pygame.Rect(10, 10, 20, 30)])
+
+
+if __name__ == "__main__":
+    unittest.main()
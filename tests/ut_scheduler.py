@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import time
+import sys
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from scheduler import FrameScheduler
+
+
+class Scheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = FrameScheduler()
+        self.actions = []
+
+    def test_run_due(self):
+        """
+        Only the actions which are due are run, in due order.
+
+        :return: None
+
+        """
+        self.scheduler.call_later(0.02, lambda: self.actions.append('second'))
+        self.scheduler.call_later(0.01, lambda: self.actions.append('first'))
+        self.scheduler.call_later(60, lambda: self.actions.append('later'))
+        self.assertEqual(self.scheduler.run_due(), 0)
+        self.assertGreater(self.scheduler.timeout(), 0.0)
+        time.sleep(0.03)
+        self.assertEqual(self.scheduler.run_due(), 2)
+        self.assertEqual(self.actions, ['first', 'second'])
+        self.assertGreater(self.scheduler.timeout(), 50)
+
+    def test_pause(self):
+        """
+        The FSM is paused until the pause is due, the longest of two
+        pauses holds it.
+
+        :return: None
+
+        """
+        self.scheduler.pause(0.01)
+        self.scheduler.pause(0.03)
+        self.assertTrue(self.scheduler.paused)
+        time.sleep(0.015)
+        self.scheduler.run_due()
+        self.assertTrue(self.scheduler.paused)
+        time.sleep(0.02)
+        self.scheduler.run_due()
+        self.assertFalse(self.scheduler.paused)
+        self.assertIsNone(self.scheduler.timeout())
+
+    def test_skip(self):
+        """
+        Skip runs all actions at once and ends the pause.
+
+        :return: None
+
+        """
+        self.scheduler.pause(60)
+        self.scheduler.call_later(30, lambda: self.actions.append('action'))
+        self.assertEqual(self.scheduler.skip(), 2)
+        self.assertFalse(self.scheduler.paused)
+        self.assertEqual(self.actions, ['action'])
+
+    def test_no_delays(self):
+        """
+        With time_scale 0 all actions are due in the next frame.
+
+        :return: None
+
+        """
+        self.scheduler.time_scale = 0
+        self.scheduler.pause(3)
+        self.assertEqual(self.scheduler.timeout(), 0.0)
+        self.scheduler.run_due()
+        self.assertFalse(self.scheduler.paused)
+
+    def test_wait(self):
+        """
+        Wait until the next action is due or an event arrives, which is
+        left in the event queue.
+
+        :return: None
+
+        """
+        pygame.display.init()
+        try:
+            pygame.display.set_mode((20, 20))
+            pygame.event.get()
+            self.scheduler.pause(0.05)
+            start = time.perf_counter()
+            self.assertFalse(self.scheduler.wait(1.0))
+            self.assertGreaterEqual(time.perf_counter() - start, 0.04)
+            self.assertLess(time.perf_counter() - start, 0.5)
+            self.scheduler.run_due()
+
+            click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(5, 5))
+            pygame.event.post(click)
+            self.assertTrue(self.scheduler.wait(1.0))
+            self.assertEqual(pygame.event.get(pygame.MOUSEBUTTONDOWN), [click])
+        finally:
+            pygame.display.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import argparse
+import sys
+import os
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, MAIN_DIR)
+from simulate import simulate, derive_seed, positive_int
+
+
+class Simulate(unittest.TestCase):
+
+    def test_derive_seed(self):
+        """
+        Each chunk should get its own reproducible seed.
+
+        :return: None
+
+        """
+        self.assertEqual(derive_seed(1, 0), derive_seed(1, 0))
+        self.assertNotEqual(derive_seed(1, 0), derive_seed(1, 1))
+        self.assertNotEqual(derive_seed(1, 0), derive_seed(2, 0))
+
+    def test_positive_int(self):
+        """
+        At least one shoe has to be played.
+
+        :return: None
+
+        """
+        self.assertEqual(positive_int('1'), 1)
+        for text in ('0', '-1'):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                positive_int(text)
+
+    def test_same_result_whatever_workers(self):
+        """
+        The same master seed should give the identical result with one
+        or several worker processes.
+
+        :return: None
+
+        """
+        single = simulate(250, 4711, workers=1)
+        multiple = simulate(250, 4711, workers=3)
+        self.assertEqual(single, multiple)
+        self.assertNotEqual(single, simulate(250, 4712, workers=1))
+
+    def test_vectorized_same_result_whatever_workers(self):
+        """
+        Same as above with the NumPy simulator.
+
+        :return: None
+
+        """
+        self.assertEqual(simulate(250, 4711, workers=1, vectorized=True),
+                         simulate(250, 4711, workers=3, vectorized=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
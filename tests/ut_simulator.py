@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import sys
+import os
+import numpy as np
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from simulator import make_shoes, hit_until, simulate_shoes, play_shoe, card_code, card_rank, \
+    STAND, HIT, DOUBLE_DOWN
+
+
+class Simulator(unittest.TestCase):
+
+    def test_card_code(self):
+        """
+        Check that all 52 cards get an unique code and the rank is kept.
+
+        :return: None
+
+        """
+        codes = set()
+        for suit in range(0, 4):
+            for rank in range(1, 14):
+                code = card_code(rank, suit)
+                self.assertEqual(card_rank(code), rank)
+                codes.add(code)
+        self.assertEqual(codes, set(range(0, 52)))
+
+    def test_make_shoes(self):
+        """
+        Each shoe should contain four of each card per deck.
+
+        :return: None
+
+        """
+        shoes = make_shoes(3, 4, np.random.default_rng(1))
+        self.assertEqual(shoes.shape, (3, 208))
+        for shoe in shoes:
+            self.assertTrue((np.bincount(shoe, minlength=52) == 4).all())
+
+    def test_match_scalar_rules(self):
+        """
+        Play the same seeded shoes with the simulation and the rules engine
+        and check that every round gets the same result.
+
+        :return: None
+
+        """
+        strategy = hit_until(17)
+        strategy[0, 9:12, 2:10] = DOUBLE_DOWN
+        strategy[1, 13:18, 4:7] = DOUBLE_DOWN
+        strategy[0, 12:17, 2:7] = STAND
+        strategy[1, 18, 9:11] = HIT
+        shoes = make_shoes(200, 4, np.random.default_rng(4711))
+        result = simulate_shoes(shoes, strategy)
+        for index, shoe in enumerate(shoes):
+            nets = play_shoe(shoe, strategy)
+            played = result.played[index]
+            self.assertEqual(played.sum(), len(nets))
+            self.assertEqual(result.nets[index][played].tolist(), nets)
+
+    def test_house_edge(self):
+        """
+        Mimic the dealer, the house edge should be positive.
+
+        :return: None
+
+        """
+        result = simulate_shoes(make_shoes(500, 4, np.random.default_rng(17)), hit_until(17))
+        self.assertGreater(result.rounds(), 500 * 25)
+        self.assertGreater(result.house_edge(), 0.0)
+        self.assertGreater(result.variance(), 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
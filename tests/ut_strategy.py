@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import random
+import tempfile
+import shutil
+import sys
+import os
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from globals import CUT_RATIO
+from strategy import load_strategy, rule_set, CODE_SPLIT, CODE_STAND, CODE_DOUBLE_OR_HIT
+from strategy import _HandEV, _add_cards, _pair_fraction
+from engine import play_round, Round, HIT, STAND, DOUBLE_DOWN, SPLIT
+from probability import shoe_composition, composition_key
+from hand import Hand
+from playingcard import PlayingCard
+from carddecks import CardDecks
+
+
+class BasicStrategy(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_path = tempfile.mkdtemp()
+        cls.strategy = load_strategy(4, cls.cache_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.cache_path)
+
+    def test_cache(self):
+        """
+        The tables are saved by rule set and number of decks and loaded
+        the same.
+
+        :return: None
+
+        """
+        filename = os.path.join(self.cache_path, 'basic_strategy_{0}_4decks.json'.format(rule_set()))
+        self.assertTrue(os.path.isfile(filename))
+        strategy = load_strategy(4, self.cache_path)
+        self.assertEqual(strategy.to_dict(), self.strategy.to_dict())
+
+    def test_tables(self):
+        """
+        A few actions found on every basic strategy card.
+
+        :return: None
+
+        """
+        self.assertEqual(self.strategy.hard[20][10], CODE_STAND)
+        self.assertEqual(self.strategy.hard[11][6], CODE_DOUBLE_OR_HIT)
+        self.assertEqual(self.strategy.pairs[1][10], CODE_SPLIT)
+        self.assertIsNone(self.strategy.pairs[10][6])
+
+    def test_action(self):
+        """
+        A double down which isn't allowed is played as a hit, and a pair
+        is only split when allowed.
+
+        :return: None
+
+        """
+        up_card = PlayingCard(6, 0)
+        hand = Hand([PlayingCard(5, 0), PlayingCard(6, 1)])
+        self.assertEqual(self.strategy.action(hand, up_card, [HIT, STAND, DOUBLE_DOWN]), DOUBLE_DOWN)
+        self.assertEqual(self.strategy.action(hand, up_card, [HIT, STAND]), HIT)
+        hand = Hand([PlayingCard(8, 0), PlayingCard(8, 1)])
+        self.assertEqual(self.strategy.action(hand, up_card, [HIT, STAND, DOUBLE_DOWN, SPLIT]), SPLIT)
+        self.assertEqual(self.strategy.action(hand, up_card, [HIT, STAND, DOUBLE_DOWN]), STAND)
+
+    def test_better_than_hit_until_17(self):
+        """
+        Play the same shoes with the basic strategy and by hitting until
+        17, the basic strategy should loose less.
+
+        :return: None
+
+        """
+        def hit_until_17(game_round):
+            return HIT if game_round.value_of_players_hand() < 17 else STAND
+
+        nets = []
+        for decisions in (self.strategy.decisions, hit_until_17):
+            shoe_of_decks = CardDecks(4, random.Random(4711))
+            net = 0
+            for num in range(0, 30000):
+                if shoe_of_decks.length() < 4 * 52 * CUT_RATIO:
+                    shoe_of_decks.shuffle()
+                net += play_round(shoe_of_decks, 10, decisions).net
+            nets.append(net)
+        self.assertGreater(nets[0], nets[1])
+
+
+class SplitEV(unittest.TestCase):
+
+    def test_split_ev(self):
+        """
+        Split aces against a ten. The EV is the sum over the second card
+        of both hands, where two hands with 21 are played by the rules
+        engine with each hole card of the dealer.
+
+        :return: None
+
+        """
+        shoe = list(composition_key(shoe_composition(1)))
+        shoe[0] -= 2
+        shoe[9] -= 1
+        hand_evs = _HandEV(tuple(shoe), 10)
+        probabilities = [(value, count / sum(shoe)) for value, count in enumerate(shoe, 1) if count]
+
+        ev = 0.0
+        for first, first_probability in probabilities:
+            for second, second_probability in probabilities:
+                probability = first_probability * second_probability
+                if first == second == 10:
+                    for hole_card, hole_probability in probabilities:
+                        cards = [PlayingCard(rank, 0) for rank in (1, hole_card, 1, 10, first, second)]
+                        game_round = Round(list(reversed(cards)), 10)
+                        game_round.act(SPLIT)
+                        self.assertTrue(game_round.done)
+                        ev += probability * hole_probability * game_round.result.net / 10
+                else:
+                    for card in (first, second):
+                        if card == 10:
+                            ev += probability * hand_evs.stand_ev(21)
+                        else:
+                            value, soft, busted = _add_cards(0, 0, (1, card))
+                            ev += probability * max(hand_evs.two_card_evs(value, soft))
+        self.assertAlmostEqual(hand_evs.split_ev(1), ev)
+
+    def test_pair_fraction(self):
+        """
+        All hands with two eights are pairs, but only a jack and a jack,
+        a queen and a queen and so on of the hands with two ten valued
+        cards.
+
+        :return: None
+
+        """
+        ranks = shoe_composition(1)
+        self.assertEqual(_pair_fraction(ranks, 8, 10), 1.0)
+        self.assertAlmostEqual(_pair_fraction(ranks, 10, 6), 4 * 4 * 3 / (16 * 15))
+        self.assertAlmostEqual(_pair_fraction(ranks, 10, 10), (3 * 4 * 3 + 3 * 2) / (15 * 14))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import tempfile
+import asyncio
+import random
+import sys
+import os
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from tableserver import Table, TableServer, TableClient, load_test, percentile
+from engine import play_round, STAND
+from carddecks import CardDecks
+from globals import NUM_OF_DECKS, DEFAULT_PLAYER_BALANCE
+
+
+class TableServerTest(unittest.TestCase):
+
+    def test_table(self):
+        """
+        A table plays the same rounds as the rules engine with the same
+        shoe, and keeps the players cash.
+
+        :return: None
+
+        """
+        table = Table(1, seed=4711)
+        shoe = CardDecks(NUM_OF_DECKS, random.Random(4711))
+        player_cash = DEFAULT_PLAYER_BALANCE
+        for num in range(0, 20):
+            table.bet(10)
+            while not table.game_round.done:
+                table.act(STAND)
+            result = play_round(shoe, 10, [STAND])
+            player_cash += result.net
+            state = table.state()
+            self.assertEqual(state['net'], result.net)
+            self.assertEqual(state['cash'], player_cash)
+            self.assertEqual(state['player'], [[card.code for card in hand] for hand in result.player_hands])
+        self.assertEqual(table.rounds, 20)
+        with self.assertRaises(ValueError):
+            table.act(STAND)  # The round is done
+        with self.assertRaises(ValueError):
+            table.bet(player_cash + 1)
+
+    def test_protocol(self):
+        """
+        Requests and replies over TCP and a Unix socket, with errors for
+        bad requests, and the tables of a connection closed with it.
+
+        :return: None
+
+        """
+        async def play(path):
+            server = TableServer()
+            await server.start(port=0, path=path)
+            address = server.address()
+            if path is None:
+                client = await TableClient.connect(port=address[1])
+            else:
+                client = await TableClient.connect(path=path)
+            state = await client.request('open', seed=4711)
+            self.assertTrue(state['ok'])
+            table = state['table']
+            self.assertEqual(state['cash'], DEFAULT_PLAYER_BALANCE)
+            state = await client.request('bet', table=table, amount=10)
+            if not state['done']:
+                self.assertIsNone(state['dealer'][0])  # Hidden until the round is done
+                state = await client.request('stand', table=table)
+            self.assertTrue(state['done'])
+            self.assertEqual(len(state['outcomes']), len(state['player']))
+            self.assertEqual(state['cash'], DEFAULT_PLAYER_BALANCE + state['net'])
+            for request in ({'cmd': 'bet', 'table': table, 'amount': 'ten'},
+                            {'cmd': 'bet', 'table': table, 'amount': 1},
+                            {'cmd': 'stand', 'table': table}, {'cmd': 'fold', 'table': table},
+                            {'cmd': 'state', 'table': table + 1}, {'cmd': 'state'}):
+                self.assertFalse((await client.request(**request))['ok'])
+            client.writer.write(b'Not JSON\n')
+            self.assertFalse((await client.request('state', table=table))['ok'])
+            self.assertTrue((await client.request('state', table=table))['ok'])
+            self.assertEqual(len(server.tables), 1)
+            await client.close()
+            for num in range(0, 100):
+                if not server.connections:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(server.tables, {})
+            await server.close()
+
+        asyncio.run(play(None))
+        path = tempfile.mktemp(suffix='.sock')
+        try:
+            asyncio.run(play(path))
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_load(self):
+        """
+        Many clients at once, all requests answered.
+
+        :return: None
+
+        """
+        async def run():
+            server = TableServer()
+            await server.start(port=0)
+            latencies = await load_test(50, 5, 0, port=server.address()[1])
+            self.assertEqual(server.tables, {})  # All closed by the clients
+            await server.close()
+            return latencies
+
+        latencies = asyncio.run(run())
+        self.assertGreaterEqual(len(latencies), 50 * 7)  # Open, close and a bet each round at least
+        self.assertLessEqual(percentile(latencies, 0.99), latencies[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Copyright (C) Torbjorn Hedqvist - All Rights Reserved
+You may use, distribute and modify this code under the
+terms of the MIT license. See LICENSE file in the project
+root for full license information.
+
+"""
+import unittest
+import sys
+import os
+import pygame
+MAIN_DIR = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.join(MAIN_DIR, 'includes'))
+from common import render_text, text_cache_info, text_cache_clear, TEXT_CACHE_SIZE, YELLOW_COLOR, GOLD_COLOR
+
+
+class TextCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+        cls.font = pygame.font.Font(None, 18)
+
+    def setUp(self):
+        text_cache_clear()
+
+    def test_hits_and_misses(self):
+        """
+        The same text, font, color and antialias gives the same surface,
+        with the same pixels as font.render().
+
+        :return: None
+
+        """
+        text = render_text(self.font, 'Credits: $ 5000', False, YELLOW_COLOR)
+        self.assertIs(render_text(self.font, 'Credits: $ 5000', False, YELLOW_COLOR), text)
+        self.assertIsNot(render_text(self.font, 'Credits: $ 5000', False, GOLD_COLOR), text)
+        self.assertIsNot(render_text(self.font, 'Credits: $ 5000', True, YELLOW_COLOR), text)
+        self.assertIsNot(render_text(self.font, 'Credits: $ 4990', False, YELLOW_COLOR), text)
+        info = text_cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 4))
+        expected = self.font.render('Credits: $ 5000', False, YELLOW_COLOR)
+        self.assertEqual(pygame.image.tostring(text, 'RGBA'), pygame.image.tostring(expected, 'RGBA'))
+
+    def test_bounded(self):
+        """
+        Only the last TEXT_CACHE_SIZE texts are kept.
+
+        :return: None
+
+        """
+        first = render_text(self.font, '0', False, YELLOW_COLOR)
+        for number in range(1, TEXT_CACHE_SIZE + 1):
+            render_text(self.font, str(number), False, YELLOW_COLOR)
+        self.assertEqual(text_cache_info().currsize, TEXT_CACHE_SIZE)
+        self.assertIsNot(render_text(self.font, '0', False, YELLOW_COLOR), first)
+
+
+if __name__ == "__main__":
+    unittest.main()